@@ -0,0 +1,49 @@
+-- =============================================================================
+-- 03_analytics_indexes.sql
+-- Analitika query'lari uchun ikkilamchi va qoplovchi (covering) indekslar
+-- =============================================================================
+--
+-- 01_nnorthwind.sql faqat PRIMARY KEY va FOREIGN KEY'larni yaratadi, shuning
+-- uchun analytics_repository.py dagi query'lar eng katta jadvallarni
+-- (SalesOrder, OrderDetail) to'liq o'qib join qiladi.
+--
+-- Indekslar:
+--   SalesOrder(orderDate)              - sana oralig'i / oylik guruhlash, oxirgi buyurtmalar
+--   SalesOrder(custId, orderDate)      - mijoz bo'yicha RFM, retention, chegirma tahlili
+--   SalesOrder(employeeId, orderDate)  - xodim oylik sotuvi, ierarxiya, territoriya
+--   OrderDetail(orderId, productId, unitPrice, quantity, discount)
+--                                      - buyurtma -> qatorlar join'i jadvalga qaytmasdan
+--                                        (market basket self-join ham shu indeksda)
+--   OrderDetail(productId, orderId, unitPrice, quantity, discount)
+--                                      - mahsulot -> qatorlar join'i (top revenue, ABC,
+--                                        kategoriya va yetkazib beruvchi tahlillari)
+--
+-- custId va orderId bo'yicha FOREIGN KEY uchun avtomatik yaratilgan indekslar
+-- yangi kompozit indekslar bilan almashtiriladi (InnoDB ularni o'zi o'chiradi).
+--
+-- Takroriy ishga tushirish: "Duplicate key name" xatosi run_migrations.py da
+-- e'tiborsiz qoldiriladi.
+--
+-- Oldin/keyin rejalarini solishtirish:
+--   python SQLScripts/explain_analytics_queries.py --migration 03_analytics_indexes.sql
+-- =============================================================================
+
+USE northwind;
+
+CREATE INDEX idx_salesorder_orderdate
+    ON SalesOrder (orderDate);
+
+CREATE INDEX idx_salesorder_cust_orderdate
+    ON SalesOrder (custId, orderDate);
+
+CREATE INDEX idx_salesorder_employee_orderdate
+    ON SalesOrder (employeeId, orderDate);
+
+CREATE INDEX idx_orderdetail_order_covering
+    ON OrderDetail (orderId, productId, unitPrice, quantity, discount);
+
+CREATE INDEX idx_orderdetail_product_covering
+    ON OrderDetail (productId, orderId, unitPrice, quantity, discount);
+
+-- Optimizator statistikasini yangilash
+ANALYZE TABLE SalesOrder, OrderDetail;
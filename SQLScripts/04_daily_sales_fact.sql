@@ -0,0 +1,63 @@
+-- =============================================================================
+-- 04_daily_sales_fact.sql
+-- Kunlik sotuv fakt jadvali (materialized, inkremental yangilanadi)
+-- =============================================================================
+--
+-- Grain: (kun, mahsulot, mijoz, xodim, yetkazib beruvchi). Har bir katakda
+-- OrderDetail qatorlarining yig'indilari saqlanadi, shuning uchun analitika
+-- query'lari buyurtma qatorlari soniga emas, kunlar x o'lchovlar soniga
+-- proporsional ishlaydi.
+--
+-- Ustunlar:
+--   revenue        - SUM(unitPrice * quantity * (1 - discount))
+--   gross          - SUM(unitPrice * quantity)
+--   discountAmount - SUM(unitPrice * quantity * discount)
+--   quantity       - SUM(quantity)
+--   lineCount      - OrderDetail qatorlari soni (o'rtacha qator qiymati uchun)
+--   productOrders  - katakdagi mahsulotni o'z ichiga olgan buyurtmalar soni;
+--                    mahsulot bo'yicha guruhlanganda SUM aniq COUNT(DISTINCT orderId)
+--   orders         - buyurtma faqat eng kichik productId'li qatorida 1 marta
+--                    sanaladi; mahsulotsiz guruhlashda SUM aniq buyurtmalar soni
+--
+-- employeeId NULL bo'lgan buyurtmalar 0 bilan saqlanadi; orderDate NULL bo'lgan
+-- buyurtmalar faktga kirmaydi.
+--
+-- Yangilash ilova tomonidan (src/services/sales_fact_service.py): manba
+-- jadvallar versiyasi (FactRefreshState.sourceVersion) o'zgarganda faktdagi
+-- oxirgi kunlar oynasi va lastOrderId dan keyingi buyurtmalar davri oy
+-- boshidan o'chirilib qayta agregatsiya qilinadi; revision har yangilashda
+-- oshadi (analitika data versiyasiga kiradi). Birinchi yangilash jadvalni
+-- to'liq to'ldiradi.
+-- =============================================================================
+
+USE northwind;
+
+CREATE TABLE IF NOT EXISTS DailySalesFact (
+   salesDate DATE NOT NULL
+  ,productId INT NOT NULL
+  ,custId INT NOT NULL
+  ,employeeId INT NOT NULL DEFAULT 0
+  ,shipperId INT NOT NULL
+  ,revenue DECIMAL(18, 4) NOT NULL DEFAULT 0
+  ,gross DECIMAL(18, 2) NOT NULL DEFAULT 0
+  ,discountAmount DECIMAL(18, 4) NOT NULL DEFAULT 0
+  ,quantity INT NOT NULL DEFAULT 0
+  ,lineCount INT NOT NULL DEFAULT 0
+  ,productOrders INT NOT NULL DEFAULT 0
+  ,orders INT NOT NULL DEFAULT 0
+  ,PRIMARY KEY (salesDate, productId, custId, employeeId, shipperId)
+  ,INDEX idx_dailysalesfact_product (productId, salesDate)
+  ,INDEX idx_dailysalesfact_customer (custId, salesDate)
+  ,INDEX idx_dailysalesfact_employee (employeeId, salesDate)
+) ENGINE=INNODB;
+
+CREATE TABLE IF NOT EXISTS FactRefreshState (
+   factName VARCHAR(64) NOT NULL
+  ,lastOrderId INT NOT NULL DEFAULT 0
+  ,sourceVersion VARCHAR(64) NULL
+  ,revision INT NOT NULL DEFAULT 0
+  ,refreshedAt DATETIME NULL
+  ,PRIMARY KEY (factName)
+) ENGINE=INNODB;
+
+INSERT IGNORE INTO FactRefreshState (factName, lastOrderId) VALUES ('DailySalesFact', 0);
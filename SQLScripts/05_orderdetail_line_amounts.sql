@@ -0,0 +1,44 @@
+-- =============================================================================
+-- 05_orderdetail_line_amounts.sql
+-- OrderDetail qatorining summalari uchun saqlanadigan (STORED) generated ustunlar
+-- =============================================================================
+--
+-- unitPrice * quantity * (1 - discount) ifodasi analitika query'larida o'nlab
+-- marta, har bir qator va har bir query uchun qayta hisoblanadi. Generated
+-- ustunlar qiymatni INSERT/UPDATE paytida bir marta hisoblab saqlaydi:
+--   lineRevenue  - unitPrice * quantity * (1 - discount)  (sof tushum)
+--   lineGross    - unitPrice * quantity                   (chegirmasiz summa)
+--   lineDiscount - unitPrice * quantity * discount        (chegirma summasi)
+-- Turlar ifoda natijasining aniqligini saqlaydi (2 + 2 kasr xonasi), shuning
+-- uchun SUM natijalari oldingi query'lar bilan bir xil.
+--
+-- 03_analytics_indexes.sql dagi qoplovchi indekslar summa ustunlari qo'shilgan
+-- indekslar bilan almashtiriladi - SUM(od.lineRevenue) jadvalga qaytmasdan
+-- indeksdan o'qiladi. Yangi indekslar orderId/productId bilan boshlanadi,
+-- shuning uchun FOREIGN KEY'lar uchun ham yetarli.
+--
+-- Eslatma: ALTER TABLE jadvalni qayta yozadi (katta jadvalda sekin).
+-- Ilova ustunlardan faqat ANALYTICS_USE_LINE_AMOUNTS=True bo'lganda o'qiydi;
+-- o'chirilgan bo'lsa query'lar summalarni ifodalardan hisoblaydi, shuning
+-- uchun sozlamani migratsiya qo'llangandan keyin yoqing.
+-- =============================================================================
+
+USE northwind;
+
+ALTER TABLE OrderDetail
+    ADD COLUMN lineRevenue DECIMAL(18, 4) AS (unitPrice * quantity * (1 - discount)) STORED,
+    ADD COLUMN lineGross DECIMAL(16, 2) AS (unitPrice * quantity) STORED,
+    ADD COLUMN lineDiscount DECIMAL(18, 4) AS (unitPrice * quantity * discount) STORED;
+
+CREATE INDEX idx_orderdetail_order_amounts
+    ON OrderDetail (orderId, productId, unitPrice, quantity, discount, lineRevenue, lineGross, lineDiscount);
+
+CREATE INDEX idx_orderdetail_product_amounts
+    ON OrderDetail (productId, orderId, unitPrice, quantity, discount, lineRevenue, lineGross, lineDiscount);
+
+DROP INDEX idx_orderdetail_order_covering ON OrderDetail;
+
+DROP INDEX idx_orderdetail_product_covering ON OrderDetail;
+
+-- Optimizator statistikasini yangilash
+ANALYZE TABLE OrderDetail;
@@ -0,0 +1,49 @@
+-- =============================================================================
+-- 06_monthly_sales_rollup.sql
+-- Oylik sotuv rollup jadvali (vaqt qatori endpoint'lari uchun)
+-- =============================================================================
+--
+-- Grain: (oy, kategoriya, mahsulot, xodim, mijoz davlati). YoY o'sish,
+-- kategoriya oylik o'sishi, xodim oylik sotuvi va KPI dashboard'ning oxirgi oy
+-- ko'rsatkichi window funksiyalarini barcha buyurtma qatorlari o'rniga shu
+-- jadvalning bir necha yuz/ming qatori ustida bajaradi.
+--
+-- Ustunlar DailySalesFact bilan bir xil ma'noda (04_daily_sales_fact.sql):
+-- orders - buyurtma eng kichik productId'li qatorida bir marta sanaladi,
+-- shuning uchun mahsulotsiz guruhlashda SUM(orders) aniq buyurtmalar soni.
+-- categoryId NULL bo'lgan mahsulotlar 0, davlati NULL mijozlar '' bilan saqlanadi.
+--
+-- Jadval DailySalesFact bilan bir tranzaksiyada, bir xil orderId oralig'i
+-- bilan yangilanadi (src/services/sales_fact_service.py). Shu sababli
+-- migratsiya fakt holatini nolga qaytaradi - keyingi yangilash ikkala
+-- jadvalni ham boshidan to'ldiradi.
+-- =============================================================================
+
+USE northwind;
+
+CREATE TABLE IF NOT EXISTS MonthlySalesRollup (
+   salesMonth CHAR(7) NOT NULL
+  ,salesYear SMALLINT NOT NULL
+  ,monthNum TINYINT NOT NULL
+  ,categoryId INT NOT NULL DEFAULT 0
+  ,productId INT NOT NULL
+  ,employeeId INT NOT NULL DEFAULT 0
+  ,country VARCHAR(15) NOT NULL DEFAULT ''
+  ,revenue DECIMAL(18, 4) NOT NULL DEFAULT 0
+  ,gross DECIMAL(18, 2) NOT NULL DEFAULT 0
+  ,discountAmount DECIMAL(18, 4) NOT NULL DEFAULT 0
+  ,quantity INT NOT NULL DEFAULT 0
+  ,lineCount INT NOT NULL DEFAULT 0
+  ,productOrders INT NOT NULL DEFAULT 0
+  ,orders INT NOT NULL DEFAULT 0
+  ,PRIMARY KEY (salesMonth, categoryId, productId, employeeId, country)
+  ,INDEX idx_monthlysalesrollup_category (categoryId, salesMonth)
+  ,INDEX idx_monthlysalesrollup_employee (employeeId, salesMonth)
+) ENGINE=INNODB;
+
+-- Fakt va rollup bir xil holatda bo'lishi uchun ikkalasi qayta quriladi
+-- (bo'sh fakt - keyingi yangilash to'liq quradi)
+DELETE FROM DailySalesFact;
+
+UPDATE FactRefreshState SET lastOrderId = 0, sourceVersion = NULL, refreshedAt = NULL
+WHERE factName = 'DailySalesFact';
@@ -0,0 +1,40 @@
+-- =============================================================================
+-- 07_employee_closure.sql
+-- Xodimlar ierarxiyasi uchun closure jadvali (ancestor / descendant)
+-- =============================================================================
+--
+-- Har bir (rahbar, bo'ysunuvchi) juftligi uchun bitta qator, jumladan har bir
+-- xodimning o'zi bilan juftligi (depth = 0):
+--   ancestorId   - rahbar (yoki xodimning o'zi)
+--   descendantId - bo'ysunuvchi
+--   depth        - ular orasidagi bosqichlar soni
+--   path         - rahbardan bo'ysunuvchigacha ismlar zanjiri ("A -> B -> C")
+--
+-- Ierarxiya endpoint'i WITH RECURSIVE o'rniga shu jadval bilan bitta oddiy
+-- agregat query'da har bir rahbar jamoasining (butun subtree) daromadini
+-- hisoblaydi.
+--
+-- Jadval ilova tomonidan qayta quriladi (src/services/hierarchy_service.py):
+-- Employee jadvalining imzosi (employeeId, mgrId va ismlar) ClosureRefreshState
+-- dagidan farq qilsa, closure bitta tranzaksiyada to'liq almashtiriladi.
+-- =============================================================================
+
+USE northwind;
+
+CREATE TABLE IF NOT EXISTS EmployeeClosure (
+   ancestorId INT NOT NULL
+  ,descendantId INT NOT NULL
+  ,depth INT NOT NULL
+  ,path VARCHAR(500) NOT NULL
+  ,PRIMARY KEY (ancestorId, descendantId)
+  ,INDEX idx_employeeclosure_descendant (descendantId, depth)
+) ENGINE=INNODB;
+
+CREATE TABLE IF NOT EXISTS ClosureRefreshState (
+   closureName VARCHAR(64) NOT NULL
+  ,signature BIGINT NOT NULL DEFAULT 0
+  ,refreshedAt DATETIME NULL
+  ,PRIMARY KEY (closureName)
+) ENGINE=INNODB;
+
+INSERT IGNORE INTO ClosureRefreshState (closureName, signature) VALUES ('EmployeeClosure', 0);
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+SQLScripts/benchmark_prepared_statements.py
+
+Analytics query'larini text protocol va prepared statement (binary protocol)
+orqali, pure Python va C extension ulanishlarida solishtiruvchi skript.
+Natija DB_USE_PURE va DB_PREPARED_STATEMENTS sozlamalarini tanlashga yordam beradi.
+
+Foydalanish:
+    python benchmark_prepared_statements.py
+    python benchmark_prepared_statements.py --iterations 50 --query Sales
+
+Muhit o'zgaruvchilari (.env faylidan):
+    - DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Root papkani Python path ga qo'shish
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import mysql.connector
+from mysql.connector import Error as MySQLError
+from dotenv import load_dotenv
+
+from query_catalog import CatalogQuery, collect_queries
+
+# .env faylini yuklash
+load_dotenv(ROOT_DIR / ".env")
+
+
+class PreparedStatementBenchmark:
+    """
+    Har bir katalog query'sini 4 xil rejimda o'lchaydi:
+    pure/text, pure/prepared, cext/text, cext/prepared.
+    """
+
+    def __init__(self, iterations: int, query_filter: str = None):
+        """
+        PreparedStatementBenchmark ni ishga tushirish.
+
+        Args:
+            iterations: Har bir query necha marta bajariladi
+            query_filter: Faqat nomida shu matn bo'lgan query'lar
+        """
+        self.iterations = iterations
+        self.query_filter = query_filter
+        self.config = {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", 3306)),
+            "user": os.getenv("DB_USER", "root"),
+            "password": os.getenv("DB_PASSWORD", ""),
+            "database": os.getenv("DB_NAME", "northwind"),
+            "charset": "utf8mb4",
+            "collation": "utf8mb4_unicode_ci",
+        }
+
+    def _print_header(self, text: str) -> None:
+        """Sarlavha chiqarish."""
+        print("\n" + "=" * 78)
+        print(f"  {text}")
+        print("=" * 78)
+
+    def _print_info(self, text: str) -> None:
+        """Ma'lumot xabarini chiqarish."""
+        print(f"ℹ️  {text}")
+
+    def _print_error(self, text: str) -> None:
+        """Xatolik xabarini chiqarish."""
+        print(f"❌ {text}")
+
+    def _connect(self, use_pure: bool):
+        """Berilgan rejimda yangi ulanish ochish."""
+        return mysql.connector.connect(use_pure=use_pure, **self.config)
+
+    def _run_text(self, connection, item: CatalogQuery) -> list:
+        """Text protocol: har safar yangi dictionary cursor, database.py dagi kabi."""
+        timings = []
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(item.query, item.params)
+            cursor.fetchall()
+            cursor.close()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def _run_prepared(self, connection, item: CatalogQuery) -> list:
+        """Binary protocol: bitta prepared cursor qayta ishlatiladi (StatementCache kabi)."""
+        timings = []
+        cursor = connection.cursor(prepared=True)
+        try:
+            for _ in range(self.iterations):
+                started = time.perf_counter()
+                cursor.execute(item.query, item.params or ())
+                columns = cursor.column_names
+                [dict(zip(columns, row)) for row in cursor.fetchall()]
+                timings.append(time.perf_counter() - started)
+        finally:
+            cursor.close()
+        return timings
+
+    def _measure(self, use_pure: bool, prepared: bool, queries: list) -> dict:
+        """Bitta rejimdagi barcha query'lar uchun o'rtacha vaqt (ms)."""
+        results = {}
+        connection = self._connect(use_pure)
+        try:
+            for item in queries:
+                runner = self._run_prepared if prepared else self._run_text
+                timings = runner(connection, item)
+                # Birinchi chaqiruv prepare narxini o'z ichiga oladi
+                steady = timings[1:] or timings
+                results[item.name] = {
+                    "first_ms": timings[0] * 1000,
+                    "mean_ms": statistics.mean(steady) * 1000,
+                }
+        finally:
+            connection.close()
+        return results
+
+    def run(self) -> bool:
+        """
+        Benchmarkni ishga tushirish.
+
+        Returns:
+            bool: Muvaffaqiyatli yakunlandimi
+        """
+        self._print_header("PREPARED STATEMENT BENCHMARK")
+
+        queries = [
+            item for item in collect_queries()
+            if not self.query_filter or self.query_filter.lower() in item.name.lower()
+        ]
+        if not queries:
+            self._print_error("Filtrga mos query topilmadi")
+            return False
+
+        modes = [("pure", True)]
+        if mysql.connector.HAVE_CEXT:
+            modes.append(("cext", False))
+        else:
+            self._print_info("C extension o'rnatilmagan, faqat pure rejim o'lchanadi")
+
+        self._print_info(f"Query'lar: {len(queries)}, takrorlash: {self.iterations}")
+
+        try:
+            results = {}
+            for label, use_pure in modes:
+                results[f"{label}/text"] = self._measure(use_pure, False, queries)
+                results[f"{label}/prepared"] = self._measure(use_pure, True, queries)
+        except MySQLError as e:
+            self._print_error(f"MySQL xatoligi: {e}")
+            return False
+
+        columns = list(results)
+        self._print_header("O'RTACHA VAQT (ms, birinchi chaqiruvsiz)")
+        print(f"{'query':<54}" + "".join(f"{c:>14}" for c in columns))
+        for item in queries:
+            name = item.name.replace("AnalyticsRepository", "")
+            print(f"{name:<54}" + "".join(
+                f"{results[c][item.name]['mean_ms']:>14.2f}" for c in columns
+            ))
+
+        self._print_header("JAMI")
+        baseline = sum(r["mean_ms"] for r in results["pure/text"].values())
+        for column in columns:
+            total = sum(r["mean_ms"] for r in results[column].values())
+            first = sum(r["first_ms"] for r in results[column].values())
+            speedup = baseline / total if total else 0.0
+            print(
+                f"{column:<16} jami: {total:>9.2f} ms   birinchi chaqiruv: {first:>9.2f} ms"
+                f"   pure/text ga nisbatan: x{speedup:.2f}"
+            )
+
+        return True
+
+
+def main():
+    """Asosiy funksiya."""
+    parser = argparse.ArgumentParser(description="Prepared statement benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="Har bir query necha marta bajariladi")
+    parser.add_argument("--query", default=None, help="Faqat nomida shu matn bo'lgan query'lar")
+    args = parser.parse_args()
+
+    benchmark = PreparedStatementBenchmark(max(args.iterations, 2), args.query)
+    success = benchmark.run()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
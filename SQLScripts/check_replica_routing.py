@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+SQLScripts/check_replica_routing.py
+
+Read-replica routing'ni ikki (yoki undan ko'p) mahalliy MySQL bilan tekshirish.
+readonly so'rovlar qaysi serverga tushganini, yozish so'rovlari primary'da
+qolishini va replica to'xtatilganda o'qishlar primary'ga o'tishini ko'rsatadi.
+
+Foydalanish:
+    # .env: DB_PORT=3306, DB_REPLICA_HOSTS=127.0.0.1:3307
+    python check_replica_routing.py --queries 20
+    # Failover: skript --rounds bilan ishlayotganda replica'ni to'xtating
+    python check_replica_routing.py --rounds 10 --interval 3
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Root papkani Python path ga qo'shish
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from mysql.connector import Error as MySQLError
+
+SERVER_QUERY = "SELECT @@hostname AS host, @@port AS port"
+
+
+def _server(row: dict) -> str:
+    """Natija qatoridan server nomi."""
+    return f"{row['host']}:{row['port']}"
+
+
+def run_round(db, queries: int) -> None:
+    """Bitta tekshiruv raundi: o'qishlar taqsimoti, yozish yo'li va pool holati."""
+    reads = Counter()
+    for _ in range(queries):
+        try:
+            reads[_server(db.execute_query(SERVER_QUERY, fetch_one=True, readonly=True))] += 1
+        except MySQLError as e:
+            reads[f"xatolik: {e.errno}"] += 1
+
+    primary = _server(db.execute_query(SERVER_QUERY, fetch_one=True))
+
+    print(f"\n📖 readonly so'rovlar ({queries} ta):")
+    for server, count in reads.most_common():
+        print(f"   {server:<30} {count}")
+    print(f"✍️  primary so'rov: {primary}")
+
+    for name, stats in db.pool_stats().items():
+        health = "" if "healthy" not in stats else (
+            " ✅ sog'lom" if stats["healthy"] else f" ❌ nosoz ({stats['retry_in_seconds']} s)"
+        )
+        print(f"   pool {name:<12} open={stats['open']} in_use={stats['in_use']}{health}")
+
+
+def main():
+    """Asosiy funksiya."""
+    parser = argparse.ArgumentParser(description="Read-replica routing tekshiruvi")
+    parser.add_argument("--queries", type=int, default=20, help="Har raunddagi readonly so'rovlar soni")
+    parser.add_argument("--rounds", type=int, default=1, help="Raundlar soni")
+    parser.add_argument("--interval", type=float, default=3.0, help="Raundlar orasidagi pauza (soniya)")
+    args = parser.parse_args()
+
+    from src.config import settings
+    from src.config.database import get_db
+
+    if not settings.db_replica_hosts:
+        print("⚠️  DB_REPLICA_HOSTS bo'sh - barcha so'rovlar primary'ga boradi")
+
+    db = get_db()
+    for round_number in range(1, args.rounds + 1):
+        print("\n" + "=" * 60)
+        print(f"  RAUND {round_number} (strategiya: {settings.db_replica_strategy})")
+        print("=" * 60)
+        run_round(db, args.queries)
+        if round_number < args.rounds:
+            time.sleep(args.interval)
+
+    db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
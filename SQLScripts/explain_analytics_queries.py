@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+SQLScripts/explain_analytics_queries.py
+
+Barcha analytics query'larining EXPLAIN ANALYZE rejalarini yozib oluvchi va
+indeks migratsiyasidan oldingi/keyingi rejalarni solishtiruvchi skript.
+Query'lar query_catalog.py dan olinadi - ilova yuboradigan aynan o'sha SQL.
+EXPLAIN ANALYZE MySQL 8.0.18+ talab qiladi va query'ni haqiqatan bajaradi.
+
+Foydalanish:
+    # Oldin -> migratsiya -> keyin -> solishtirish (bitta buyruq)
+    python explain_analytics_queries.py --migration 03_analytics_indexes.sql
+
+    # Yoki qo'lda
+    python explain_analytics_queries.py --output explain_before.json
+    python run_migrations.py
+    python explain_analytics_queries.py --output explain_after.json
+    python explain_analytics_queries.py --compare explain_before.json explain_after.json
+
+    # OrderDetail va DailySalesFact (04_daily_sales_fact.sql) variantlarini solishtirish
+    python explain_analytics_queries.py --output explain_raw.json --sales-fact off
+    python explain_analytics_queries.py --output explain_fact.json --sales-fact on
+    python explain_analytics_queries.py --compare explain_raw.json explain_fact.json
+
+    # Ierarxiya: WITH RECURSIVE va EmployeeClosure (07_employee_closure.sql)
+    python explain_analytics_queries.py --query hierarchy --employee-closure off --output explain_raw.json
+    python explain_analytics_queries.py --query hierarchy --employee-closure on --output explain_closure.json
+
+    # Summa ifodalari va saqlanadigan ustunlar (05_orderdetail_line_amounts.sql)
+    python explain_analytics_queries.py --output explain_before.json --line-amounts off
+    python run_migrations.py
+    python explain_analytics_queries.py --output explain_after.json --line-amounts on
+
+Muhit o'zgaruvchilari (.env faylidan):
+    - DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+# Root papkani Python path ga qo'shish
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import mysql.connector
+from mysql.connector import Error as MySQLError
+from dotenv import load_dotenv
+
+from query_catalog import collect_queries
+from run_migrations import MigrationRunner
+
+# .env faylini yuklash
+load_dotenv(ROOT_DIR / ".env")
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# EXPLAIN ANALYZE daraxtining birinchi (ildiz) tugunidagi haqiqiy vaqt
+_ACTUAL_TIME = re.compile(r"actual time=([\d.]+)\.\.([\d.]+) rows=([\d.e+]+) loops=(\d+)")
+# Reja tugunlari turlari (jadvalni to'liq o'qish va indeksdan foydalanish)
+_TABLE_SCAN = re.compile(r"Table scan on (\w+)")
+_INDEX_ACCESS = re.compile(r"(?:Covering index|Index) (?:lookup|range scan|scan) on \w+ using (\w+)")
+
+
+class ExplainCapture:
+    """
+    Katalogdagi har bir query uchun EXPLAIN ANALYZE natijasini yig'adi
+    va ikki yozuvni solishtiradi.
+    """
+
+    def __init__(
+        self,
+        query_filter: str = None,
+        use_sales_fact: bool = None,
+        use_employee_closure: bool = None,
+        use_line_amounts: bool = None,
+    ):
+        """
+        ExplainCapture ni ishga tushirish.
+
+        Args:
+            query_filter: Faqat nomida shu matn bo'lgan query'lar
+            use_sales_fact: DailySalesFact variantidagi query'lar (None - sozlama bo'yicha)
+            use_employee_closure: EmployeeClosure variantidagi ierarxiya (None - sozlama bo'yicha)
+            use_line_amounts: OrderDetail summa ustunlari variantidagi query'lar (None - sozlama bo'yicha)
+        """
+        self.query_filter = query_filter
+        self.use_sales_fact = use_sales_fact
+        self.use_employee_closure = use_employee_closure
+        self.use_line_amounts = use_line_amounts
+        self.config = {
+            "host": os.getenv("DB_HOST", "localhost"),
+            "port": int(os.getenv("DB_PORT", 3306)),
+            "user": os.getenv("DB_USER", "root"),
+            "password": os.getenv("DB_PASSWORD", ""),
+            "database": os.getenv("DB_NAME", "northwind"),
+            "charset": "utf8mb4",
+            "collation": "utf8mb4_unicode_ci",
+        }
+
+    def _print_header(self, text: str) -> None:
+        """Sarlavha chiqarish."""
+        print("\n" + "=" * 78)
+        print(f"  {text}")
+        print("=" * 78)
+
+    def _print_info(self, text: str) -> None:
+        """Ma'lumot xabarini chiqarish."""
+        print(f"ℹ️  {text}")
+
+    def _print_error(self, text: str) -> None:
+        """Xatolik xabarini chiqarish."""
+        print(f"❌ {text}")
+
+    @staticmethod
+    def summarize(plan: str) -> dict:
+        """
+        EXPLAIN ANALYZE matnidan asosiy ko'rsatkichlar.
+
+        Args:
+            plan: EXPLAIN ANALYZE natijasi (FORMAT=TREE)
+
+        Returns:
+            dict: Ildiz tugun vaqti (ms), qaytgan qatorlar, to'liq o'qilgan
+                jadvallar va ishlatilgan indekslar
+        """
+        match = _ACTUAL_TIME.search(plan)
+        return {
+            "total_ms": float(match.group(2)) if match else None,
+            "rows": float(match.group(3)) if match else None,
+            "table_scans": sorted(set(_TABLE_SCAN.findall(plan))),
+            "indexes": sorted(set(_INDEX_ACCESS.findall(plan))),
+        }
+
+    def capture(self, title: str = "EXPLAIN ANALYZE") -> dict:
+        """
+        Barcha query'lar uchun EXPLAIN ANALYZE.
+
+        Args:
+            title: Chiqariladigan sarlavha
+
+        Returns:
+            dict: Query nomi -> {"plan", "total_ms", "rows", "table_scans", "indexes"}
+                (xatolikda {"error": ...})
+        """
+        queries = [
+            item for item in collect_queries(self.use_sales_fact, self.use_employee_closure, self.use_line_amounts)
+            if not self.query_filter or self.query_filter.lower() in item.name.lower()
+        ]
+        self._print_header(title)
+        results = {}
+        connection = mysql.connector.connect(**self.config)
+        try:
+            for item in queries:
+                cursor = connection.cursor()
+                try:
+                    cursor.execute("EXPLAIN ANALYZE " + item.query, item.params)
+                    plan = "\n".join(row[0] for row in cursor.fetchall())
+                    results[item.name] = {"plan": plan, **self.summarize(plan)}
+                    self._print_info(f"{item.name}: {results[item.name]['total_ms']} ms")
+                except MySQLError as e:
+                    results[item.name] = {"error": str(e)}
+                    self._print_error(f"{item.name}: {e}")
+                finally:
+                    cursor.close()
+        finally:
+            connection.close()
+        return results
+
+    def compare(self, before: dict, after: dict) -> None:
+        """
+        Ikki yozuvni solishtirib jadval chiqarish.
+
+        Args:
+            before: Migratsiyadan oldingi capture() natijasi
+            after: Migratsiyadan keyingi capture() natijasi
+        """
+        self._print_header("EXPLAIN ANALYZE: OLDIN / KEYIN (ildiz tugun, ms)")
+        print(f"{'query':<50}{'oldin':>10}{'keyin':>10}{'nisbat':>9}  o'zgarish")
+
+        improved = 0
+        for name in sorted(set(before) | set(after)):
+            old, new = before.get(name, {}), after.get(name, {})
+            label = name.replace("AnalyticsRepository", "")
+            if old.get("total_ms") is None or new.get("total_ms") is None:
+                print(f"{label:<50}{'-':>10}{'-':>10}{'-':>9}  {old.get('error') or new.get('error') or ''}")
+                continue
+
+            ratio = old["total_ms"] / new["total_ms"] if new["total_ms"] else float("inf")
+            if ratio > 1.1:
+                improved += 1
+            changes = []
+            removed_scans = set(old["table_scans"]) - set(new["table_scans"])
+            added_indexes = set(new["indexes"]) - set(old["indexes"])
+            if removed_scans:
+                changes.append("scan yo'q: " + ", ".join(sorted(removed_scans)))
+            if added_indexes:
+                changes.append("indeks: " + ", ".join(sorted(added_indexes)))
+            print(
+                f"{label:<50}{old['total_ms']:>10.2f}{new['total_ms']:>10.2f}"
+                f"{'x' + format(ratio, '.2f'):>9}  {'; '.join(changes)}"
+            )
+
+        self._print_header("JAMI")
+        total_before = sum(r.get("total_ms") or 0 for r in before.values())
+        total_after = sum(r.get("total_ms") or 0 for r in after.values())
+        print(f"Oldin: {total_before:.2f} ms, keyin: {total_after:.2f} ms, "
+              f"10% dan ko'p tezlashgan rejalar: {improved} ta")
+
+
+def _save(results: dict, path: Path) -> None:
+    """Natijani JSON faylga yozish."""
+    path.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"✅ Saqlandi: {path}")
+
+
+def _load(path: str) -> dict:
+    """JSON faylni o'qish."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def main():
+    """Asosiy funksiya."""
+    parser = argparse.ArgumentParser(description="Analytics query'lari uchun EXPLAIN ANALYZE")
+    parser.add_argument("--output", default=None, help="Rejalarni shu JSON faylga yozish")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Ikki JSON faylni solishtirish")
+    parser.add_argument("--migration", default=None, help="Oldin/keyin orasida bajariladigan SQL fayl (SQLScripts ichida)")
+    parser.add_argument("--query", default=None, help="Faqat nomida shu matn bo'lgan query'lar")
+    parser.add_argument(
+        "--sales-fact", choices=("on", "off"), default=None,
+        help="Agregat query'larni DailySalesFact'dan (on) yoki OrderDetail'dan (off) o'qish"
+    )
+    parser.add_argument(
+        "--employee-closure", choices=("on", "off"), default=None,
+        help="Ierarxiyani EmployeeClosure'dan (on) yoki WITH RECURSIVE bilan (off) o'qish"
+    )
+    parser.add_argument(
+        "--line-amounts", choices=("on", "off"), default=None,
+        help="Qator summalarini OrderDetail ustunlaridan (on) yoki ifodalardan (off) o'qish"
+    )
+    args = parser.parse_args()
+
+    use_sales_fact = None if args.sales_fact is None else args.sales_fact == "on"
+    use_employee_closure = None if args.employee_closure is None else args.employee_closure == "on"
+    use_line_amounts = None if args.line_amounts is None else args.line_amounts == "on"
+    explain = ExplainCapture(args.query, use_sales_fact, use_employee_closure, use_line_amounts)
+
+    if args.compare:
+        explain.compare(_load(args.compare[0]), _load(args.compare[1]))
+        sys.exit(0)
+
+    try:
+        if args.migration:
+            before = explain.capture("OLDIN")
+            _save(before, SCRIPTS_DIR / "explain_before.json")
+
+            runner = MigrationRunner()
+            if not runner.connect(with_database=True):
+                sys.exit(1)
+            try:
+                if not runner.execute_sql_file(SCRIPTS_DIR / args.migration):
+                    sys.exit(1)
+            finally:
+                runner.disconnect()
+
+            after = explain.capture("KEYIN")
+            _save(after, SCRIPTS_DIR / "explain_after.json")
+            explain.compare(before, after)
+        else:
+            results = explain.capture()
+            if args.output:
+                _save(results, Path(args.output))
+    except MySQLError as e:
+        print(f"❌ MySQL xatoligi: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+SQLScripts/query_catalog.py
+
+Analytics repository'lari yuboradigan SQL query'lar katalogi.
+Repository metodlari yozib oluvchi soxta DB bilan chaqiriladi, shuning uchun
+benchmark va tahlil skriptlari ilova ishlatadigan aynan o'sha SQL matnini
+(default argumentlar bilan) qayta yozmasdan oladi.
+"""
+
+import inspect
+import sys
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional
+
+# Root papkani Python path ga qo'shish
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+class CatalogQuery(NamedTuple):
+    """Katalogdagi bitta query."""
+
+    name: str
+    query: str
+    params: Optional[tuple]
+
+
+class _RecordingDatabase:
+    """execute_query chaqiruvlarini bajarmasdan yozib oluvchi DB."""
+
+    data_version = None
+
+    def __init__(self) -> None:
+        self.calls: List[tuple] = []
+
+    def execute_query(self, query: str, params: Optional[tuple] = None, **kwargs: Any) -> list:
+        self.calls.append((query, params))
+        return []
+
+
+def collect_queries(
+    use_sales_fact: Optional[bool] = None,
+    use_employee_closure: Optional[bool] = None,
+    use_line_amounts: Optional[bool] = None,
+) -> List[CatalogQuery]:
+    """
+    Barcha analytics repository metodlarining SQL query'larini yig'ish.
+
+    Args:
+        use_sales_fact: Agregat query'lar DailySalesFact'dan o'qiydigan variant
+            (None - ANALYTICS_USE_SALES_FACT sozlamasi)
+        use_employee_closure: Ierarxiya EmployeeClosure'dan o'qiydigan variant
+            (None - ANALYTICS_USE_EMPLOYEE_CLOSURE sozlamasi)
+        use_line_amounts: OrderDetail'ning saqlanadigan summa ustunlarini o'qiydigan variant
+            (None - ANALYTICS_USE_LINE_AMOUNTS sozlamasi)
+
+    Returns:
+        list: CatalogQuery ro'yxati ("Repository.metod" nomi bilan)
+    """
+    from src.repositories.analytics_repository import (
+        ProductAnalyticsRepository,
+        EmployeeAnalyticsRepository,
+        CustomerAnalyticsRepository,
+        CategoryAnalyticsRepository,
+        SupplierAnalyticsRepository,
+        ShippingAnalyticsRepository,
+        SalesAnalyticsRepository,
+    )
+
+    repositories = (
+        ProductAnalyticsRepository,
+        EmployeeAnalyticsRepository,
+        CustomerAnalyticsRepository,
+        CategoryAnalyticsRepository,
+        SupplierAnalyticsRepository,
+        ShippingAnalyticsRepository,
+        SalesAnalyticsRepository,
+    )
+
+    catalog: List[CatalogQuery] = []
+    for repository_class in repositories:
+        recorder = _RecordingDatabase()
+        # Kesh o'chirilgan - har bir metod query'ni haqiqatan yuborishi kerak
+        repository = repository_class(
+            recorder,
+            use_cache=False,
+            use_sales_fact=use_sales_fact,
+            use_employee_closure=use_employee_closure,
+            use_line_amounts=use_line_amounts,
+        )
+
+        for method_name, method in inspect.getmembers(repository_class, inspect.isfunction):
+            if not method_name.startswith("get_"):
+                continue
+            getattr(repository, method_name)()
+            query, params = recorder.calls.pop()
+            catalog.append(
+                CatalogQuery(f"{repository_class.__name__}.{method_name}", query, params)
+            )
+
+    return catalog
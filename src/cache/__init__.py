@@ -0,0 +1,32 @@
+"""
+Kesh moduli.
+Analitika natijalari uchun TTL + LRU kesh (xotirada yoki worker'lar uchun
+umumiy SQLite faylida), single-flight va stale-while-revalidate fon yangilashlari.
+"""
+
+from .memory import CacheEntry, MemoryCache
+from .sqlite import SQLiteCache
+from .manager import analytics_cache, get_analytics_cache
+from .refresh import BackgroundRefresher, cache_refresher
+from .stats import CacheStats, cache_stats
+from .singleflight import AsyncSingleFlight, SingleFlight, async_query_flights, query_flights
+from .trace import CacheTrace, current_cache_trace, record_cache_access
+
+__all__ = [
+    "CacheEntry",
+    "MemoryCache",
+    "SQLiteCache",
+    "analytics_cache",
+    "get_analytics_cache",
+    "SingleFlight",
+    "AsyncSingleFlight",
+    "query_flights",
+    "async_query_flights",
+    "BackgroundRefresher",
+    "cache_refresher",
+    "CacheStats",
+    "cache_stats",
+    "CacheTrace",
+    "current_cache_trace",
+    "record_cache_access",
+]
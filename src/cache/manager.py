@@ -0,0 +1,81 @@
+"""
+Analitika natijalari keshining global instance'i.
+
+ANALYTICS_CACHE_BACKEND=memory - kesh har bir worker process'da alohida
+(fork'dan keyin bola process ota process yozuvlarining nusxasi bilan
+boshlaydi, keyin mustaqil ishlaydi).
+ANALYTICS_CACHE_BACKEND=sqlite - bitta server'dagi barcha worker'lar
+ANALYTICS_CACHE_DIR ichidagi bitta SQLite faylini ishlatadi.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+from src.config import settings
+
+from .memory import MemoryCache
+from .sqlite import SQLiteCache
+
+CACHE_BACKENDS = ("memory", "sqlite")
+
+AnalyticsCache = Union[MemoryCache, SQLiteCache]
+
+
+def cache_directory() -> Path:
+    """
+    Disk keshi papkasi.
+
+    Returns:
+        Path: ANALYTICS_CACHE_DIR yoki tizim vaqtinchalik papkasidagi foydalanuvchiga
+            xos gastro-savdo-cache-<uid> (umumiy /tmp'da boshqa foydalanuvchi papkani
+            oldindan yarata olmaydi)
+    """
+    if settings.analytics_cache_dir:
+        return Path(settings.analytics_cache_dir)
+    name = f"gastro-savdo-cache-{os.getuid()}" if hasattr(os, "getuid") else "gastro-savdo-cache"
+    return Path(tempfile.gettempdir()) / name
+
+
+def create_analytics_cache() -> AnalyticsCache:
+    """
+    Sozlamalar bo'yicha analitika keshini yaratish.
+
+    Returns:
+        MemoryCache yoki SQLiteCache: ANALYTICS_CACHE_MAX_ENTRIES / ANALYTICS_CACHE_MAX_BYTES bilan cheklangan kesh
+
+    Raises:
+        ValueError: ANALYTICS_CACHE_BACKEND noma'lum bo'lsa
+    """
+    backend = settings.analytics_cache_backend.lower()
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(
+            f"Noma'lum ANALYTICS_CACHE_BACKEND: {settings.analytics_cache_backend} "
+            f"(mumkin: {', '.join(CACHE_BACKENDS)})"
+        )
+
+    if backend == "sqlite":
+        return SQLiteCache(
+            cache_directory(),
+            max_entries=settings.analytics_cache_max_entries,
+            max_bytes=settings.analytics_cache_max_bytes,
+        )
+    return MemoryCache(
+        max_entries=settings.analytics_cache_max_entries,
+        max_bytes=settings.analytics_cache_max_bytes,
+    )
+
+
+# Global analytics cache instance
+analytics_cache = create_analytics_cache()
+
+
+def get_analytics_cache() -> AnalyticsCache:
+    """
+    Analitika keshini olish (Dependency Injection uchun).
+
+    Returns:
+        MemoryCache yoki SQLiteCache: Kesh instance
+    """
+    return analytics_cache
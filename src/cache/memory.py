@@ -0,0 +1,260 @@
+"""
+Jarayon ichidagi (in-process) natija keshi.
+Har bir yozuv o'z TTL'i bilan saqlanadi; kesh yozuvlar soni va taxminiy
+bayt hajmi bo'yicha cheklangan, chegaradan oshganda eng uzoq ishlatilmagan
+(LRU) yozuvlar chiqarib yuboriladi.
+
+Stale-while-revalidate: yozuv TTL tugagandan keyin yana stale_ttl davomida
+saqlanadi va "eskirgan" (stale) deb qaytariladi - chaqiruvchi uni darhol
+ishlatib, fonda yangilashni boshlashi mumkin.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Qiymatning taxminiy xotira hajmi (bayt).
+    Analitika natijalari - skalyar qiymatli dict'lar ro'yxati, shuning uchun
+    list/tuple/dict ichiga kiriladi, qolgan obyektlar sys.getsizeof bilan o'lchanadi.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class CacheEntry:
+    """Kesh yozuvi: qiymat, yaratilgan vaqt, yangilik va saqlanish muddatlari, hajmi, hit'lar soni."""
+
+    __slots__ = ("value", "created_at", "expires_at", "stale_until", "size", "hits")
+
+    def __init__(
+        self,
+        value: Any,
+        created_at: float,
+        expires_at: float,
+        size: int,
+        stale_until: float = None,
+        hits: int = 0,
+    ) -> None:
+        self.value = value
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.stale_until = expires_at if stale_until is None else max(stale_until, expires_at)
+        self.size = size
+        self.hits = hits
+
+    @property
+    def age(self) -> float:
+        """Yozuv yoshi (soniya)."""
+        return max(time.time() - self.created_at, 0.0)
+
+    @property
+    def stale(self) -> bool:
+        """TTL tugagan, lekin yozuv stale oynasida."""
+        return time.time() >= self.expires_at
+
+    @property
+    def expired(self) -> bool:
+        """Stale oynasi ham tugagan - yozuv ishlatilmaydi."""
+        return time.time() >= self.stale_until
+
+    def describe(self, key: str) -> dict:
+        """Admin statistikasi uchun yozuv ma'lumotlari (qiymatsiz)."""
+        now = time.time()
+        return {
+            "key": key,
+            "size": self.size,
+            "age": round(max(now - self.created_at, 0.0), 1),
+            "ttl_remaining": round(self.expires_at - now, 1),
+            "stale": now >= self.expires_at,
+            "hits": self.hits,
+        }
+
+
+class MemoryCache:
+    """
+    TTL va LRU bilan cheklangan thread-safe kesh.
+    Qiymatlar nusxalanmaydi - chaqiruvchilar ularni o'zgartirmasligi kerak.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        MemoryCache ni yaratish.
+
+        Args:
+            max_entries: Maksimal yozuvlar soni
+            max_bytes: Barcha yozuvlarning maksimal taxminiy hajmi (bayt)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._rejected = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Yaroqli yozuvni olish (LRU tartibida oxiriga suriladi).
+
+        Returns:
+            CacheEntry yoki None (yozuv yo'q yoki saqlanish muddati tugagan).
+            TTL tugagan, lekin stale oynasidagi yozuvda entry.stale True bo'ladi
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expired:
+                self._remove_locked(key)
+                self._expired += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            if entry.stale:
+                self._stale_hits += 1
+            else:
+                self._hits += 1
+            return entry
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0) -> Optional[CacheEntry]:
+        """
+        Qiymatni TTL bilan saqlash.
+        Bitta yozuv max_bytes dan katta bo'lsa u keshlanmaydi.
+
+        Args:
+            key: Kesh kaliti
+            value: Saqlanadigan qiymat
+            ttl: Yangilik muddati (soniya, 0 yoki manfiy - saqlanmaydi)
+            stale_ttl: TTL'dan keyin yozuv stale sifatida qaytariladigan muddat
+
+        Returns:
+            Saqlangan CacheEntry yoki None
+        """
+        if ttl <= 0:
+            return None
+        size = estimate_size(value)
+        now = time.time()
+        entry = CacheEntry(value, now, now + ttl, size, stale_until=now + ttl + max(stale_ttl, 0))
+
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            if size > self.max_bytes:
+                self._rejected += 1
+                logger.warning(f"Kesh yozuvi juda katta ({size} bayt), saqlanmadi: {key}")
+                return None
+
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self._evictions += 1
+        return entry
+
+    def delete(self, key: str) -> bool:
+        """Yozuvni o'chirish (bor edimi)."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove_locked(key)
+            return True
+
+    def invalidate(self, prefix: str) -> int:
+        """
+        Kaliti prefix bilan boshlanadigan yozuvlarni o'chirish.
+
+        Returns:
+            int: O'chirilgan yozuvlar soni
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove_locked(key)
+            return len(keys)
+
+    def clear(self) -> int:
+        """
+        Barcha yozuvlarni o'chirish.
+
+        Returns:
+            int: O'chirilgan yozuvlar soni
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+
+    def entries(self, prefix: str = "", limit: int = 100) -> List[dict]:
+        """
+        Yozuvlar ro'yxati (hajmi bo'yicha kamayish tartibida).
+
+        Args:
+            prefix: Faqat shu prefiks bilan boshlanadigan kalitlar
+            limit: Maksimal yozuvlar soni
+
+        Returns:
+            List[dict]: Kalit, hajm, yosh, qolgan TTL, stale va hit'lar soni
+        """
+        with self._lock:
+            matching = [(key, entry) for key, entry in self._entries.items() if key.startswith(prefix)]
+        matching.sort(key=lambda item: item[1].size, reverse=True)
+        return [entry.describe(key) for key, entry in matching[:limit]]
+
+    def _remove_locked(self, key: str) -> None:
+        """Yozuvni o'chirish (lock ostida chaqiriladi)."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """
+        Kesh metrikalari.
+
+        Returns:
+            dict: Yozuvlar soni va hajmi, chegaralar, hit/miss, hit ratio,
+                TTL tugashi va LRU chiqarishlari
+        """
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "hit_ratio": round((self._hits + self._stale_hits) / lookups, 4) if lookups else 0.0,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,146 @@
+"""
+Stale kesh yozuvlarini fonda yangilash.
+Har bir kalit uchun bir vaqtda faqat bitta yangilash ishlaydi. Yangilash
+so'rov context'isiz bajariladi - so'rovning query deadline'i va KILL QUERY
+mexanizmi fondagi query'ga ta'sir qilmaydi.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Kalit bo'yicha takrorlanmaydigan fon yangilashlari.
+    Sinxron yangilashlar alohida kichik thread pool'da (so'rovlarga xizmat
+    qiluvchi DB executor band qilinmaydi), async yangilashlar event loop
+    task'larida bajariladi.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        """
+        BackgroundRefresher ni yaratish.
+
+        Args:
+            max_workers: Sinxron yangilashlar uchun thread'lar soni
+        """
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+        self._started = 0
+        self._failed = 0
+
+    def _claim(self, key: str) -> bool:
+        """Kalit uchun yangilash hali boshlanmagan bo'lsa uni band qilish."""
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            self._started += 1
+            return True
+
+    def _finish(self, key: str, error: Optional[BaseException]) -> None:
+        """Yangilash tugadi - kalitni bo'shatish."""
+        with self._lock:
+            self._pending.discard(key)
+            if error is not None:
+                self._failed += 1
+        if error is not None:
+            logger.warning(f"Kesh yozuvini fonda yangilab bo'lmadi ({key}): {error}")
+
+    def submit(self, key: str, func: Callable[[], Any]) -> bool:
+        """
+        Sinxron yangilashni fonda boshlash.
+
+        Args:
+            key: Kesh kaliti
+            func: Query'ni bajarib keshni yangilovchi funksiya
+
+        Returns:
+            bool: Yangilash boshlandi (False - shu kalit allaqachon yangilanmoqda)
+        """
+        if not self._claim(key):
+            return False
+
+        def run() -> None:
+            error = None
+            try:
+                func()
+            except Exception as e:
+                error = e
+            finally:
+                self._finish(key, error)
+
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="cache-refresh",
+                    )
+        self._executor.submit(run)
+        return True
+
+    def submit_async(self, key: str, func: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Async yangilashni event loop task'i sifatida boshlash.
+
+        Args:
+            key: Kesh kaliti
+            func: Coroutine qaytaruvchi yangilash funksiyasi
+
+        Returns:
+            bool: Yangilash boshlandi
+        """
+        if not self._claim(key):
+            return False
+
+        async def run() -> None:
+            error = None
+            try:
+                await func()
+            except Exception as e:
+                error = e
+            finally:
+                self._finish(key, error)
+
+        # Bo'sh context - so'rovning QueryGuard'i fon task'iga o'tmaydi
+        task = asyncio.get_running_loop().create_task(run(), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    def stats(self) -> dict:
+        """
+        Fon yangilashlari metrikalari.
+
+        Returns:
+            dict: Hozir yangilanayotgan kalitlar, boshlangan va xatolik bilan tugaganlar
+        """
+        with self._lock:
+            return {
+                "in_progress": len(self._pending),
+                "started": self._started,
+                "failed": self._failed,
+            }
+
+    def shutdown(self) -> None:
+        """Fon yangilashlarini to'xtatish (ilova to'xtaganda chaqiriladi)."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global background refresher instance
+cache_refresher = BackgroundRefresher()
@@ -0,0 +1,196 @@
+"""
+Bir xil parallel so'rovlarni birlashtirish (single-flight).
+Kalit bo'yicha birinchi chaqiruvchi (leader) query'ni bajaradi, shu paytda
+kelgan bir xil chaqiruvlar uning natijasini kutadi - o'nta bir xil so'rov
+bitta query va bitta ulanishga tushadi.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.config.query_guard import QueryCancelledError, QueryGuard, get_query_guard
+
+logger = logging.getLogger(__name__)
+
+# Kutuvchi o'z QueryGuard'ini (client uzilishi, deadline) shu oraliqda tekshiradi
+WAIT_SLICE_SECONDS = 0.1
+
+
+class _Call:
+    """Bajarilayotgan chaqiruv: natija yoki xatolik va kutuvchilar soni."""
+
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread'lar uchun single-flight (executor va sync rejimlar).
+
+    Leader'ning query'si uning o'z deadline'i yoki client uzilishi sababli
+    to'xtatilsa (QueryCancelledError), kutuvchilar xatolikni olmaydi -
+    ulardan biri yangi leader bo'lib query'ni qayta bajaradi.
+
+    Kutuvchi o'z QueryGuard'iga bo'ysunadi: uning client'i uzilsa yoki
+    deadline'i o'tsa, leader tugashini kutmasdan QueryCancelledError bilan
+    chiqadi va executor thread'ini bo'shatadi.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        func() ni kalit bo'yicha bir marta bajarish.
+
+        Args:
+            key: Chaqiruv kaliti (kesh kaliti bilan bir xil)
+            func: Bajariladigan funksiya
+
+        Returns:
+            func() natijasi (kutuvchilarga ham aynan shu obyekt qaytadi)
+
+        Raises:
+            QueryCancelledError: Kutuvchining o'z so'rovi bekor qilindi yoki deadline o'tdi
+        """
+        guard = get_query_guard()
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                    self._executed += 1
+                    break
+                call.waiters += 1
+                self._coalesced += 1
+
+            self._wait(call, guard)
+            if isinstance(call.error, QueryCancelledError):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    @staticmethod
+    def _wait(call: _Call, guard: Optional[QueryGuard]) -> None:
+        """
+        Leader natijasini kutish.
+        Guard bo'lsa kutish bo'laklarga bo'linadi va har biridan keyin
+        guard.check() chaqiriladi - bekor qilingan so'rov darhol chiqadi.
+        """
+        if guard is None:
+            call.event.wait()
+            return
+        while True:
+            guard.check()
+            timeout = WAIT_SLICE_SECONDS
+            if guard.deadline is not None:
+                timeout = min(timeout, max(guard.deadline - time.monotonic(), 0))
+            if call.event.wait(timeout):
+                return
+
+    def stats(self) -> dict:
+        """
+        Single-flight metrikalari.
+
+        Returns:
+            dict: Bajarilgan va birlashtirilgan chaqiruvlar, hozir bajarilayotganlar
+        """
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Event loop uchun single-flight (DB_RUNTIME_MODE=async).
+    Kutuvchilar asyncio.shield orqali kutadi - ulardan birining bekor
+    qilinishi leader'ning query'sini to'xtatmaydi.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Future] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        await func() ni kalit bo'yicha bir marta bajarish.
+
+        Args:
+            key: Chaqiruv kaliti
+            func: Coroutine qaytaruvchi funksiya
+
+        Returns:
+            func() natijasi
+        """
+        while key in self._calls:
+            future = self._calls[key]
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except QueryCancelledError:
+                continue
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # Leader task bekor qilindi - query qayta bajariladi
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._executed += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Kutuvchi bo'lmasa "exception was never retrieved" ogohlantirishi chiqmasin
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        """Single-flight metrikalari (SingleFlight.stats bilan bir xil)."""
+        return {
+            "in_flight": len(self._calls),
+            "executed": self._executed,
+            "coalesced": self._coalesced,
+        }
+
+
+# Global single-flight instances (sync/executor va async rejimlar uchun)
+query_flights = SingleFlight()
+async_query_flights = AsyncSingleFlight()
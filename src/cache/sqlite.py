@@ -0,0 +1,375 @@
+"""
+Bitta server'dagi barcha worker'lar uchun umumiy disk keshi (SQLite).
+MemoryCache bilan bir xil interfeys: get / set / delete / invalidate / clear /
+stats. Har bir analitika natijasi barcha uvicorn worker'lari uchun bitta
+nusxada saqlanadi - har bir process o'z keshini alohida isitmaydi.
+
+Yozuvlar tranzaksiya ichida atomik yoziladi (WAL rejimi - o'quvchilar
+yozuvchini kutmaydi). Chegaradan oshganda eng uzoq ishlatilmagan (LRU)
+yozuvlar o'chiriladi. Tashqi servis kerak emas.
+
+O'qish (get) faylga yozmaydi: hit'lar va last_used_at process ichida
+yig'iladi va keyingi set() tranzaksiyasida (yoki entries() da) bitta
+paket bo'lib yoziladi; muddati o'tgan yozuvlarni eviction o'chiradi.
+
+Qiymatlar pickle qilinadi, shuning uchun kesh papkasi faqat joriy
+foydalanuvchiga tegishli bo'lishi shart (0700): boshqa foydalanuvchi
+yozishi mumkin bo'lgan papka yoki fayl ochilmaydi.
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .memory import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        stale_until REAL NOT NULL,
+        size INTEGER NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0,
+        last_used_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_cache_entries_last_used ON cache_entries (last_used_at)",
+    "CREATE INDEX IF NOT EXISTS idx_cache_entries_stale_until ON cache_entries (stale_until)",
+)
+
+
+class SQLiteCache:
+    """
+    SQLite faylidagi TTL + LRU kesh.
+    Har bir thread (va fork'dan keyin har bir process) o'z SQLite ulanishini
+    ochadi; hit/miss hisoblagichlari va hali yozilmagan murojaatlar process
+    ichida yuritiladi.
+    """
+
+    FILE_NAME = "analytics_cache.sqlite3"
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024,
+        busy_timeout: float = 5.0,
+    ) -> None:
+        """
+        SQLiteCache ni yaratish (fayl birinchi murojaatda ochiladi).
+
+        Args:
+            directory: Kesh fayli joylashadigan papka (kerak bo'lsa 0700 bilan yaratiladi)
+            max_entries: Maksimal yozuvlar soni
+            max_bytes: Serializatsiya qilingan qiymatlarning maksimal umumiy hajmi (bayt)
+            busy_timeout: Boshqa worker yozayotganda kutish vaqti (soniya)
+        """
+        self.path = Path(directory) / self.FILE_NAME
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        # Hali faylga yozilmagan murojaatlar: kalit -> (oxirgi murojaat vaqti, hit'lar soni)
+        self._touches: Dict[str, Tuple[float, int]] = {}
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+        self._rejected = 0
+        self._errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Joriy thread/process uchun SQLite ulanishi."""
+        pid = os.getpid()
+        cnx = getattr(self._local, "cnx", None)
+        if cnx is not None and self._local.pid == pid:
+            return cnx
+
+        self._check_permissions()
+        # isolation_level=None - tranzaksiyalar BEGIN IMMEDIATE bilan qo'lda boshqariladi
+        cnx = sqlite3.connect(str(self.path), timeout=self.busy_timeout, isolation_level=None)
+        cnx.execute("PRAGMA journal_mode=WAL")
+        cnx.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            with self._lock:
+                for statement in _SCHEMA:
+                    cnx.execute(statement)
+                self._schema_ready = True
+
+        self._local.cnx = cnx
+        self._local.pid = pid
+        return cnx
+
+    def _check_permissions(self) -> None:
+        """
+        Kesh papkasini 0700 bilan yaratish va papka/fayl egasini tekshirish.
+
+        Raises:
+            PermissionError: Papka yoki fayl boshqa foydalanuvchiga tegishli yoki
+                papkaga guruh/boshqalar kira oladi (pickle qiymatlarni almashtirish mumkin)
+        """
+        directory = self.path.parent
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not hasattr(os, "getuid"):
+            return  # Windows: POSIX egalik va huquqlari yo'q
+
+        uid = os.getuid()
+        info = directory.stat()
+        if info.st_uid != uid or stat.S_IMODE(info.st_mode) & 0o077:
+            raise PermissionError(
+                f"Kesh papkasi xavfsiz emas: {directory} (egasi {info.st_uid}, "
+                f"huquqlar {stat.S_IMODE(info.st_mode):o}; kerak: egasi {uid}, 0700)"
+            )
+        if self.path.exists() and self.path.stat().st_uid != uid:
+            raise PermissionError(f"Kesh fayli boshqa foydalanuvchiga tegishli: {self.path}")
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """Process ichidagi hisoblagichni oshirish."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _touch(self, key: str, now: float) -> int:
+        """
+        Murojaatni yozilmaganlar ro'yxatiga qo'shish.
+
+        Returns:
+            int: Shu kalit uchun hali yozilmagan hit'lar soni
+        """
+        with self._lock:
+            _, hits = self._touches.get(key, (now, 0))
+            self._touches[key] = (now, hits + 1)
+            return hits + 1
+
+    def _flush_touches(self, cnx: sqlite3.Connection) -> None:
+        """Yig'ilgan murojaatlarni yozish (tranzaksiya ichida chaqiriladi; xatolikda ular tashlab yuboriladi)."""
+        with self._lock:
+            touches, self._touches = self._touches, {}
+        if touches:
+            cnx.executemany(
+                "UPDATE cache_entries SET last_used_at = MAX(last_used_at, ?), hits = hits + ? WHERE key = ?",
+                [(used_at, hits, key) for key, (used_at, hits) in touches.items()],
+            )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Yaroqli yozuvni olish (faqat SELECT - murojaat process ichida yig'iladi).
+        Disk xatoligi kesh miss deb hisoblanadi - so'rov DB'dan bajariladi.
+
+        Returns:
+            CacheEntry yoki None; stale oynasidagi yozuvda entry.stale True
+        """
+        now = time.time()
+        try:
+            cnx = self._connection()
+            row = cnx.execute(
+                "SELECT value, created_at, expires_at, stale_until, size, hits "
+                "FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None and row[3] <= now:
+                self._count("_expired")  # Eviction o'chiradi
+                row = None
+            if row is None:
+                self._count("_misses")
+                return None
+            value = pickle.loads(row[0])
+        except (sqlite3.Error, OSError, pickle.UnpicklingError, EOFError) as e:
+            self._count("_errors")
+            self._count("_misses")
+            logger.warning(f"Disk keshidan o'qib bo'lmadi ({key}): {e}")
+            return None
+
+        entry = CacheEntry(value, row[1], row[2], row[4], stale_until=row[3], hits=row[5] + self._touch(key, now))
+        self._count("_stale_hits" if entry.stale else "_hits")
+        return entry
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0) -> Optional[CacheEntry]:
+        """
+        Qiymatni atomik yozish va chegaradan oshgan LRU yozuvlarni o'chirish.
+
+        Args:
+            key: Kesh kaliti
+            value: Saqlanadigan qiymat (pickle qilinadi)
+            ttl: Yangilik muddati (soniya, 0 yoki manfiy - saqlanmaydi)
+            stale_ttl: TTL'dan keyin yozuv stale sifatida qaytariladigan muddat
+
+        Returns:
+            Saqlangan CacheEntry yoki None
+        """
+        if ttl <= 0:
+            return None
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(blob)
+        if size > self.max_bytes:
+            self._count("_rejected")
+            logger.warning(f"Kesh yozuvi juda katta ({size} bayt), saqlanmadi: {key}")
+            return None
+
+        now = time.time()
+        entry = CacheEntry(value, now, now + ttl, size, stale_until=now + ttl + max(stale_ttl, 0))
+        try:
+            cnx = self._connection()
+            cnx.execute("BEGIN IMMEDIATE")
+            try:
+                self._flush_touches(cnx)
+                cnx.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(key, value, created_at, expires_at, stale_until, size, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, blob, entry.created_at, entry.expires_at, entry.stale_until, size, now),
+                )
+                self._evict_locked(cnx, now)
+                cnx.execute("COMMIT")
+            except BaseException:
+                cnx.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, OSError) as e:
+            self._count("_errors")
+            logger.warning(f"Disk keshiga yozib bo'lmadi ({key}): {e}")
+            return None
+        return entry
+
+    def _evict_locked(self, cnx: sqlite3.Connection, now: float) -> None:
+        """Muddati o'tgan, keyin eng uzoq ishlatilmagan yozuvlarni o'chirish (tranzaksiya ichida)."""
+        cnx.execute("DELETE FROM cache_entries WHERE stale_until <= ?", (now,))
+        count, total = cnx.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            row = cnx.execute(
+                "SELECT key, size FROM cache_entries ORDER BY last_used_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            cnx.execute("DELETE FROM cache_entries WHERE key = ?", (row[0],))
+            count -= 1
+            total -= row[1]
+            self._count("_evictions")
+
+    def _write(self, query: str, params: tuple = ()) -> int:
+        """
+        O'chirish query'sini bajarish (disk xatoligi log qilinadi).
+
+        Returns:
+            int: Ta'sirlangan yozuvlar soni (xatolikda 0)
+        """
+        try:
+            return self._connection().execute(query, params).rowcount
+        except (sqlite3.Error, OSError) as e:
+            self._count("_errors")
+            logger.warning(f"Disk keshini o'zgartirib bo'lmadi: {e}")
+            return 0
+
+    def delete(self, key: str) -> bool:
+        """Yozuvni o'chirish (bor edimi)."""
+        return self._write("DELETE FROM cache_entries WHERE key = ?", (key,)) > 0
+
+    def invalidate(self, prefix: str) -> int:
+        """
+        Kaliti prefix bilan boshlanadigan yozuvlarni o'chirish.
+
+        Returns:
+            int: O'chirilgan yozuvlar soni
+        """
+        # LIKE o'rniga substr - kalitdagi '%' va '_' maxsus belgi emas
+        return self._write("DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def clear(self) -> int:
+        """
+        Barcha yozuvlarni o'chirish (barcha worker'lar uchun).
+
+        Returns:
+            int: O'chirilgan yozuvlar soni
+        """
+        return self._write("DELETE FROM cache_entries")
+
+    def entries(self, prefix: str = "", limit: int = 100) -> List[dict]:
+        """
+        Yozuvlar ro'yxati (hajmi bo'yicha kamayish tartibida, qiymatlar o'qilmaydi).
+        Avval shu process'da yig'ilgan murojaatlar yoziladi.
+
+        Args:
+            prefix: Faqat shu prefiks bilan boshlanadigan kalitlar
+            limit: Maksimal yozuvlar soni
+
+        Returns:
+            List[dict]: Kalit, hajm, yosh, qolgan TTL, stale va hit'lar soni (barcha worker'lar bo'yicha)
+        """
+        try:
+            cnx = self._connection()
+            cnx.execute("BEGIN IMMEDIATE")
+            try:
+                self._flush_touches(cnx)
+                cnx.execute("COMMIT")
+            except BaseException:
+                cnx.execute("ROLLBACK")
+                raise
+            rows = cnx.execute(
+                "SELECT key, created_at, expires_at, stale_until, size, hits FROM cache_entries "
+                "WHERE substr(key, 1, ?) = ? AND stale_until > ? ORDER BY size DESC LIMIT ?",
+                (len(prefix), prefix, time.time(), limit),
+            ).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            self._count("_errors")
+            logger.warning(f"Disk keshi yozuvlarini o'qib bo'lmadi: {e}")
+            return []
+        return [
+            CacheEntry(None, created_at, expires_at, size, stale_until=stale_until, hits=hits).describe(key)
+            for key, created_at, expires_at, stale_until, size, hits in rows
+        ]
+
+    def __len__(self) -> int:
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Disk keshi yozuvlarini sanab bo'lmadi: {e}")
+            return 0
+
+    def stats(self) -> dict:
+        """
+        Kesh metrikalari (MemoryCache.stats bilan bir xil kalitlar).
+        Yozuvlar soni va hajmi umumiy fayldan, hit/miss esa shu process'dan.
+
+        Returns:
+            dict: Yozuvlar, chegaralar, hit/miss, hit ratio, chiqarishlar va xatoliklar
+        """
+        try:
+            entries, total = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Disk keshi statistikasini olib bo'lmadi: {e}")
+            entries, total = None, None
+
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            return {
+                "backend": "sqlite",
+                "path": str(self.path),
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "hit_ratio": round((self._hits + self._stale_hits) / lookups, 4) if lookups else 0.0,
+                "expired": self._expired,
+                "evictions": self._evictions,
+                "rejected": self._rejected,
+                "errors": self._errors,
+            }
@@ -0,0 +1,137 @@
+"""
+Analitika keshi statistikasi: repository metodlari va endpoint'lar bo'yicha
+HIT / STALE / MISS hisoblagichlari. Admin endpoint'lari va Prometheus
+metrikalari TTL va xotira byudjetini sozlash uchun shu raqamlarni ko'rsatadi.
+Hisoblagichlar har bir worker process'da alohida.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict
+
+# Endpoint javobi uchun qo'shimcha holatlar: RESPONSE - tayyor baytlar keshidan,
+# NOT_MODIFIED - 304, BYPASS - endpoint kesh ishlatmadi
+ENDPOINT_STATUSES = ("HIT", "STALE", "MISS", "RESPONSE", "NOT_MODIFIED", "BYPASS")
+
+
+def _ratio(counts: Dict[str, int]) -> dict:
+    """Hisoblagichlar va hit ratio (HIT/STALE/RESPONSE/NOT_MODIFIED - keshdan javob)."""
+    served = sum(counts.get(status, 0) for status in ("HIT", "STALE", "RESPONSE", "NOT_MODIFIED"))
+    lookups = served + counts.get("MISS", 0)
+    return {
+        **{status.lower(): count for status, count in sorted(counts.items())},
+        "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+    }
+
+
+class CacheStats:
+    """Metod va endpoint bo'yicha thread-safe kesh hisoblagichlari."""
+
+    def __init__(self) -> None:
+        self._methods: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._endpoints: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def record_method(self, method: str, status: str) -> None:
+        """Repository metodining kesh murojaatini yozish (HIT, STALE yoki MISS)."""
+        with self._lock:
+            self._methods[method][status] += 1
+
+    def record_endpoint(self, endpoint: str, status: str) -> None:
+        """Endpoint javobining kesh holatini yozish (ENDPOINT_STATUSES dan biri)."""
+        with self._lock:
+            self._endpoints[endpoint][status] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Barcha hisoblagichlar.
+
+        Returns:
+            dict: {"methods": {...}, "endpoints": {...}} - har biri holatlar soni va hit_ratio bilan
+        """
+        with self._lock:
+            return {
+                "methods": {name: _ratio(counts) for name, counts in sorted(self._methods.items())},
+                "endpoints": {name: _ratio(counts) for name, counts in sorted(self._endpoints.items())},
+            }
+
+    def raw(self) -> dict:
+        """Hisoblagichlar nusxasi (metrikalar eksporti uchun): {"methods": {nom: {holat: son}}, ...}."""
+        with self._lock:
+            return {
+                "methods": {name: dict(counts) for name, counts in self._methods.items()},
+                "endpoints": {name: dict(counts) for name, counts in self._endpoints.items()},
+            }
+
+    def prometheus(self, backend: dict) -> str:
+        """
+        Prometheus text formatidagi metrikalar.
+
+        Args:
+            backend: Kesh backend'i statistikasi (analytics_cache.stats())
+
+        Returns:
+            str: text/plain; version=0.0.4 formatidagi metrikalar
+        """
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        gauges = {
+            "entries": "Kesh yozuvlari soni",
+            "bytes": "Kesh yozuvlarining umumiy hajmi (bayt)",
+            "max_entries": "Yozuvlar soni chegarasi",
+            "max_bytes": "Hajm chegarasi (bayt)",
+            "hit_ratio": "Backend hit ratio",
+        }
+        counters = {
+            "hits": "Backend hit'lari",
+            "stale_hits": "Backend stale hit'lari",
+            "misses": "Backend miss'lari",
+            "expired": "Muddati o'tib o'chirilgan yozuvlar",
+            "evictions": "LRU bo'yicha chiqarilgan yozuvlar",
+            "rejected": "Juda katta bo'lgani uchun saqlanmagan yozuvlar",
+        }
+        labels = {"backend": backend.get("backend", "")}
+        for field, help_text in gauges.items():
+            if backend.get(field) is not None:
+                metric(f"analytics_cache_{field}", "gauge", help_text, [(labels, backend[field])])
+        for field, help_text in counters.items():
+            if backend.get(field) is not None:
+                metric(f"analytics_cache_{field}_total", "counter", help_text, [(labels, backend[field])])
+
+        raw = self.raw()
+        metric(
+            "analytics_cache_method_requests_total", "counter",
+            "Repository metodlari bo'yicha kesh murojaatlari",
+            [
+                ({"method": name, "status": status.lower()}, count)
+                for name, counts in sorted(raw["methods"].items())
+                for status, count in sorted(counts.items())
+            ],
+        )
+        metric(
+            "analytics_cache_endpoint_responses_total", "counter",
+            "Endpoint'lar bo'yicha javoblarning kesh holati",
+            [
+                ({"endpoint": name, "status": status.lower()}, count)
+                for name, counts in sorted(raw["endpoints"].items())
+                for status, count in sorted(counts.items())
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Hisoblagichlarni nolga tushirish."""
+        with self._lock:
+            self._methods.clear()
+            self._endpoints.clear()
+
+
+# Global cache stats instance
+cache_stats = CacheStats()
@@ -0,0 +1,81 @@
+"""
+So'rov davomida ishlatilgan kesh yozuvlarini kuzatish.
+Repository har bir keshlangan chaqiruvni CacheTrace'ga yozadi, middleware
+esa javobga X-Cache (HIT | STALE | MISS) va X-Data-Age sarlavhalarini qo'shadi.
+Trace ishlatilgan yozuvlarning eng qisqa qolgan yangilik muddatini ham
+saqlaydi - tayyor javob baytlari shundan uzoq keshlanmaydi.
+"""
+
+import contextvars
+import threading
+from typing import Optional
+
+from .stats import cache_stats
+
+# Holatlar "yomonlik" tartibida - bir so'rovda bir nechta chaqiruv bo'lsa eng yomoni ko'rsatiladi
+CACHE_STATUSES = ("HIT", "STALE", "MISS")
+
+
+class CacheTrace:
+    """Bitta HTTP so'rovning kesh holati va ma'lumotlar yoshi."""
+
+    def __init__(self) -> None:
+        self.status: Optional[str] = None
+        self.age = 0.0
+        self.fresh_for: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, status: str, age: float = 0.0, fresh_for: float = 0.0) -> None:
+        """
+        Keshlangan chaqiruv natijasini yozish.
+
+        Args:
+            status: HIT, STALE yoki MISS
+            age: Qaytarilgan ma'lumotlar yoshi (soniya, MISS uchun 0)
+            fresh_for: Natija yana qancha vaqt yangi hisoblanadi (soniya, STALE uchun 0)
+        """
+        with self._lock:
+            if self.status is None or CACHE_STATUSES.index(status) > CACHE_STATUSES.index(self.status):
+                self.status = status
+            self.age = max(self.age, age)
+            fresh_for = max(fresh_for, 0.0)
+            self.fresh_for = fresh_for if self.fresh_for is None else min(self.fresh_for, fresh_for)
+
+    @property
+    def response_ttl(self) -> float:
+        """
+        Javobni keshlash mumkin bo'lgan muddat (soniya).
+        Kesh ishlatilmagan yoki eskirgan natija qaytarilgan bo'lsa 0.
+        """
+        if self.status not in ("HIT", "MISS"):
+            return 0.0
+        return self.fresh_for or 0.0
+
+    def headers(self) -> list:
+        """Javob sarlavhalari (ASGI formatida; kesh ishlatilmagan bo'lsa bo'sh)."""
+        if self.status is None:
+            return []
+        return [
+            (b"x-cache", self.status.encode("latin-1")),
+            (b"x-data-age", str(int(self.age)).encode("latin-1")),
+        ]
+
+
+# Joriy HTTP so'rovning CacheTrace'i (executor thread'lariga context bilan ko'chadi)
+current_cache_trace: contextvars.ContextVar[Optional[CacheTrace]] = contextvars.ContextVar(
+    "current_cache_trace", default=None
+)
+
+
+def record_cache_access(
+    status: str,
+    age: float = 0.0,
+    fresh_for: float = 0.0,
+    method: Optional[str] = None,
+) -> None:
+    """Metod statistikasiga va joriy so'rov bo'lsa, uning CacheTrace'iga yozish."""
+    if method is not None:
+        cache_stats.record_method(method, status)
+    trace = current_cache_trace.get()
+    if trace is not None:
+        trace.record(status, age, fresh_for)
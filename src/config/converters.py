@@ -0,0 +1,194 @@
+"""
+Natija qatorlarini to'g'ridan-to'g'ri JSON turlariga dekodlash.
+Converter cursor darajasida ishlaydi: DECIMAL qiymatlar Decimal obyekti
+yaratilmasdan float (yoki butun songa ko'paytirilgan int), DATE/DATETIME
+esa ISO satr bo'lib keladi - natijani ikkinchi marta aylanib chiqish kerak emas.
+
+Rejimlar (query bo'yicha tanlanadi):
+    native - connector default'i (Decimal, datetime.date, datetime.datetime)
+    json   - DECIMAL -> float, DATE/DATETIME/TIMESTAMP -> ISO satr
+    scaled - json bilan bir xil, lekin DECIMAL -> int (qiymat * 10**DB_DECIMAL_SCALE)
+"""
+
+import datetime
+import functools
+from contextlib import contextmanager
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Callable, Dict, Generator, Optional
+
+from mysql.connector.conversion import MySQLConverter
+
+from .settings import settings
+
+DECODE_MODES = ("native", "json", "scaled")
+
+# MySQL "nol" sanalari (0000-00-00) connector'dagi kabi None bo'ladi
+_ZERO_DATE = b"0000-00-00"
+
+
+def _scale_decimal_text(text: str, scale: int) -> int:
+    """
+    DECIMAL matnini Decimal yaratmasdan 10**scale ga ko'paytirilgan int'ga aylantirish.
+    Ortiqcha kasr xonalari ROUND_HALF_UP bo'yicha yaxlitlanadi.
+    """
+    whole, _, fraction = text.partition(".")
+    fraction = fraction.ljust(scale + 1, "0")
+    value = int(whole + fraction[:scale])
+    if fraction[scale] >= "5":
+        value += -1 if text.startswith("-") else 1
+    return value
+
+
+class JSONConverter(MySQLConverter):
+    """
+    Text protocol qiymatlarini JSON'ga tayyor turlarga dekodlovchi converter.
+    Qolgan turlar (int, float, satr, TIME) MySQLConverter'dagi kabi.
+    """
+
+    def _decimal_to_python(self, value: bytes, desc: Any = None) -> float:
+        """DECIMAL -> float."""
+        return float(value)
+
+    _newdecimal_to_python = _decimal_to_python
+
+    @staticmethod
+    def _date_to_python(value: bytes, dsc: Any = None) -> Optional[str]:
+        """DATE -> 'YYYY-MM-DD' (server matni allaqachon ISO formatda)."""
+        if isinstance(value, datetime.date):
+            return value.isoformat()
+        if value.startswith(_ZERO_DATE):
+            return None
+        return value.decode("ascii")
+
+    _newdate_to_python = _date_to_python
+
+    @staticmethod
+    def _datetime_to_python(value: bytes, dsc: Any = None) -> Optional[str]:
+        """DATETIME/TIMESTAMP -> 'YYYY-MM-DDTHH:MM:SS[.ffffff]' (datetime.isoformat() bilan bir xil)."""
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        if value.startswith(_ZERO_DATE):
+            return None
+        return value.decode("ascii").replace(" ", "T", 1)
+
+    _timestamp_to_python = _datetime_to_python
+
+
+class ScaledDecimalConverter(JSONConverter):
+    """DECIMAL qiymatlarni butun songa (masalan, tiyin/sentga) dekodlovchi converter."""
+
+    def _decimal_to_python(self, value: bytes, desc: Any = None) -> int:
+        """DECIMAL -> int (qiymat * 10**DB_DECIMAL_SCALE)."""
+        return _scale_decimal_text(value.decode("ascii"), settings.db_decimal_scale)
+
+    _newdecimal_to_python = _decimal_to_python
+
+
+CONVERTER_CLASSES = {
+    "json": JSONConverter,
+    "scaled": ScaledDecimalConverter,
+}
+
+
+def check_decode_mode(decode: Optional[str]) -> Optional[str]:
+    """
+    Dekodlash rejimini tekshirish.
+
+    Returns:
+        Converter kerak bo'lgan rejim yoki None (native)
+
+    Raises:
+        ValueError: Noma'lum rejim
+    """
+    if decode is None or decode == "native":
+        return None
+    if decode not in CONVERTER_CLASSES:
+        raise ValueError(f"Noma'lum dekodlash rejimi: {decode} (mumkin: {', '.join(DECODE_MODES)})")
+    return decode
+
+
+@contextmanager
+def use_converter(cnx: Any, decode: Optional[str]) -> Generator[None, None, None]:
+    """
+    mysql-connector ulanishida converter'ni vaqtincha almashtirish.
+    Qatorlar fetch paytida dekodlanadi, shuning uchun natija shu blok ichida
+    o'qilishi kerak; blokdan chiqishda pool'dagi ulanish asl holatiga qaytadi.
+
+    C extension converter berilganda qiymatlarni C'da aylantirmaydi (raw
+    rejim) va ularni shu converter orqali o'tkazadi. Converter'siz (C'da
+    aylantiruvchi) ulanishga blokdan keyin MySQLConverter qo'yiladi - natija
+    turlari bir xil, raw rejim esa shu converter bilan izchil qoladi.
+
+    Args:
+        cnx: Asl mysql-connector ulanishi
+        decode: Dekodlash rejimi (None/native - o'zgarishsiz)
+    """
+    mode = check_decode_mode(decode)
+    if mode is None:
+        yield
+        return
+
+    saved_class = type(cnx.converter) if cnx.converter is not None else MySQLConverter
+    cnx.set_converter_class(CONVERTER_CLASSES[mode])
+    try:
+        yield
+    finally:
+        cnx.set_converter_class(saved_class)
+
+
+def value_decoder(decode: Optional[str]) -> Optional[Callable[[Any], Any]]:
+    """
+    Allaqachon Python turiga aylangan qiymatlar uchun dekoder.
+    Binary protocol (prepared statement) converter'ni chaqirmaydi -
+    bu funksiya qatorlar dict'ga yig'ilayotgan paytda qo'llanadi.
+
+    Returns:
+        Qiymatni dekodlovchi funksiya yoki None (native)
+    """
+    mode = check_decode_mode(decode)
+    if mode is None:
+        return None
+    scale = settings.db_decimal_scale
+
+    def decode_value(value: Any) -> Any:
+        if isinstance(value, Decimal):
+            if mode == "scaled":
+                return int(value.scaleb(scale).to_integral_value(ROUND_HALF_UP))
+            return float(value)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        return value
+
+    return decode_value
+
+
+@functools.lru_cache(maxsize=None)
+def aiomysql_decoders(decode: Optional[str]) -> Optional[Dict[int, Callable]]:
+    """
+    PyMySQL/aiomysql uchun decoders lug'ati (connection.decoders o'rniga).
+    PyMySQL DECIMAL va sanalarni converter'ga ascii satr sifatida beradi.
+
+    Returns:
+        Decoders lug'ati yoki None (native)
+    """
+    mode = check_decode_mode(decode)
+    if mode is None:
+        return None
+
+    from pymysql.constants import FIELD_TYPE
+    from pymysql.converters import decoders
+
+    if mode == "scaled":
+        scale = settings.db_decimal_scale
+        decimal_decoder = lambda text: _scale_decimal_text(text, scale)  # noqa: E731
+    else:
+        decimal_decoder = float
+
+    return {
+        **decoders,
+        FIELD_TYPE.DECIMAL: decimal_decoder,
+        FIELD_TYPE.NEWDECIMAL: decimal_decoder,
+        FIELD_TYPE.DATE: lambda text: None if text.startswith("0000-00-00") else text,
+        FIELD_TYPE.DATETIME: lambda text: None if text.startswith("0000-00-00") else text.replace(" ", "T", 1),
+        FIELD_TYPE.TIMESTAMP: lambda text: None if text.startswith("0000-00-00") else text.replace(" ", "T", 1),
+    }
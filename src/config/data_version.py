@@ -0,0 +1,85 @@
+"""
+Ma'lumotlar versiyasi (data-version watermark).
+Analitika jadvallarining arzon "o'zgarish belgisi" - har bir jadval uchun
+MAX(primary key) va COUNT(*). Yangi buyurtma, qator, mahsulot yoki mijoz
+qo'shilsa (yoki o'chirilsa) versiya o'zgaradi, shuning uchun u analitika
+kesh kalitlariga qo'shiladi va kesh jadvallar o'zgarmaguncha yaroqli qoladi.
+
+Eslatma: mavjud qatorni joyida UPDATE qilish belgini o'zgartirmaydi -
+bunday o'zgarishlarni kesh TTL'i (ANALYTICS_CACHE_VERSIONED_TTL_SECONDS) qoplaydi.
+
+ANALYTICS_USE_SALES_FACT yoqilganda fakt jadvalining yangilash reviziyasi ham
+belgiga kiradi - fakt yangilanganda keshlangan natijalar ham yangilanadi
+(manba o'zgarib, fakt hali yangilanmagan oraliqda hisoblangan natija
+keyingi versiyada qayta ishlatilmaydi).
+ANALYTICS_USE_EMPLOYEE_CLOSURE yoqilganda closure'ning Employee imzosi ham
+kiradi - rahbar almashganda ierarxiya natijasi closure bilan birga yangilanadi.
+"""
+
+import hashlib
+from typing import Dict, Optional, Sequence
+
+from .settings import settings
+
+# Kuzatiladigan jadvallar va ularning primary key ustunlari
+DATA_VERSION_TABLES: Dict[str, str] = {
+    "SalesOrder": "orderId",
+    "OrderDetail": "orderDetailId",
+    "Product": "productId",
+    "Customer": "custId",
+    "Employee": "employeeId",
+}
+
+
+def build_watermark_query(
+    tables: Dict[str, str] = None,
+    facts: Sequence[str] = (),
+    closures: Sequence[str] = (),
+) -> str:
+    """
+    Barcha jadvallar belgisini bitta so'rovda oluvchi query.
+    MAX(primary key) indeks oxiridan o'qiladi, COUNT(*) esa eng kichik indeksni skanerlaydi.
+
+    Args:
+        tables: Jadval -> primary key ustuni (default: DATA_VERSION_TABLES)
+        facts: FactRefreshState'dagi fakt jadvallari (yangilash reviziyasi)
+        closures: ClosureRefreshState'dagi closure jadvallari (manba jadval imzosi)
+
+    Returns:
+        str: SELECT (SELECT MAX(..) FROM ..) AS .._max_id, (SELECT COUNT(*) ..) AS .._count, ...
+    """
+    columns = []
+    for table, key in (tables or DATA_VERSION_TABLES).items():
+        columns.append(f"(SELECT MAX({key}) FROM {table}) AS {table}_max_id")
+        columns.append(f"(SELECT COUNT(*) FROM {table}) AS {table}_count")
+    for fact in facts:
+        columns.append(
+            f"(SELECT revision FROM FactRefreshState WHERE factName = '{fact}') AS {fact}_revision"
+        )
+    for closure in closures:
+        columns.append(
+            f"(SELECT signature FROM ClosureRefreshState WHERE closureName = '{closure}') AS {closure}_signature"
+        )
+    return "SELECT " + ", ".join(columns)
+
+
+WATERMARK_QUERY = build_watermark_query(
+    facts=("DailySalesFact",) if settings.analytics_use_sales_fact else (),
+    closures=("EmployeeClosure",) if settings.analytics_use_employee_closure else (),
+)
+
+
+def compute_data_version(watermark: Optional[dict]) -> Optional[str]:
+    """
+    Watermark qatoridan qisqa versiya satri.
+
+    Args:
+        watermark: WATERMARK_QUERY natijasi
+
+    Returns:
+        str: 12 belgili hex versiya (watermark bo'lmasa None)
+    """
+    if not watermark:
+        return None
+    text = "|".join(f"{name}={watermark[name]}" for name in sorted(watermark))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
@@ -1,28 +1,63 @@
 """
 MySQL database ulanishini boshqarish.
 Connection pooling va context manager supportni ta'minlaydi.
+Pool'lar import paytida emas, har bir worker process'da birinchi
+murojaatda (yoki lifespan'dagi initialize() chaqiruvida) yaratiladi.
 """
 
+import asyncio
+import functools
 import logging
-from contextlib import contextmanager
-from typing import Generator, Optional
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Generator, Optional
 
 import mysql.connector
-from mysql.connector import pooling, Error as MySQLError
+from mysql.connector import Error as MySQLError
 
+from .converters import aiomysql_decoders, use_converter, value_decoder
+from .data_version import WATERMARK_QUERY, compute_data_version
+from .pool import ConnectionPool, PooledConnection, PoolTimeoutError
+from .query_guard import (
+    QUERY_CANCELLED_ERRNOS,
+    QueryCancelledError,
+    add_max_execution_time_hint,
+    get_query_guard,
+)
+from .replicas import ReplicaRouter, parse_replica_hosts
 from .settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Server bilan aloqa uzilganini bildiruvchi client xatolik kodlari
+# (CR_CONN_HOST_ERROR, CR_SERVER_GONE_ERROR, CR_SERVER_LOST, CR_SERVER_LOST_EXTENDED)
+LOST_CONNECTION_ERRNOS = frozenset({2003, 2006, 2013, 2055})
+
 
 class DatabaseManager:
     """
     MySQL database connection pool boshqaruvchisi.
-    Singleton pattern yordamida bitta pool yaratadi.
+    Singleton pattern yordamida primary pool va (sozlangan bo'lsa)
+    read-replica pool'larini yaratadi. readonly=True so'rovlar replica'larga,
+    qolganlari primary'ga yo'naltiriladi.
+
+    Pool'lar qaysi process'da yaratilgani eslab qolinadi: fork'dan keyin
+    bola process ota process socket'larini ishlatmaydi, o'z pool'ini ochadi.
     """
 
     _instance: Optional["DatabaseManager"] = None
-    _pool: Optional[pooling.MySQLConnectionPool] = None
+    _init_lock = threading.Lock()
+    _pid: Optional[int] = None
+    _pool: Optional[ConnectionPool] = None
+    _replicas: Optional[ReplicaRouter] = None
+    _async_pool: Optional[Any] = None
+    _async_replicas: Optional[ReplicaRouter] = None
+    _async_pool_lock: Optional[asyncio.Lock] = None
+    _data_watermark: Optional[dict] = None
+    _data_version: Optional[str] = None
+    _data_version_checked_at: Optional[float] = None
 
     def __new__(cls) -> "DatabaseManager":
         """Singleton pattern - faqat bitta instance yaratish."""
@@ -30,65 +65,200 @@ class DatabaseManager:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self) -> None:
-        """Database pool'ni ishga tushirish."""
-        if self._pool is None:
-            self._initialize_pool()
+    def initialize(self, prewarm: bool = False) -> None:
+        """
+        Joriy process uchun pool'larni yaratish (takroriy chaqiruv xavfsiz).
+        Ilova lifespan'ida chaqiriladi; chaqirilmasa birinchi ulanish
+        so'ralganda bajariladi.
 
-    def _initialize_pool(self) -> None:
+        Args:
+            prewarm: True bo'lsa har bir pool pool_size ta ulanish bilan
+                oldindan to'ldiriladi
         """
-        MySQL connection pool yaratish.
-        Pool size .env faylidan olinadi.
+        with self._init_lock:
+            pid = os.getpid()
+            if self._pool is not None and self._pid == pid:
+                return
+
+            if self._pid is not None and self._pid != pid:
+                # Fork'dan meros qolgan ulanishlar ota process bilan umumiy -
+                # ularni yopmasdan tashlab, shu process uchun yangi pool ochamiz
+                logger.info(f"Fork aniqlandi (pid {self._pid} -> {pid}), pool'lar qayta yaratiladi")
+                self._pool = None
+                self._replicas = None
+                self._async_pool = None
+                self._async_replicas = None
+                self._async_pool_lock = None
+
+            self._initialize_pool(prewarm)
+            self._pid = pid
+
+    def _ensure_pool(self) -> ConnectionPool:
+        """Joriy process pool'i (kerak bo'lsa shu yerda yaratiladi)."""
+        if self._pool is None or self._pid != os.getpid():
+            self.initialize()
+        return self._pool
+
+    @staticmethod
+    def _create_pool(name: str, host: str, port: int) -> ConnectionPool:
         """
-        try:
-            pool_config = {
-                "pool_name": "gastro_savdo_pool",
-                "pool_size": settings.db_pool_size,
-                "pool_reset_session": True,
-                "host": settings.db_host,
-                "port": settings.db_port,
-                "user": settings.db_user,
-                "password": settings.db_password,
-                "database": settings.db_name,
-                "charset": "utf8mb4",
-                "collation": "utf8mb4_general_ci",
-                "autocommit": False,
-                "use_pure": True,
-            }
-            self._pool = pooling.MySQLConnectionPool(**pool_config)
-            logger.info(
-                f"Database pool muvaffaqiyatli yaratildi: "
-                f"{settings.db_host}:{settings.db_port}/{settings.db_name}"
-            )
-        except MySQLError as e:
-            logger.error(f"Database pool yaratishda xatolik: {e}")
-            raise
+        Bitta MySQL server uchun connection pool yaratish.
+        Pool size, overflow, kutish timeout'i va ulanish hayot sikli
+        (reset rejimi, maksimal yosh, idle timeout, ping) .env faylidan olinadi.
+        """
+        connection_config = {
+            "host": host,
+            "port": port,
+            "user": settings.db_user,
+            "password": settings.db_password,
+            "database": settings.db_name,
+            "charset": "utf8mb4",
+            "collation": "utf8mb4_general_ci",
+            "autocommit": False,
+            "use_pure": settings.db_use_pure,
+        }
+        return ConnectionPool(
+            name=name,
+            connect=lambda: mysql.connector.connect(**connection_config),
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_pool_max_overflow,
+            timeout=settings.db_pool_timeout,
+            reset_mode=DatabaseManager._session_reset_mode(),
+            statement_cache_size=settings.db_statement_cache_size,
+            max_lifetime=settings.db_pool_max_lifetime,
+            idle_timeout=settings.db_pool_idle_timeout,
+            ping_after=settings.db_pool_ping_after,
+        )
+
+    @staticmethod
+    def _session_reset_mode() -> str:
+        """
+        DB_SESSION_RESET rejimi.
+        Sessiya reset server'dagi prepared statement'larni o'chiradi, shuning
+        uchun statement keshi yoqilganda "always" o'rniga "on_error" ishlatiladi.
+        """
+        mode = settings.db_session_reset.lower()
+        if mode == "always" and settings.db_prepared_statements:
+            logger.info("DB_PREPARED_STATEMENTS yoqilgan - sessiya faqat xatolikdan keyin tozalanadi")
+            return "on_error"
+        return mode
 
-    def get_connection(self) -> mysql.connector.MySQLConnection:
+    def _initialize_pool(self, prewarm: bool = False) -> None:
+        """
+        Primary va read-replica connection pool'larini yaratish.
+        Pool yaratish ulanish ochmaydi; prewarm bo'lsa ulanishlar oldindan
+        ochiladi. Primary'ga ulanib bo'lmasa ilova baribir ishga tushadi va
+        ulanish so'rov paytida qayta sinaladi; replica ishlamasa u nosoz deb
+        belgilanadi va o'qishlar primary'ga tushadi.
+        """
+        self._pool = self._create_pool("primary", settings.db_host, settings.db_port)
+        logger.info(
+            f"Database pool muvaffaqiyatli yaratildi: "
+            f"{settings.db_host}:{settings.db_port}/{settings.db_name}"
+        )
+        if prewarm:
+            try:
+                self._pool.prefill()
+            except MySQLError as e:
+                logger.error(f"Database pool'ni oldindan to'ldirishda xatolik: {e}")
+
+        self._replicas = ReplicaRouter(
+            strategy=settings.db_replica_strategy,
+            retry_after=settings.db_replica_retry_seconds,
+            busy=lambda pool: pool.in_use,
+        )
+        replica_hosts = parse_replica_hosts(settings.db_replica_hosts, settings.db_port)
+        for index, (host, port) in enumerate(replica_hosts, start=1):
+            name = f"replica_{index}"
+            pool = self._create_pool(name, host, port)
+            self._replicas.add(name, pool)
+            logger.info(f"Replica pool yaratildi: {name} ({host}:{port})")
+            if prewarm:
+                try:
+                    pool.prefill()
+                except MySQLError as e:
+                    self._replicas.mark_down(name, e)
+
+    def get_connection(self, timeout: float = None, readonly: bool = False) -> PooledConnection:
         """
         Pool'dan connection olish.
+        Barcha ulanishlar band bo'lsa, timeout tugaguncha navbatda kutadi.
+        
+        Args:
+            timeout: Kutish deadline'i soniyalarda (default: DB_POOL_TIMEOUT)
+            readonly: True bo'lsa sog'lom replica'dan olinadi, replica'lar
+                bo'lmasa yoki hammasi nosoz bo'lsa primary'dan
         
         Returns:
-            MySQLConnection: Database ulanishi
+            PooledConnection: Database ulanishi (close() pool'ga qaytaradi)
             
         Raises:
+            PoolTimeoutError: Deadline ichida ulanish bo'shamadi
             MySQLError: Ulanish olishda xatolik
         """
-        if self._pool is None:
-            raise RuntimeError("Database pool ishga tushmagan")
+        pool = self._ensure_pool()
         
         try:
-            connection = self._pool.get_connection()
+            if readonly and self._replicas:
+                connection = self._get_replica_connection(timeout)
+                if connection is not None:
+                    return connection
+            connection = pool.get_connection(timeout=timeout)
             return connection
+        except PoolTimeoutError as e:
+            logger.error(f"Connection kutish vaqti tugadi: {e.message}")
+            raise
         except MySQLError as e:
             logger.error(f"Connection olishda xatolik: {e}")
             raise
 
+    def _get_replica_connection(self, timeout: float = None) -> Optional[PooledConnection]:
+        """
+        Strategiya bo'yicha tanlangan replica'dan ulanish olish.
+        Ulanib bo'lmagan replica nosoz deb belgilanadi va keyingisi sinaladi.
+
+        Returns:
+            PooledConnection yoki None (sog'lom replica qolmadi)
+        """
+        for name, pool in self._replicas.candidates():
+            try:
+                connection = pool.get_connection(timeout=timeout)
+            except MySQLError as e:
+                self._replicas.mark_down(name, e)
+                continue
+            self._replicas.mark_up(name)
+            return connection
+
+        logger.debug("Sog'lom replica yo'q, o'qish primary'ga yo'naltirildi")
+        return None
+
+    def pool_stats(self) -> dict:
+        """
+        Connection pool metrikalari.
+        
+        Returns:
+            dict: Har bir nomlangan pool (primary, replica_N) uchun in-use/idle/waiting
+                soni, checkout latency histogram'i va replica'lar uchun healthy holati
+                (pool hali yaratilmagan bo'lsa bo'sh dict)
+        """
+        if self._pool is None or self._pid != os.getpid():
+            return {}
+
+        stats = {self._pool.name: self._pool.stats()}
+        if self._replicas:
+            health = self._replicas.stats()
+            for name, pool in self._replicas.pools().items():
+                stats[name] = {**pool.stats(), **health[name]}
+        return stats
+
     @contextmanager
-    def connection(self) -> Generator[mysql.connector.MySQLConnection, None, None]:
+    def connection(self, readonly: bool = False) -> Generator[mysql.connector.MySQLConnection, None, None]:
         """
         Context manager yordamida connection olish va avtomatik yopish.
         
+        Args:
+            readonly: True bo'lsa ulanish read-replica'dan olinadi
+            
         Yields:
             MySQLConnection: Database ulanishi
             
@@ -98,26 +268,93 @@ class DatabaseManager:
                 cursor.execute("SELECT * FROM admins")
         """
         conn = None
+        guard = get_query_guard()
         try:
-            conn = self.get_connection()
+            if guard:
+                guard.check()
+            conn = self.get_connection(readonly=readonly)
+            if guard:
+                guard.attach(self._query_killer(conn.raw_connection))
             yield conn
             conn.commit()
         except MySQLError as e:
             if conn:
-                conn.rollback()
+                conn.mark_dirty()
+            if conn and e.errno in LOST_CONNECTION_ERRNOS:
+                # Server bilan aloqa uzildi - replica bo'lsa keyingi so'rovlar uni chetlab o'tadi
+                if self._replicas and conn.pool_name != self._pool.name:
+                    self._replicas.mark_down(conn.pool_name, e)
+                conn.invalidate()
+            elif conn:
+                try:
+                    conn.rollback()
+                except MySQLError:
+                    # Rollback ham bajarilmasa ulanish buzilgan - pool'ga qaytmaydi
+                    conn.invalidate()
+            if guard and e.errno in QUERY_CANCELLED_ERRNOS:
+                raise QueryCancelledError(guard.endpoint, guard.reason or "deadline exceeded") from e
             logger.error(f"Database xatoligi: {e}")
             raise
+        except Exception:
+            # Tranzaksiya yakunlanmay qoldi - qaytarishda sessiya tozalanadi
+            if conn:
+                conn.mark_dirty()
+            raise
         finally:
-            if conn and conn.is_connected():
+            if guard:
+                guard.detach()
+            if conn:
                 conn.close()
 
+    def _query_killer(self, raw_connection: Any):
+        """
+        Ulanishdagi joriy query'ni to'xtatuvchi funksiya (QueryGuard uchun).
+        Thread id va server manzili oldindan olinadi - ulanishning o'ziga
+        query ishlayotgan paytda murojaat qilinmaydi.
+        """
+        return functools.partial(
+            self._kill_query,
+            raw_connection.server_host,
+            raw_connection.server_port,
+            raw_connection.connection_id,
+        )
+
+    @staticmethod
+    def _kill_query(host: str, port: int, thread_id: int) -> None:
+        """
+        Alohida qisqa ulanish orqali KILL QUERY yuborish.
+        Pool ishlatilmaydi: u band bo'lishi mumkin, KILL esa kutmasligi kerak.
+        """
+        killer = mysql.connector.connect(
+            host=host,
+            port=port,
+            user=settings.db_user,
+            password=settings.db_password,
+            connection_timeout=5,
+            use_pure=settings.db_use_pure,
+        )
+        try:
+            cursor = killer.cursor()
+            cursor.execute(f"KILL QUERY {int(thread_id)}")
+            cursor.close()
+        finally:
+            killer.close()
+
     @contextmanager
-    def cursor(self, dictionary: bool = True) -> Generator:
+    def cursor(
+        self,
+        dictionary: bool = True,
+        readonly: bool = False,
+        decode: Optional[str] = None
+    ) -> Generator:
         """
         Context manager yordamida cursor olish.
         
         Args:
             dictionary: True bo'lsa natijalar dict ko'rinishida qaytadi
+            readonly: True bo'lsa query read-replica'da bajariladi
+            decode: Qatorlarni cursor'da dekodlash rejimi (json | scaled,
+                None - connector default'i); natija blok ichida o'qilishi kerak
             
         Yields:
             MySQLCursor: Database cursor
@@ -127,7 +364,7 @@ class DatabaseManager:
                 cursor.execute("SELECT * FROM admins WHERE username = %s", (username,))
                 admin = cursor.fetchone()
         """
-        with self.connection() as conn:
+        with self.connection(readonly=readonly) as conn, use_converter(conn.raw_connection, decode):
             cursor = conn.cursor(dictionary=dictionary)
             try:
                 yield cursor
@@ -139,7 +376,9 @@ class DatabaseManager:
         query: str,
         params: tuple = None,
         fetch_one: bool = False,
-        fetch_all: bool = True
+        fetch_all: bool = True,
+        readonly: bool = False,
+        decode: Optional[str] = None
     ) -> Optional[list | dict]:
         """
         SQL query bajarish va natijani qaytarish.
@@ -149,11 +388,41 @@ class DatabaseManager:
             params: Query parametrlari (SQL injection himoyasi uchun)
             fetch_one: Faqat bitta natija olish
             fetch_all: Barcha natijalarni olish
+            readonly: True bo'lsa query read-replica'da bajariladi
+            decode: Qiymatlarni cursor'da dekodlash rejimi: "json" (DECIMAL ->
+                float, DATE/DATETIME -> ISO satr), "scaled" (DECIMAL -> int) yoki
+                None (Decimal va datetime obyektlari)
             
         Returns:
             Query natijalari yoki None
         """
-        with self.cursor() as cursor:
+        try:
+            return self._execute(query, params, fetch_one, fetch_all, readonly, decode)
+        except MySQLError as e:
+            if not (readonly and self._replicas and e.errno in LOST_CONNECTION_ERRNOS):
+                raise
+            # Nosoz replica allaqachon chetlatilgan - o'qish boshqa replica yoki primary'da takrorlanadi
+            logger.warning(f"Replica bilan aloqa uzildi, query qayta bajariladi: {e}")
+            return self._execute(query, params, fetch_one, fetch_all, readonly, decode)
+
+    def _execute(
+        self,
+        query: str,
+        params: tuple = None,
+        fetch_one: bool = False,
+        fetch_all: bool = True,
+        readonly: bool = False,
+        decode: Optional[str] = None
+    ) -> Optional[list | dict]:
+        """Query'ni text yoki binary protocol orqali bitta urinishda bajarish."""
+        guard = get_query_guard()
+        if guard and guard.hint_ms:
+            query = add_max_execution_time_hint(query, guard.hint_ms)
+
+        if self._use_prepared(query):
+            return self._execute_prepared(query, params, fetch_one, fetch_all, readonly, decode)
+
+        with self.cursor(readonly=readonly, decode=decode) as cursor:
             cursor.execute(query, params or ())
             
             if fetch_one:
@@ -162,6 +431,145 @@ class DatabaseManager:
                 return cursor.fetchall()
             return None
 
+    @staticmethod
+    def _use_prepared(query: str) -> bool:
+        """
+        Query prepared statement orqali bajarilishi kerakmi.
+        Faqat o'qish (SELECT / WITH ... SELECT) query'lari keshlanadi.
+        """
+        if not settings.db_prepared_statements:
+            return False
+        keyword = query.lstrip().split(None, 1)[0].upper() if query.strip() else ""
+        return keyword in ("SELECT", "WITH")
+
+    def _execute_prepared(
+        self,
+        query: str,
+        params: tuple = None,
+        fetch_one: bool = False,
+        fetch_all: bool = True,
+        readonly: bool = False,
+        decode: Optional[str] = None
+    ) -> Optional[list | dict]:
+        """
+        Query'ni ulanishning statement keshidagi prepared cursor orqali bajarish.
+        Bir xil query matni shu ulanishda qayta parse qilinmaydi va natija
+        binary protocol orqali keladi.
+
+        Binary protocol converter'ni chaqirmaydi, shuning uchun decode
+        qiymatlari qatorlar dict'ga yig'ilayotgan paytda aylantiriladi.
+        
+        Args:
+            query: SQL query (parameterized)
+            params: Query parametrlari
+            fetch_one: Faqat bitta natija olish
+            fetch_all: Barcha natijalarni olish
+            readonly: True bo'lsa query read-replica'da bajariladi
+            decode: Dekodlash rejimi (execute_query'dagi kabi)
+            
+        Returns:
+            Query natijalari (dict ko'rinishida) yoki None
+        """
+        with self.connection(readonly=readonly) as conn:
+            cursor, cached_query = conn.prepared_cursor(query)
+            try:
+                cursor.execute(cached_query, params or ())
+                if not cursor.with_rows:
+                    return None
+
+                columns = cursor.column_names
+                decode_value = value_decoder(decode)
+                # Keyingi execute uchun natija to'liq o'qilishi shart
+                if decode_value is None:
+                    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                else:
+                    rows = [dict(zip(columns, map(decode_value, row))) for row in cursor.fetchall()]
+            finally:
+                # Statement keshi o'chirilgan (DB_STATEMENT_CACHE_SIZE=0) - cursor bizniki
+                if not conn.caches_statements:
+                    cursor.close()
+
+            if fetch_one:
+                return rows[0] if rows else None
+            elif fetch_all:
+                return rows
+            return None
+
+    def iter_query(
+        self,
+        query: str,
+        params: tuple = None,
+        batch_size: int = 500,
+        readonly: bool = False,
+        decode: Optional[str] = None
+    ) -> Generator[dict, None, None]:
+        """
+        Katta natijalarni xotiraga to'liq yuklamasdan qatorma-qator olish.
+        Unbuffered cursor server'dan fetchmany(batch_size) bilan o'qiydi,
+        shuning uchun xotira natija hajmiga emas, batch_size ga bog'liq.
+
+        Ulanish faqat qatorlar oqayotgan paytda band bo'ladi. Iteratsiya
+        oxirigacha borsa ulanish pool'ga qaytadi; iste'molchi erta to'xtasa
+        (break, generator.close(), xatolik) o'qilmagan natija qolgan ulanish
+        pool'ga qaytarilmaydi va yopiladi.
+
+        Args:
+            query: SQL query (parameterized)
+            params: Query parametrlari
+            batch_size: Bir marta server'dan olinadigan qatorlar soni
+            readonly: True bo'lsa query read-replica'da bajariladi
+            decode: Dekodlash rejimi (execute_query'dagi kabi)
+
+        Yields:
+            dict: Natija qatori
+
+        Example:
+            for row in db_manager.iter_query("SELECT * FROM SalesOrder", batch_size=1000):
+                process(row)
+        """
+        guard = get_query_guard()
+        if guard:
+            guard.check()
+            if guard.hint_ms:
+                query = add_max_execution_time_hint(query, guard.hint_ms)
+
+        conn = self.get_connection(readonly=readonly)
+        cursor = None
+        exhausted = False
+        try:
+            if guard:
+                guard.attach(self._query_killer(conn.raw_connection))
+            with use_converter(conn.raw_connection, decode):
+                cursor = conn.cursor(dictionary=True, buffered=False)
+                cursor.execute(query, params or ())
+                if cursor.with_rows:
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        yield from rows
+            exhausted = True
+        except MySQLError as e:
+            if guard and e.errno in QUERY_CANCELLED_ERRNOS:
+                raise QueryCancelledError(guard.endpoint, guard.reason or "deadline exceeded") from e
+            raise
+        finally:
+            if guard:
+                guard.detach()
+            if exhausted:
+                try:
+                    cursor.close()
+                    conn.commit()
+                except MySQLError as e:
+                    logger.warning(f"Stream yakunida xatolik, ulanish tashlanadi: {e}")
+                    exhausted = False
+
+            if exhausted:
+                conn.close()
+            else:
+                # Ulanishda o'qilmagan qatorlar qolgan - drain qilish o'rniga yopamiz
+                conn.invalidate()
+
     def execute_many(self, query: str, params_list: list[tuple]) -> int:
         """
         Bir nechta INSERT/UPDATE operatsiyalarni bajarish.
@@ -177,17 +585,326 @@ class DatabaseManager:
             cursor.executemany(query, params_list)
             return cursor.rowcount
 
+    # ==================== Data version (watermark) ====================
+
+    @property
+    def data_version(self) -> Optional[str]:
+        """
+        Analitika jadvallarining joriy versiyasi (kesh kalitlariga qo'shiladi).
+        Hali tekshirilmagan yoki kuzatish o'chirilgan bo'lsa None.
+        """
+        return self._data_version
+
+    def poll_data_version(self) -> Optional[str]:
+        """
+        Watermark query'ni bajarib data versiyasini yangilash.
+        O'qish replica'da bajariladi - versiya analitika o'qiyotgan
+        ma'lumotlarga mos keladi.
+
+        Returns:
+            Joriy versiya
+        """
+        watermark = self.execute_query(WATERMARK_QUERY, fetch_one=True, readonly=True)
+        return self._set_data_version(watermark)
+
+    async def poll_data_version_async(self) -> Optional[str]:
+        """poll_data_version'ning aiomysql varianti."""
+        watermark = await self.execute_query_async(WATERMARK_QUERY, fetch_one=True, readonly=True)
+        return self._set_data_version(watermark)
+
+    def _set_data_version(self, watermark: Optional[dict]) -> Optional[str]:
+        """Yangi watermark'ni saqlash va versiya o'zgarganini log qilish."""
+        version = compute_data_version(watermark)
+        if version != self._data_version:
+            logger.info(f"Data versiyasi o'zgardi: {self._data_version} -> {version} ({watermark})")
+        self._data_watermark = watermark
+        self._data_version = version
+        self._data_version_checked_at = time.monotonic()
+        return version
+
+    async def watch_data_version(self, interval: float) -> None:
+        """
+        Data versiyasini interval bo'yicha tekshirib turish.
+        Lifespan'da task sifatida ishga tushiriladi; xatolik bo'lsa oldingi
+        versiya saqlanib qoladi va keyingi intervalda qayta tekshiriladi.
+
+        Args:
+            interval: Tekshiruvlar orasidagi pauza (soniya)
+        """
+        while True:
+            try:
+                if settings.use_async_db:
+                    await self.poll_data_version_async()
+                else:
+                    await asyncio.to_thread(self.poll_data_version)
+            except Exception as e:
+                logger.warning(f"Data versiyasini tekshirib bo'lmadi: {e}")
+            await asyncio.sleep(interval)
+
+    def data_version_stats(self) -> dict:
+        """
+        Data versiyasi holati.
+
+        Returns:
+            dict: Versiya, watermark qiymatlari va oxirgi tekshiruvdan beri o'tgan vaqt
+        """
+        checked_ago = None
+        if self._data_version_checked_at is not None:
+            checked_ago = round(time.monotonic() - self._data_version_checked_at, 1)
+        return {
+            "version": self._data_version,
+            "watermark": self._data_watermark,
+            "checked_seconds_ago": checked_ago,
+        }
+
+    # ==================== Async API (aiomysql) ====================
+
+    async def init_async_pool(self, prewarm: bool = False) -> None:
+        """
+        aiomysql connection pool yaratish.
+        Faqat DB_RUNTIME_MODE=async bo'lganda ishlatiladi, shuning uchun
+        aiomysql import'i shu yerda bajariladi.
+        
+        Args:
+            prewarm: True bo'lsa pool darhol pool_size ta ulanish ochadi
+        
+        Raises:
+            RuntimeError: aiomysql o'rnatilmagan
+        """
+        # Fork'dan keyin meros qolgan async pool shu yerda tashlab yuboriladi
+        self._ensure_pool()
+        if self._async_pool is not None:
+            return
+
+        if self._async_pool_lock is None:
+            self._async_pool_lock = asyncio.Lock()
+
+        async with self._async_pool_lock:
+            if self._async_pool is not None:
+                return
+
+            try:
+                import aiomysql
+            except ImportError as e:
+                raise RuntimeError(
+                    "Async rejim uchun aiomysql kerak: pip install aiomysql"
+                ) from e
+
+            pool_options = {
+                "maxsize": settings.db_pool_size,
+                "user": settings.db_user,
+                "password": settings.db_password,
+                "db": settings.db_name,
+                "charset": "utf8mb4",
+                "autocommit": False,
+                # aiomysql oxirgi ishlatilgan vaqtdan hisoblaydi - idle timeout bilan bir xil
+                "pool_recycle": settings.db_pool_idle_timeout or -1,
+            }
+            try:
+                self._async_pool = await aiomysql.create_pool(
+                    minsize=settings.db_pool_size if prewarm else 1,
+                    host=settings.db_host,
+                    port=settings.db_port,
+                    **pool_options,
+                )
+                logger.info(
+                    f"Async database pool yaratildi: "
+                    f"{settings.db_host}:{settings.db_port}/{settings.db_name}"
+                )
+            except Exception as e:
+                logger.error(f"Async database pool yaratishda xatolik: {e}")
+                raise
+
+            # minsize=0 - replica ishlamasa ham pool yaratiladi, ulanish birinchi so'rovda ochiladi
+            self._async_replicas = ReplicaRouter(
+                strategy=settings.db_replica_strategy,
+                retry_after=settings.db_replica_retry_seconds,
+                busy=lambda pool: pool.size - pool.freesize,
+            )
+            replica_hosts = parse_replica_hosts(settings.db_replica_hosts, settings.db_port)
+            for index, (host, port) in enumerate(replica_hosts, start=1):
+                pool = await aiomysql.create_pool(minsize=0, host=host, port=port, **pool_options)
+                self._async_replicas.add(f"replica_{index}", pool)
+
+    async def _acquire_async_replica(self) -> Optional[tuple]:
+        """
+        Sog'lom async replica'dan ulanish olish.
+
+        Returns:
+            (nom, pool, ulanish) yoki None (sog'lom replica qolmadi)
+        """
+        import aiomysql
+
+        for name, pool in self._async_replicas.candidates():
+            try:
+                conn = await pool.acquire()
+            except (aiomysql.OperationalError, OSError) as e:
+                self._async_replicas.mark_down(name, e)
+                continue
+            self._async_replicas.mark_up(name)
+            return name, pool, conn
+        return None
+
+    @asynccontextmanager
+    async def async_connection(self, readonly: bool = False) -> AsyncGenerator[Any, None]:
+        """
+        Async pool'dan connection olish va avtomatik qaytarish.
+        Pool hali yaratilmagan bo'lsa, birinchi chaqiruvda yaratiladi.
+        
+        Args:
+            readonly: True bo'lsa ulanish read-replica'dan olinadi
+            
+        Yields:
+            aiomysql.Connection: Database ulanishi
+            
+        Example:
+            async with db_manager.async_connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute("SELECT 1")
+        """
+        import aiomysql
+
+        if self._async_pool is None:
+            await self.init_async_pool()
+
+        acquired = None
+        if readonly and self._async_replicas:
+            acquired = await self._acquire_async_replica()
+        if acquired is None:
+            acquired = (None, self._async_pool, await self._async_pool.acquire())
+        replica_name, pool, conn = acquired
+
+        guard = get_query_guard()
+        try:
+            if guard:
+                guard.attach(functools.partial(self._kill_query, conn.host, conn.port, conn.thread_id()))
+            yield conn
+            await conn.commit()
+        except Exception as e:
+            error_code = e.args[0] if e.args else None
+            if error_code in LOST_CONNECTION_ERRNOS:
+                # Server bilan aloqa uzildi - replica bo'lsa keyingi so'rovlar uni chetlab o'tadi
+                if replica_name is not None:
+                    self._async_replicas.mark_down(replica_name, e)
+                conn.close()
+            elif not isinstance(e, QueryCancelledError):
+                try:
+                    await conn.rollback()
+                except (aiomysql.Error, OSError):
+                    # Rollback ham bajarilmasa ulanish buzilgan - pool'ga qaytmaydi
+                    conn.close()
+            if guard and error_code in QUERY_CANCELLED_ERRNOS:
+                raise QueryCancelledError(guard.endpoint, guard.reason or "deadline exceeded") from e
+            logger.error(f"Async database xatoligi: {e}")
+            raise
+        finally:
+            if guard:
+                guard.detach()
+            pool.release(conn)
+
+    @asynccontextmanager
+    async def async_cursor(
+        self,
+        dictionary: bool = True,
+        readonly: bool = False,
+        decode: Optional[str] = None
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Async cursor olish.
+        
+        Args:
+            dictionary: True bo'lsa natijalar dict ko'rinishida qaytadi
+            readonly: True bo'lsa query read-replica'da bajariladi
+            decode: Dekodlash rejimi (execute_query'dagi kabi); PyMySQL
+                decoders'ni execute paytida o'qiydi
+            
+        Yields:
+            aiomysql.Cursor: Database cursor
+            
+        Example:
+            async with db_manager.async_cursor() as cursor:
+                await cursor.execute("SELECT * FROM admins WHERE username = %s", (username,))
+                admin = await cursor.fetchone()
+        """
+        import aiomysql
+
+        cursor_class = aiomysql.DictCursor if dictionary else aiomysql.Cursor
+        decoders = aiomysql_decoders(decode)
+        async with self.async_connection(readonly=readonly) as conn:
+            default_decoders = conn.decoders
+            if decoders is not None:
+                conn.decoders = decoders
+            try:
+                async with conn.cursor(cursor_class) as cursor:
+                    yield cursor
+            finally:
+                conn.decoders = default_decoders
+
+    async def execute_query_async(
+        self,
+        query: str,
+        params: tuple = None,
+        fetch_one: bool = False,
+        fetch_all: bool = True,
+        readonly: bool = False,
+        decode: Optional[str] = None
+    ) -> Optional[list | dict]:
+        """
+        SQL query'ni event loop'ni bloklamasdan bajarish.
+        
+        Args:
+            query: SQL query (parameterized)
+            params: Query parametrlari. Parametrsiz query'larda None qoldiriladi,
+                chunki PyMySQL bo'sh tuple bilan ham '%' formatlashni bajaradi
+                (DATE_FORMAT(..., '%Y-%m') buziladi)
+            fetch_one: Faqat bitta natija olish
+            fetch_all: Barcha natijalarni olish
+            readonly: True bo'lsa query read-replica'da bajariladi
+            decode: Dekodlash rejimi (execute_query'dagi kabi)
+            
+        Returns:
+            Query natijalari yoki None
+        """
+        guard = get_query_guard()
+        if guard and guard.hint_ms:
+            query = add_max_execution_time_hint(query, guard.hint_ms)
+
+        async with self.async_cursor(readonly=readonly, decode=decode) as cursor:
+            await cursor.execute(query, params or None)
+
+            if fetch_one:
+                return await cursor.fetchone()
+            elif fetch_all:
+                return list(await cursor.fetchall())
+            return None
+
+    async def close_async_pool(self) -> None:
+        """Async pool'ni yopish (ilova to'xtaganda chaqiriladi)."""
+        if self._async_pool is not None:
+            pools = [self._async_pool]
+            if self._async_replicas:
+                pools.extend(self._async_replicas.pools().values())
+                self._async_replicas.clear()
+            for pool in pools:
+                pool.close()
+                await pool.wait_closed()
+            self._async_pool = None
+            logger.info("Async database pool yopildi")
+
     def close_pool(self) -> None:
         """Pool'ni yopish (ilova to'xtaganda chaqiriladi)."""
         if self._pool:
-            # MySQL Connector Python pool'ni to'g'ridan-to'g'ri yopish imkoni yo'q
-            # Lekin barcha connectionlar avtomatik yopiladi
+            self._pool.close()
+            if self._replicas:
+                for pool in self._replicas.pools().values():
+                    pool.close()
+                self._replicas.clear()
             logger.info("Database pool yopildi")
             self._pool = None
-            DatabaseManager._instance = None
+            self._pid = None
 
 
-# Global database manager instance
+# Global database manager instance (ulanish ochmaydi - pool'lar lazy yaratiladi)
 db_manager = DatabaseManager()
 
 
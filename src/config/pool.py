@@ -0,0 +1,557 @@
+"""
+MySQL connection pool.
+Band ulanishlar tugaganda chaqiruvchilarni deadline bilan navbatga qo'yadi,
+kerak bo'lsa max_overflow gacha vaqtinchalik ulanish ochadi va
+in-use/idle/waiting hamda checkout latency statistikasini yig'adi.
+Ulanishlar hayot sikli: sessiya reset rejimi, maksimal yosh, idle timeout
+va faqat uzoq turgan ulanishlar uchun ping-on-borrow.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Optional, Tuple
+
+from mysql.connector import Error as MySQLError
+
+from src.utils.exceptions import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+# always - har qaytarishda COM_RESET_CONNECTION, on_error - faqat xatolik bilan
+# qaytarilgan ulanishlar uchun, never - reset qilinmaydi
+RESET_MODES = ("always", "on_error", "never")
+
+
+class PoolTimeoutError(DatabaseException):
+    """
+    Pool'dan belgilangan vaqt ichida ulanish olinmadi.
+    Barcha ulanishlar band va overflow chegarasiga yetilgan.
+    """
+
+    def __init__(self, pool_name: str, timeout: float) -> None:
+        """PoolTimeoutError yaratish."""
+        super().__init__(
+            message=f"'{pool_name}' pool'idan {timeout:.1f} s ichida ulanish olinmadi",
+            details={"pool": pool_name, "timeout_seconds": timeout},
+        )
+        self.error_code = "DB_POOL_TIMEOUT"
+
+
+class LatencyHistogram:
+    """
+    Kumulyativ latency histogram (Prometheus uslubidagi bucket'lar).
+    Thread-safe emas, chaqiruvchi lock ostida ishlatadi.
+    """
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self) -> None:
+        """Bo'sh histogram yaratish."""
+        self._counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Bitta o'lchovni qo'shish.
+
+        Args:
+            seconds: Davomiylik (soniyalarda)
+        """
+        value_ms = seconds * 1000
+        self._count += 1
+        self._sum_ms += value_ms
+        self._max_ms = max(self._max_ms, value_ms)
+        for index, bound in enumerate(self.BUCKETS_MS):
+            if value_ms <= bound:
+                self._counts[index] += 1
+                return
+        self._counts[-1] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Histogram holatini olish.
+
+        Returns:
+            dict: Kumulyativ bucket'lar, count, sum va max (ms)
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.BUCKETS_MS, self._counts):
+            cumulative += count
+            buckets[f"le_{bound}ms"] = cumulative
+        buckets["le_inf"] = cumulative + self._counts[-1]
+        return {
+            "buckets": buckets,
+            "count": self._count,
+            "sum_ms": round(self._sum_ms, 2),
+            "max_ms": round(self._max_ms, 2),
+        }
+
+
+class StatementCache:
+    """
+    Bitta ulanishga tegishli prepared statement keshi.
+    Kalit - query matni, qiymat - shu query uchun tayyorlangan cursor.
+    Cursor keyingi chaqiruvlarda qayta prepare qilmasdan faqat
+    COM_STMT_EXECUTE (binary protocol) yuboradi.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        StatementCache yaratish.
+
+        Args:
+            max_size: Ulanishda saqlanadigan statement'lar soni (LRU)
+        """
+        self.max_size = max_size
+        self._cursors: OrderedDict[str, Tuple[Any, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    @property
+    def enabled(self) -> bool:
+        """Cursor'lar keshlanadimi (aks holda chaqiruvchi cursor'ni o'zi yopadi)."""
+        return self.max_size > 0
+
+    def get(self, cnx: Any, query: str) -> Tuple[Any, str]:
+        """
+        Query uchun prepared cursor olish yoki yaratish.
+
+        mysql-connector prepared cursor query'ni `is` bilan solishtiradi,
+        shuning uchun execute() ga keshdagi aynan o'sha str obyekti
+        uzatilishi kerak (aks holda har safar qayta prepare qilinadi).
+
+        max_size 0 bo'lsa kesh o'chirilgan: har safar yangi cursor
+        qaytariladi va uni chaqiruvchi o'zi yopadi.
+
+        Args:
+            cnx: Xom mysql-connector ulanishi
+            query: SQL query matni
+
+        Returns:
+            (prepared cursor, execute() ga uzatiladigan query obyekti)
+        """
+        if not self.enabled:
+            self.misses += 1
+            return cnx.cursor(prepared=True), query
+
+        cached = self._cursors.get(query)
+        if cached is not None:
+            self._cursors.move_to_end(query)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        cached = (cnx.cursor(prepared=True), query)
+        self._cursors[query] = cached
+        if len(self._cursors) > self.max_size:
+            _, (evicted, _) = self._cursors.popitem(last=False)
+            try:
+                evicted.close()
+            except Exception as e:
+                logger.debug(f"Prepared statement yopishda xatolik: {e}")
+        return cached
+
+    def clear(self) -> None:
+        """
+        Keshni tozalash (server tomonda statement'lar allaqachon
+        o'chirilgan holatlar uchun - masalan, sessiya reset'dan keyin).
+        """
+        self._cursors.clear()
+
+
+class _PoolEntry:
+    """Pool ichidagi xom ulanish, uning vaqt belgilari va statement keshi."""
+
+    __slots__ = ("cnx", "created_at", "last_used_at", "statements", "dirty")
+
+    def __init__(self, cnx: Any, statement_cache_size: int = 0) -> None:
+        now = time.monotonic()
+        self.cnx = cnx
+        self.created_at = now
+        self.last_used_at = now
+        self.statements = StatementCache(statement_cache_size)
+        # Sessiya holati noma'lum (xatolik, rollback) - on_error rejimida reset qilinadi
+        self.dirty = False
+
+
+class PooledConnection:
+    """
+    Pool'dan olingan ulanish proksisi.
+    Barcha atributlar asl ulanishga uzatiladi, close() esa ulanishni
+    yopmasdan pool'ga qaytaradi.
+    """
+
+    def __init__(self, pool: "ConnectionPool", entry: _PoolEntry) -> None:
+        self._pool = pool
+        self._entry: Optional[_PoolEntry] = entry
+
+    @property
+    def raw_connection(self) -> Any:
+        """Asl mysql-connector ulanishi."""
+        if self._entry is None:
+            raise RuntimeError("Ulanish allaqachon pool'ga qaytarilgan")
+        return self._entry.cnx
+
+    @property
+    def pool_name(self) -> str:
+        """Ulanish olingan pool nomi."""
+        return self._pool.name
+
+    def prepared_cursor(self, query: str) -> Tuple[Any, str]:
+        """
+        Query uchun ulanishning statement keshidagi prepared cursor.
+
+        Args:
+            query: SQL query matni
+
+        Returns:
+            (prepared cursor, execute() ga uzatiladigan query obyekti)
+        """
+        if self._entry is None:
+            raise RuntimeError("Ulanish allaqachon pool'ga qaytarilgan")
+        return self._entry.statements.get(self._entry.cnx, query)
+
+    @property
+    def caches_statements(self) -> bool:
+        """prepared_cursor() qaytargan cursor keshda qoladimi (False - chaqiruvchi yopadi)."""
+        if self._entry is None:
+            raise RuntimeError("Ulanish allaqachon pool'ga qaytarilgan")
+        return self._entry.statements.enabled
+
+    def mark_dirty(self) -> None:
+        """Ulanish xatolik bilan qaytarilmoqda - on_error rejimida sessiya tozalanadi."""
+        if self._entry is not None:
+            self._entry.dirty = True
+
+    def close(self) -> None:
+        """Ulanishni pool'ga qaytarish."""
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            self._pool.release(entry)
+
+    def invalidate(self) -> None:
+        """Buzilgan ulanishni pool'ga qaytarmasdan yopish."""
+        if self._entry is not None:
+            entry, self._entry = self._entry, None
+            self._pool.release(entry, discard=True)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw_connection, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Navbatli MySQL connection pool.
+
+    pool_size ta ulanish doimiy saqlanadi. Hammasi band bo'lsa,
+    max_overflow gacha qo'shimcha ulanish ochiladi (qaytarilganda yopiladi),
+    undan keyin chaqiruvchilar timeout tugaguncha bo'sh ulanishni kutadi.
+
+    max_lifetime dan eski va idle_timeout dan uzoq bo'sh turgan ulanishlar
+    yopiladi (server wait_timeout'idan oldin), ping_after dan uzoq bo'sh
+    turgan ulanish esa berishdan oldin ping qilinadi. Timeout'lar 0 bo'lsa
+    o'chirilgan hisoblanadi.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Any],
+        pool_size: int,
+        max_overflow: int = 0,
+        timeout: float = 10.0,
+        reset_mode: str = "always",
+        statement_cache_size: int = 0,
+        max_lifetime: float = 0.0,
+        idle_timeout: float = 0.0,
+        ping_after: float = 0.0,
+    ) -> None:
+        """
+        ConnectionPool ni ishga tushirish.
+
+        Args:
+            name: Pool nomi (log va metrikalar uchun)
+            connect: Yangi xom ulanish yaratuvchi funksiya
+            pool_size: Doimiy ulanishlar soni
+            max_overflow: Vaqtinchalik qo'shimcha ulanishlar chegarasi
+            timeout: Ulanish kutishning default deadline'i (soniyalarda)
+            reset_mode: Qaytarilgan ulanish sessiyasini tozalash rejimi (RESET_MODES)
+            statement_cache_size: Har bir ulanishdagi prepared statement'lar soni
+            max_lifetime: Ulanishning maksimal yoshi (soniya)
+            idle_timeout: Shundan uzoq bo'sh turgan ulanish yopiladi (soniya)
+            ping_after: Shundan uzoq bo'sh turgan ulanish berishdan oldin ping qilinadi
+        """
+        if reset_mode not in RESET_MODES:
+            raise ValueError(f"Noma'lum reset rejimi: {reset_mode} ({', '.join(RESET_MODES)})")
+
+        self.name = name
+        self._connect = connect
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.reset_mode = reset_mode
+        self.statement_cache_size = statement_cache_size
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: deque[_PoolEntry] = deque()
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._overflow_opened = 0
+        self._checkout_latency = LatencyHistogram()
+        self._resets = 0
+        self._pings = 0
+        self._recycled = {"max_lifetime": 0, "idle_timeout": 0, "ping_failed": 0}
+
+    def prefill(self, count: int = None) -> None:
+        """
+        Pool'ni oldindan ulanishlar bilan to'ldirish.
+
+        Args:
+            count: Ochiladigan ulanishlar soni (default: pool_size)
+        """
+        target = min(count or self.pool_size, self.pool_size)
+        while True:
+            with self._cond:
+                if self._size >= target:
+                    return
+                self._size += 1
+            try:
+                entry = _PoolEntry(self._connect(), self.statement_cache_size)
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def get_connection(self, timeout: float = None) -> PooledConnection:
+        """
+        Pool'dan ulanish olish, kerak bo'lsa navbatda kutish.
+
+        Args:
+            timeout: Kutish deadline'i (default: pool timeout)
+
+        Returns:
+            PooledConnection: Pool ulanishi
+
+        Raises:
+            PoolTimeoutError: Deadline ichida ulanish bo'shamadi
+            MySQLError: Yangi ulanish ochishda xatolik
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        entry: Optional[_PoolEntry] = None
+
+        with self._cond:
+            expired = self._pop_expired_locked(started)
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.pool_size + self.max_overflow:
+                        self._size += 1
+                        if self._size > self.pool_size:
+                            self._overflow_opened += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(self.name, timeout)
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+
+        for stale in expired:
+            self._close_entry(stale)
+
+        if entry is not None and not self._usable(entry):
+            # O'rni band qolgan holda yangi ulanish bilan almashtiriladi
+            self._close_entry(entry)
+            entry = None
+
+        if entry is None:
+            try:
+                entry = _PoolEntry(self._connect(), self.statement_cache_size)
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+
+        entry.last_used_at = time.monotonic()
+        with self._cond:
+            self._checkouts += 1
+            self._checkout_latency.observe(entry.last_used_at - started)
+
+        return PooledConnection(self, entry)
+
+    def release(self, entry: _PoolEntry, discard: bool = False) -> None:
+        """
+        Ulanishni pool'ga qaytarish.
+
+        Args:
+            entry: Pool yozuvi
+            discard: True bo'lsa ulanish yopiladi va pool'ga qaytmaydi
+        """
+        now = time.monotonic()
+        if not discard and self.max_lifetime and now - entry.created_at >= self.max_lifetime:
+            discard = True
+            with self._cond:
+                self._recycled["max_lifetime"] += 1
+
+        reset = self.reset_mode == "always" or (self.reset_mode == "on_error" and entry.dirty)
+        if not discard and reset:
+            try:
+                entry.cnx.reset_session()
+                # COM_RESET_CONNECTION server'dagi prepared statement'larni ham o'chiradi
+                entry.statements.clear()
+                entry.dirty = False
+                with self._cond:
+                    self._resets += 1
+            except MySQLError as e:
+                logger.warning(f"[{self.name}] Sessiyani tozalab bo'lmadi, ulanish yopiladi: {e}")
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._size > self.pool_size:
+                self._size -= 1
+                close_entries = [entry]
+            else:
+                entry.last_used_at = now
+                self._idle.append(entry)
+                close_entries = []
+            close_entries.extend(self._pop_expired_locked(now))
+            self._cond.notify()
+
+        for close_entry in close_entries:
+            self._close_entry(close_entry)
+
+    def _pop_expired_locked(self, now: float) -> list:
+        """
+        Idle timeout yoki maksimal yoshdan o'tgan bo'sh ulanishlarni ajratish.
+        Lock ostida chaqiriladi; ulanishlar chaqiruvchi tomonidan lock'siz yopiladi.
+        LIFO tartibda eng uzoq turganlari deque boshida bo'ladi.
+        """
+        expired = []
+        while self._idle:
+            entry = self._idle[0]
+            if self.idle_timeout and now - entry.last_used_at >= self.idle_timeout:
+                self._recycled["idle_timeout"] += 1
+            elif self.max_lifetime and now - entry.created_at >= self.max_lifetime:
+                self._recycled["max_lifetime"] += 1
+            else:
+                break
+            expired.append(self._idle.popleft())
+            self._size -= 1
+        return expired
+
+    def _usable(self, entry: _PoolEntry) -> bool:
+        """
+        Bo'sh turgan ulanishni berishdan oldin tekshirish.
+        Ping faqat ulanish ping_after dan uzoq ishlatilmagan bo'lsa yuboriladi,
+        shuning uchun tez-tez ishlatilayotgan ulanishlarga qo'shimcha round trip yo'q.
+        """
+        now = time.monotonic()
+        if self.max_lifetime and now - entry.created_at >= self.max_lifetime:
+            reason = "max_lifetime"
+        elif self.idle_timeout and now - entry.last_used_at >= self.idle_timeout:
+            reason = "idle_timeout"
+        elif self.ping_after and now - entry.last_used_at >= self.ping_after:
+            with self._cond:
+                self._pings += 1
+            try:
+                entry.cnx.ping(reconnect=False)
+                return True
+            except Exception as e:
+                logger.info(f"[{self.name}] Ulanish ping'ga javob bermadi, almashtiriladi: {e}")
+                reason = "ping_failed"
+        else:
+            return True
+
+        with self._cond:
+            self._recycled[reason] += 1
+        return False
+
+    def _close_entry(self, entry: _PoolEntry) -> None:
+        """Xom ulanishni xatoliklarsiz yopish."""
+        try:
+            entry.cnx.close()
+        except Exception as e:
+            logger.debug(f"[{self.name}] Ulanishni yopishda xatolik: {e}")
+
+    def close(self) -> None:
+        """Barcha bo'sh ulanishlarni yopish."""
+        with self._cond:
+            entries = list(self._idle)
+            self._idle.clear()
+            self._size -= len(entries)
+        for entry in entries:
+            self._close_entry(entry)
+
+    @property
+    def in_use(self) -> int:
+        """Hozir band bo'lgan ulanishlar soni."""
+        return self._in_use
+
+    def stats(self) -> dict:
+        """
+        Pool holati va metrikalari.
+
+        Returns:
+            dict: Ulanishlar soni, navbat va checkout latency histogram'i
+        """
+        with self._cond:
+            entries = list(self._idle)
+            statement_hits = sum(entry.statements.hits for entry in entries)
+            statement_misses = sum(entry.statements.misses for entry in entries)
+            return {
+                "name": self.name,
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "open": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "overflow_in_use": max(0, self._size - self.pool_size),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "overflow_opened": self._overflow_opened,
+                "checkout_latency": self._checkout_latency.snapshot(),
+                "reset_mode": self.reset_mode,
+                "resets": self._resets,
+                "pings": self._pings,
+                "recycled": dict(self._recycled),
+                "idle_statement_cache": {
+                    "statements": sum(len(entry.statements) for entry in entries),
+                    "hits": statement_hits,
+                    "misses": statement_misses,
+                },
+            }
@@ -0,0 +1,171 @@
+"""
+So'rov (HTTP request) darajasidagi query deadline va bekor qilish.
+QueryGuard contextvar orqali DatabaseManager'ga yetib boradi: SELECT'larga
+MAX_EXECUTION_TIME hint qo'shiladi, ishlayotgan query esa deadline o'tganda
+yoki client uzilganda KILL QUERY bilan to'xtatiladi.
+"""
+
+import contextvars
+import logging
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from src.utils.exceptions import DatabaseException
+
+logger = logging.getLogger(__name__)
+
+# Server query'ni to'xtatganini bildiruvchi xatolik kodlari
+# (ER_QUERY_INTERRUPTED - KILL QUERY, ER_QUERY_TIMEOUT - MAX_EXECUTION_TIME)
+QUERY_CANCELLED_ERRNOS = frozenset({1317, 3024})
+
+# Qatorlar, identifikatorlar va izohlar ichidagi qavs/SELECT hisobga olinmaydi
+_TOKEN_RE = re.compile(
+    r"'(?:[^'\\]|\\.|'')*'"
+    r'|"(?:[^"\\]|\\.)*"'
+    r"|`[^`]*`"
+    r"|--[^\n]*|#[^\n]*|/\*.*?\*/"
+    r"|[()]"
+    r"|\bSELECT\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+class QueryCancelledError(DatabaseException):
+    """Query deadline o'tgani yoki client uzilgani uchun to'xtatildi."""
+
+    def __init__(self, endpoint: str, reason: str) -> None:
+        """QueryCancelledError yaratish."""
+        super().__init__(
+            message=f"Query to'xtatildi ({endpoint}): {reason}",
+            details={"endpoint": endpoint, "reason": reason},
+        )
+        self.error_code = "DB_QUERY_CANCELLED"
+        self.reason = reason
+
+
+class QueryGuard:
+    """
+    Bitta HTTP so'rovning query'lari uchun deadline va bekor qilish holati.
+
+    DatabaseManager query boshlanishida attach() bilan shu ulanishdagi
+    query'ni to'xtatuvchi funksiyani qoldiradi va tugagach detach() qiladi.
+    cancel() va detach() bitta lock ostida ishlaydi, shuning uchun KILL QUERY
+    ulanish pool'ga qaytib boshqa so'rovga berilgandan keyin yuborilmaydi.
+    """
+
+    def __init__(self, endpoint: str, timeout: float) -> None:
+        """
+        QueryGuard ni yaratish.
+
+        Args:
+            endpoint: Endpoint nomi (log va xatoliklar uchun)
+            timeout: Deadline soniyalarda (0 yoki manfiy - deadline yo'q)
+        """
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout > 0 else None
+        self.reason: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._killer: Optional[Callable[[], None]] = None
+
+    @property
+    def hint_ms(self) -> Optional[int]:
+        """
+        MAX_EXECUTION_TIME hint qiymati (ms).
+        Qolgan vaqt emas, endpoint deadline'i ishlatiladi - query matni
+        o'zgarmaydi va prepared statement keshi buzilmaydi.
+        """
+        if self.deadline is None:
+            return None
+        return max(int(self.timeout * 1000), 1)
+
+    def check(self) -> None:
+        """
+        Yangi query boshlash mumkinligini tekshirish.
+
+        Raises:
+            QueryCancelledError: So'rov bekor qilingan yoki deadline o'tgan
+        """
+        if self.reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.reason = "deadline exceeded"
+        if self.reason is not None:
+            raise QueryCancelledError(self.endpoint, self.reason)
+
+    def attach(self, killer: Callable[[], None]) -> None:
+        """
+        Ishlayotgan query'ni to'xtatuvchi funksiyani ro'yxatga olish.
+
+        Raises:
+            QueryCancelledError: So'rov allaqachon bekor qilingan
+        """
+        with self._lock:
+            self.check()
+            self._killer = killer
+
+    def detach(self) -> None:
+        """Query tugadi - to'xtatuvchi funksiyani olib tashlash."""
+        with self._lock:
+            self._killer = None
+
+    def cancel(self, reason: str) -> None:
+        """
+        So'rovni bekor qilish va ishlayotgan query bo'lsa uni to'xtatish.
+        Bloklovchi chaqiruv - event loop'dan executor orqali chaqiriladi.
+
+        Args:
+            reason: Bekor qilish sababi
+        """
+        with self._lock:
+            if self.reason is None:
+                self.reason = reason
+            if self._killer is None:
+                return
+            logger.warning(f"Query to'xtatilmoqda ({self.endpoint}): {reason}")
+            try:
+                self._killer()
+            except Exception as e:
+                logger.error(f"KILL QUERY bajarilmadi ({self.endpoint}): {e}")
+            self._killer = None
+
+
+# Joriy HTTP so'rovning guard'i (executor thread'lariga context bilan ko'chadi)
+current_query_guard: contextvars.ContextVar[Optional[QueryGuard]] = contextvars.ContextVar(
+    "current_query_guard", default=None
+)
+
+
+def get_query_guard() -> Optional[QueryGuard]:
+    """Joriy so'rovning QueryGuard'i (guard'siz chaqiruvlarda None)."""
+    return current_query_guard.get()
+
+
+def add_max_execution_time_hint(query: str, timeout_ms: int) -> str:
+    """
+    Query'ning yuqori darajadagi SELECT'iga MAX_EXECUTION_TIME hint qo'shish.
+    WITH ... SELECT query'larida hint CTE'lardan keyingi asosiy SELECT'ga
+    qo'yiladi, chunki MySQL uni faqat top-level SELECT'da qabul qiladi.
+
+    Args:
+        query: SQL query
+        timeout_ms: Maksimal bajarilish vaqti (ms)
+
+    Returns:
+        Hint qo'shilgan query (SELECT bo'lmasa o'zgarmagan query)
+    """
+    if "MAX_EXECUTION_TIME" in query.upper():
+        return query
+
+    depth = 0
+    for match in _TOKEN_RE.finditer(query):
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token.upper() == "SELECT":
+            position = match.end()
+            return f"{query[:position]} /*+ MAX_EXECUTION_TIME({timeout_ms}) */{query[position:]}"
+    return query
@@ -0,0 +1,157 @@
+"""
+Read-replica'lar orasida yuklamani taqsimlash.
+Sog'lom replica'larni round-robin yoki eng kam band tartibda tanlaydi,
+ulanib bo'lmagan replica'ni ma'lum vaqtga chetlatib turadi.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """
+    Nomlangan replica pool'lari to'plami.
+    Pool turi muhim emas (sync ConnectionPool yoki aiomysql pool) -
+    band ulanishlar sonini `busy` funksiyasi hisoblaydi.
+    """
+
+    STRATEGIES = ("round_robin", "least_busy")
+
+    def __init__(
+        self,
+        strategy: str = "round_robin",
+        retry_after: float = 30.0,
+        busy: Callable[[Any], int] = None,
+    ) -> None:
+        """
+        ReplicaRouter ni ishga tushirish.
+
+        Args:
+            strategy: round_robin yoki least_busy
+            retry_after: Nosoz replica qancha vaqt chetlatiladi (soniyalarda)
+            busy: Pool'dagi band ulanishlar sonini qaytaruvchi funksiya
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"Noma'lum replica strategiyasi: {strategy} "
+                f"({', '.join(self.STRATEGIES)})"
+            )
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self._busy = busy or (lambda pool: 0)
+
+        self._lock = threading.Lock()
+        self._pools: Dict[str, Any] = {}
+        self._down_until: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self._pools)
+
+    def add(self, name: str, pool: Any) -> None:
+        """Replica pool qo'shish."""
+        with self._lock:
+            self._pools[name] = pool
+            self._failures.setdefault(name, 0)
+
+    def pools(self) -> Dict[str, Any]:
+        """Barcha replica pool'lari (nom bo'yicha)."""
+        with self._lock:
+            return dict(self._pools)
+
+    def candidates(self) -> List[Tuple[str, Any]]:
+        """
+        Sog'lom replica'lar, urinish tartibida.
+
+        Returns:
+            list: (nom, pool) juftliklari - birinchisi tanlangan replica,
+                qolganlari u ishlamasa navbatdagi variantlar
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                (name, pool) for name, pool in self._pools.items()
+                if self._down_until.get(name, 0.0) <= now
+            ]
+            if not healthy:
+                return []
+
+            if self.strategy == "least_busy":
+                return sorted(healthy, key=lambda item: self._busy(item[1]))
+
+            offset = next(self._counter) % len(healthy)
+            return healthy[offset:] + healthy[:offset]
+
+    def mark_down(self, name: str, error: Exception) -> None:
+        """Replica'ni retry_after soniyaga chetlatish."""
+        with self._lock:
+            if name not in self._pools:
+                return
+            self._down_until[name] = time.monotonic() + self.retry_after
+            self._failures[name] += 1
+        logger.warning(
+            f"Replica {name} nosoz deb belgilandi ({self.retry_after:.0f} s): {error}"
+        )
+
+    def mark_up(self, name: str) -> None:
+        """Replica'dan muvaffaqiyatli ulanish olinganda chetlatishni bekor qilish."""
+        with self._lock:
+            if self._down_until.pop(name, None) is not None:
+                logger.info(f"Replica {name} qayta ishlayapti")
+
+    def is_healthy(self, name: str) -> bool:
+        """Replica hozir tanlanishi mumkinmi."""
+        with self._lock:
+            return self._down_until.get(name, 0.0) <= time.monotonic()
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Replica'lar holati.
+
+        Returns:
+            dict: Har bir replica uchun healthy, failures, retry_in_seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "healthy": self._down_until.get(name, 0.0) <= now,
+                    "failures": self._failures.get(name, 0),
+                    "retry_in_seconds": round(max(self._down_until.get(name, 0.0) - now, 0.0), 1),
+                }
+                for name in self._pools
+            }
+
+    def clear(self) -> None:
+        """Barcha replica'larni olib tashlash."""
+        with self._lock:
+            self._pools.clear()
+            self._down_until.clear()
+            self._failures.clear()
+
+
+def parse_replica_hosts(value: str, default_port: int) -> List[Tuple[str, int]]:
+    """
+    "host1:3307,host2" ko'rinishidagi ro'yxatni (host, port) juftliklariga aylantirish.
+
+    Args:
+        value: Vergul bilan ajratilgan host[:port] ro'yxati
+        default_port: Port ko'rsatilmagan host uchun port
+
+    Returns:
+        list: (host, port) juftliklari
+    """
+    replicas: List[Tuple[str, int]] = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(":") if ":" in item else (item, "", "")
+        replicas.append((host, int(port) if port else default_port))
+    return replicas
@@ -4,6 +4,7 @@ Ilova konfiguratsiyasi.
 """
 
 from functools import lru_cache
+from typing import Dict
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -23,6 +24,93 @@ class Settings(BaseSettings):
     db_password: str = Field(default="", alias="DB_PASSWORD")
     db_name: str = Field(default="northwind", alias="DB_NAME")
     db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
+    db_pool_max_overflow: int = Field(default=0, alias="DB_POOL_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=10.0, alias="DB_POOL_TIMEOUT")  # soniya
+    # Worker ishga tushganda (lifespan) pool'ni pool_size ta ulanish bilan to'ldirish
+    db_pool_prewarm: bool = Field(default=True, alias="DB_POOL_PREWARM")
+    # False bo'lsa mysql-connector C extension ishlatiladi
+    db_use_pure: bool = Field(default=True, alias="DB_USE_PURE")
+    # SELECT query'lar har bir ulanishda keshlangan prepared statement orqali bajariladi
+    db_prepared_statements: bool = Field(default=False, alias="DB_PREPARED_STATEMENTS")
+    # Ulanishdagi keshlangan statement'lar soni (0 - har query yangi prepare qilinadi)
+    db_statement_cache_size: int = Field(default=64, alias="DB_STATEMENT_CACHE_SIZE")
+    # Ulanish hayot sikli: always | on_error | never (sessiyani qaytarishda tozalash),
+    # maksimal yosh, idle timeout (server wait_timeout'idan kichik bo'lsin) va
+    # shundan uzoq bo'sh turgan ulanishni berishdan oldin ping qilish (soniya, 0 - o'chirilgan)
+    db_session_reset: str = Field(default="on_error", alias="DB_SESSION_RESET")
+    db_pool_max_lifetime: float = Field(default=3600.0, alias="DB_POOL_MAX_LIFETIME")
+    db_pool_idle_timeout: float = Field(default=600.0, alias="DB_POOL_IDLE_TIMEOUT")
+    db_pool_ping_after: float = Field(default=30.0, alias="DB_POOL_PING_AFTER")
+    # sync - mysql-connector (bloklovchi), async - aiomysql pool orqali await qilinadi,
+    # executor - mysql-connector chaqiruvlari DB_POOL_SIZE hajmli thread pool'da bajariladi
+    db_runtime_mode: str = Field(default="executor", alias="DB_RUNTIME_MODE")
+    # Analitika o'qishlari uchun read-replica'lar: "host1:3307,host2:3306" (bo'sh - faqat primary)
+    db_replica_hosts: str = Field(default="", alias="DB_REPLICA_HOSTS")
+    db_replica_strategy: str = Field(default="round_robin", alias="DB_REPLICA_STRATEGY")  # round_robin | least_busy
+    db_replica_retry_seconds: float = Field(default=30.0, alias="DB_REPLICA_RETRY_SECONDS")
+    # Analitika endpoint'lari uchun query deadline (soniya, 0 - cheksiz) va
+    # endpoint bo'yicha JSON override: {"products/market-basket": 10}
+    db_query_deadline_seconds: float = Field(default=15.0, alias="DB_QUERY_DEADLINE_SECONDS")
+    db_query_deadlines: Dict[str, float] = Field(default_factory=dict, alias="DB_QUERY_DEADLINES")
+    # Analitika natijalarini cursor'da dekodlash: native | json (DECIMAL -> float,
+    # sana -> ISO satr) | scaled (DECIMAL -> int, qiymat * 10**DB_DECIMAL_SCALE)
+    db_result_decode: str = Field(default="json", alias="DB_RESULT_DECODE")
+    db_decimal_scale: int = Field(default=2, alias="DB_DECIMAL_SCALE")
+
+    # ==================== Analytics Cache ====================
+    # Analitika natijalari keshi: default TTL (soniya), metod bo'yicha JSON override
+    # {"get_business_kpi_dashboard": 60} va LRU chegaralari (yozuvlar soni, baytlar)
+    analytics_cache_enabled: bool = Field(default=True, alias="ANALYTICS_CACHE_ENABLED")
+    analytics_cache_ttl_seconds: float = Field(default=300.0, alias="ANALYTICS_CACHE_TTL_SECONDS")
+    analytics_cache_ttls: Dict[str, float] = Field(default_factory=dict, alias="ANALYTICS_CACHE_TTLS")
+    # Stale-while-revalidate: TTL'dan keyin eskirgan natija darhol qaytariladigan va
+    # fonda yangilanadigan muddat, metod bo'yicha JSON override {"get_rfm_analysis": 7200}
+    analytics_cache_stale_ttls: Dict[str, float] = Field(default_factory=dict, alias="ANALYTICS_CACHE_STALE_TTLS")
+    analytics_cache_max_entries: int = Field(default=512, alias="ANALYTICS_CACHE_MAX_ENTRIES")
+    analytics_cache_max_bytes: int = Field(default=64 * 1024 * 1024, alias="ANALYTICS_CACHE_MAX_BYTES")
+    # Kesh backend'i: memory (har bir worker'da alohida) yoki sqlite (bitta server'dagi
+    # barcha worker'lar uchun ANALYTICS_CACHE_DIR ichidagi umumiy fayl)
+    analytics_cache_backend: str = Field(default="memory", alias="ANALYTICS_CACHE_BACKEND")
+    analytics_cache_dir: str = Field(default="", alias="ANALYTICS_CACHE_DIR")
+    # Bir xil parallel analitika so'rovlari bitta query'ga birlashtiriladi
+    analytics_single_flight: bool = Field(default=True, alias="ANALYTICS_SINGLE_FLIGHT")
+    # Data-version watermark: jadvallar belgisini tekshirish intervali (soniya, 0 - o'chirilgan).
+    # Versiya kesh kalitiga qo'shiladi, shuning uchun versiya ma'lum bo'lganda yozuvlar
+    # uzoq TTL bilan saqlanadi (joyida UPDATE qilingan qatorlar uchun himoya)
+    data_version_poll_seconds: float = Field(default=10.0, alias="DATA_VERSION_POLL_SECONDS")
+    analytics_cache_versioned_ttl_seconds: float = Field(
+        default=21600.0, alias="ANALYTICS_CACHE_VERSIONED_TTL_SECONDS"
+    )
+    # /api/v1/analytics/* javoblari uchun ETag (If-None-Match -> 304) va Cache-Control
+    analytics_etag_enabled: bool = Field(default=True, alias="ANALYTICS_ETAG_ENABLED")
+    analytics_cache_control: str = Field(default="private, no-cache", alias="ANALYTICS_CACHE_CONTROL")
+    # Tayyor javob baytlari keshi (routing, Pydantic va JSON encode'siz javob) va uning
+    # gzip varianti (shu hajmdan katta javoblar uchun)
+    analytics_response_cache_enabled: bool = Field(default=True, alias="ANALYTICS_RESPONSE_CACHE_ENABLED")
+    analytics_response_gzip: bool = Field(default=True, alias="ANALYTICS_RESPONSE_GZIP")
+    analytics_response_gzip_min_bytes: int = Field(default=1024, alias="ANALYTICS_RESPONSE_GZIP_MIN_BYTES")
+    # Startup'da barcha analitika query'larini default parametrlar bilan keshga oldindan
+    # hisoblash (fonda, DB_POOL_SIZE dan oshmaydigan parallellik bilan); /health ready=False
+    # isitish tugaguncha
+    analytics_warmup_enabled: bool = Field(default=False, alias="ANALYTICS_WARMUP_ENABLED")
+    analytics_warmup_concurrency: int = Field(default=2, alias="ANALYTICS_WARMUP_CONCURRENCY")
+    # Agregat analitika query'lari OrderDetail o'rniga kunlik DailySalesFact va oylik
+    # MonthlySalesRollup jadvallaridan o'qiydi (SQLScripts/04, 06); ikkalasi lifespan'da shu
+    # interval bilan tekshirilib, manba jadvallar o'zgarganda yangilanadi (soniya, 0 - faqat
+    # startup'da bir marta). Har bir yangilash faktdagi oxirgi WINDOW_DAYS kunni (va yangi
+    # buyurtmalar davrini) oy boshidan qayta yozadi - kechikkan buyurtma va qatorlar shu oynada
+    analytics_use_sales_fact: bool = Field(default=False, alias="ANALYTICS_USE_SALES_FACT")
+    sales_fact_refresh_seconds: float = Field(default=60.0, alias="SALES_FACT_REFRESH_SECONDS")
+    sales_fact_window_days: int = Field(default=31, alias="SALES_FACT_WINDOW_DAYS")
+    # Xodimlar ierarxiyasi WITH RECURSIVE o'rniga EmployeeClosure jadvalidan o'qiladi
+    # (SQLScripts/07_employee_closure.sql); Employee imzosi shu interval bilan tekshirilib,
+    # o'zgarganda closure qayta quriladi (soniya, 0 - faqat startup'da bir marta)
+    analytics_use_employee_closure: bool = Field(default=False, alias="ANALYTICS_USE_EMPLOYEE_CLOSURE")
+    employee_closure_refresh_seconds: float = Field(default=60.0, alias="EMPLOYEE_CLOSURE_REFRESH_SECONDS")
+    # OrderDetail summalari saqlanadigan lineRevenue/lineGross/lineDiscount ustunlaridan o'qiladi
+    # (SQLScripts/05_orderdetail_line_amounts.sql qo'llangandan keyin yoqiladi); o'chirilgan
+    # bo'lsa query'lar summalarni unitPrice * quantity ifodalaridan hisoblaydi
+    analytics_use_line_amounts: bool = Field(default=False, alias="ANALYTICS_USE_LINE_AMOUNTS")
 
     # ==================== JWT Configuration ====================
     jwt_secret_key: str = Field(
@@ -44,6 +132,9 @@ class Settings(BaseSettings):
     # ==================== Application ====================
     debug: bool = Field(default=False, alias="DEBUG")
     environment: str = Field(default="development", alias="ENVIRONMENT")
+    # Import va lifespan startup uchun vaqt byudjeti (soniya) - oshsa ogohlantirish log qilinadi
+    startup_import_budget_seconds: float = Field(default=2.0, alias="STARTUP_IMPORT_BUDGET_SECONDS")
+    startup_budget_seconds: float = Field(default=5.0, alias="STARTUP_BUDGET_SECONDS")
 
     class Config:
         """Pydantic konfiguratsiyasi."""
@@ -57,6 +148,16 @@ class Settings(BaseSettings):
         """MySQL database URL yasash."""
         return f"mysql+pymysql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def use_async_db(self) -> bool:
+        """Analitika so'rovlari aiomysql orqali async bajariladimi."""
+        return self.db_runtime_mode.lower() == "async"
+
+    @property
+    def use_db_executor(self) -> bool:
+        """Sinxron DB chaqiruvlari event loop'dan tashqarida bajariladimi."""
+        return self.db_runtime_mode.lower() != "sync"
+
     @property
     def is_production(self) -> bool:
         """Prodakshn muhitida ekanligini tekshirish."""
@@ -1,18 +1,37 @@
 """
 Gastro-Savdo-Insights FastAPI Application.
 Restoran va savdo analitikasi tizimi uchun backend.
+
+Ilova create_app() factory orqali yaratiladi. Import paytida database'ga
+ulanilmaydi - pool har bir worker process'ning lifespan'ida ochiladi:
+    uvicorn src.main:app
+    uvicorn --factory src.main:create_app --workers 4
 """
 
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from typing import Annotated
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from src.config import settings
+from src.cache import analytics_cache, async_query_flights, cache_refresher, query_flights
+from src.config import settings, get_db
+from src.middleware import AnalyticsCacheMiddleware, QueryDeadlineMiddleware
+from src.models import AdminResponse
 from src.routers import auth_router
-from src.routers.analytics import router as analytics_router
+from src.routers.auth import require_auth
+from src.routers.analytics import CACHE_EXCLUDED_ENDPOINTS, QUERY_DEADLINES, router as analytics_router
+from src.services.executor_service import db_executor
+from src.services.hierarchy_service import employee_closure_refresher
+from src.services.sales_fact_service import sales_fact_refresher
+from src.services.warmup_service import cache_warmer
 from src.utils.exceptions import GastroSavdoException
 
 # Logging sozlash
@@ -25,39 +44,15 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """
-    Ilova lifecycle boshqaruvi.
-    Startup va shutdown eventlarini boshqaradi.
-    """
-    # Startup
-    logger.info("=" * 50)
-    logger.info("Gastro-Savdo-Insights backend ishga tushmoqda...")
-    logger.info(f"Muhit: {settings.environment}")
-    logger.info(f"Debug: {settings.debug}")
-    logger.info(f"Database: {settings.db_host}:{settings.db_port}/{settings.db_name}")
-    logger.info("=" * 50)
-    
-    yield
-    
-    # Shutdown
-    logger.info("Gastro-Savdo-Insights backend to'xtatilmoqda...")
-    logger.info("Xayr!")
-
-
-# FastAPI ilovasi
-app = FastAPI(
-    title="Gastro-Savdo-Insights API",
-    description="""
+API_DESCRIPTION = """
     ## Restoran va Savdo Analitikasi Tizimi
-    
+
     Bu API quyidagi funksiyalarni taqdim etadi:
-    
+
     * **Autentifikatsiya**: JWT + 2FA (Telegram OTP)
     * **Admin boshqaruvi**: Admin CRUD operatsiyalari
     * **Analitika**: 20 ta murakkab SQL savol asosida keng qamrovli analitika
-    
+
     ### Analitika Modullari
     - **Mahsulot Analitikasi**: Top daromad, ABC tahlil, Market Basket
     - **Xodim Analitikasi**: Oylik sotuv, Ierarxiya
@@ -67,128 +62,301 @@ app = FastAPI(
     - **Yetkazib Berish**: Kompaniya samaradorligi
     - **Sotuv Analitikasi**: YoY o'sish, Haftalik pattern, Territoriya tahlili
     - **Business KPI Dashboard**: Kompleks biznes ko'rsatkichlar
-    
+
     ### Xavfsizlik
     - JWT access token (15 daqiqa)
     - JWT refresh token (7 kun)
     - Bcrypt parol hashing
     - Telegram 2FA (ixtiyoriy)
     - SQL Injection himoya
-    """,
-    version="1.0.0",
-    docs_url="/docs" if settings.debug else None,
-    redoc_url="/redoc" if settings.debug else None,
-    openapi_url="/openapi.json" if settings.debug else None,
-    lifespan=lifespan,
-)
+    """
 
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        settings.main_url,
-        "https://gastro-analytics.uz",
-        "https://www.gastro-analytics.uz",
-        "http://localhost:3000",
-        "http://localhost:5173",
-        "http://localhost:5174",
-        "http://localhost:5175",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:5174",
-        "http://127.0.0.1:5175",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ilova lifecycle boshqaruvi.
+    Startup va shutdown eventlarini boshqaradi. Lifespan har bir worker
+    process'da alohida ishlaydi, shuning uchun DB pool'lar shu yerda ochiladi.
+    """
+    # Startup
+    startup_started = time.perf_counter()
+    logger.info("=" * 50)
+    logger.info("Gastro-Savdo-Insights backend ishga tushmoqda...")
+    logger.info(f"Muhit: {settings.environment}")
+    logger.info(f"Debug: {settings.debug}")
+    logger.info(f"Database: {settings.db_host}:{settings.db_port}/{settings.db_name}")
+    logger.info(f"DB runtime rejimi: {settings.db_runtime_mode}")
+    logger.info("=" * 50)
 
+    db = get_db()
+    await asyncio.to_thread(db.initialize, settings.db_pool_prewarm)
+    if settings.use_async_db:
+        await db.init_async_pool(prewarm=settings.db_pool_prewarm)
 
-# Routerlarni qo'shish
-app.include_router(auth_router, prefix="/api/v1")
-app.include_router(analytics_router)  # Analytics router already has /api/v1/analytics prefix
+    # Jadvallar o'zgarishini kuzatish - versiya analitika kesh kalitlariga qo'shiladi
+    data_version_task = None
+    if settings.data_version_poll_seconds > 0:
+        data_version_task = asyncio.create_task(
+            db.watch_data_version(settings.data_version_poll_seconds)
+        )
 
+    # Kunlik sotuv faktiga yangi buyurtmalarni qo'shib turish
+    sales_fact_task = None
+    if sales_fact_refresher.status != "disabled":
+        sales_fact_task = asyncio.create_task(
+            sales_fact_refresher.watch(db, settings.sales_fact_refresh_seconds)
+        )
 
-# Global exception handler
-@app.exception_handler(GastroSavdoException)
-async def gastro_savdo_exception_handler(
-    request: Request,
-    exc: GastroSavdoException
-) -> JSONResponse:
-    """
-    Gastro-Savdo-Insights custom exceptionlarni handle qilish.
-    """
-    logger.error(f"GastroSavdoException: {exc.message}")
-    return JSONResponse(
-        status_code=400,
-        content=exc.to_dict()
-    )
+    # Employee o'zgarganda ierarxiya closure'ini qayta qurish
+    employee_closure_task = None
+    if employee_closure_refresher.status != "disabled":
+        employee_closure_task = asyncio.create_task(
+            employee_closure_refresher.watch(db, settings.employee_closure_refresh_seconds)
+        )
 
+    # Analitika keshini fonda isitish - worker darhol so'rov qabul qiladi, /health ready=False
+    warmup_task = None
+    if cache_warmer.status == "pending":
+        warmup_task = asyncio.create_task(cache_warmer.run(db))
 
-@app.exception_handler(Exception)
-async def general_exception_handler(
-    request: Request,
-    exc: Exception
-) -> JSONResponse:
-    """
-    Umumiy exceptionlarni handle qilish.
-    """
-    logger.error(f"Kutilmagan xatolik: {exc}")
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "INTERNAL_SERVER_ERROR",
-            "message": "Ichki server xatosi" if not settings.debug else str(exc),
-        }
+    app.state.startup = _startup_report(
+        import_seconds=app.state.import_seconds,
+        startup_seconds=time.perf_counter() - startup_started,
     )
 
+    yield
 
-# Root endpoint
-@app.get("/", tags=["Root"])
-async def root() -> dict:
+    # Shutdown
+    logger.info("Gastro-Savdo-Insights backend to'xtatilmoqda...")
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if data_version_task is not None:
+        data_version_task.cancel()
+    if sales_fact_task is not None:
+        sales_fact_task.cancel()
+    if employee_closure_task is not None:
+        employee_closure_task.cancel()
+    if settings.use_async_db:
+        await db.close_async_pool()
+    cache_refresher.shutdown()
+    db_executor.shutdown()
+    db.close_pool()
+    logger.info("Xayr!")
+
+
+def _startup_report(import_seconds: float, startup_seconds: float) -> dict:
     """
-    API root endpoint.
-    Ilova holati va versiyasini qaytaradi.
+    Import va startup vaqtlarini byudjet bilan solishtirish.
+
+    Args:
+        import_seconds: src.main modulini import qilish vaqti
+        startup_seconds: Lifespan startup (pool yaratish, prewarm) vaqti
+
+    Returns:
+        dict: Vaqtlar, byudjetlar va byudjet ichida ekanligi
     """
-    return {
-        "app": "Gastro-Savdo-Insights",
-        "version": "1.0.0",
-        "status": "running",
-        "docs": "/docs" if settings.debug else "disabled",
+    report = {
+        "import_seconds": round(import_seconds, 3),
+        "import_budget_seconds": settings.startup_import_budget_seconds,
+        "startup_seconds": round(startup_seconds, 3),
+        "startup_budget_seconds": settings.startup_budget_seconds,
+        "prewarm": settings.db_pool_prewarm,
     }
+    report["within_budget"] = (
+        import_seconds <= settings.startup_import_budget_seconds
+        and startup_seconds <= settings.startup_budget_seconds
+    )
+
+    logger.info(
+        f"Import: {import_seconds:.3f} s, startup: {startup_seconds:.3f} s "
+        f"(prewarm={settings.db_pool_prewarm})"
+    )
+    if not report["within_budget"]:
+        logger.warning(
+            f"Startup vaqt byudjetidan oshdi: import {import_seconds:.3f}/"
+            f"{settings.startup_import_budget_seconds} s, startup {startup_seconds:.3f}/"
+            f"{settings.startup_budget_seconds} s"
+        )
+    return report
 
 
-# Health check endpoint
-@app.get("/health", tags=["Health"])
-async def health_check() -> dict:
+def _check_database() -> str:
     """
-    Health check endpoint.
-    Ilova va database holatini tekshiradi.
+    Database'ga SELECT 1 yuborish (bloklovchi - event loop'dan tashqarida chaqiriladi).
+
+    Returns:
+        str: healthy yoki unhealthy
     """
-    from src.config import get_db
-    
-    db_status = "unknown"
     try:
-        db = get_db()
-        with db.cursor() as cursor:
+        with get_db().cursor() as cursor:
             cursor.execute("SELECT 1")
             cursor.fetchone()  # Natijani o'qib tashlash
-            db_status = "healthy"
+        return "healthy"
     except Exception as e:
-        db_status = f"unhealthy: {e}"
         logger.error(f"Database health check xatosi: {e}")
-    
-    return {
-        "status": "healthy",
-        "database": db_status,
-        "environment": settings.environment,
-    }
+        return "unhealthy"
+
+
+def create_app() -> FastAPI:
+    """
+    FastAPI ilovasini yaratish.
+    Middleware, routerlar, exception handlerlar va umumiy endpointlar shu
+    yerda ulanadi; database'ga murojaat faqat lifespan'da boshlanadi.
+
+    Returns:
+        FastAPI: Sozlangan ilova
+    """
+    app = FastAPI(
+        title="Gastro-Savdo-Insights API",
+        description=API_DESCRIPTION,
+        version="1.0.0",
+        docs_url="/docs" if settings.debug else None,
+        redoc_url="/redoc" if settings.debug else None,
+        openapi_url="/openapi.json" if settings.debug else None,
+        lifespan=lifespan,
+    )
+    app.state.import_seconds = IMPORT_SECONDS
+    app.state.startup = None
+
+    # Analitika query'lari uchun deadline va client uzilganda KILL QUERY
+    app.add_middleware(
+        QueryDeadlineMiddleware,
+        prefix=analytics_router.prefix,
+        deadlines=QUERY_DEADLINES,
+    )
+
+    # Analitika javoblariga X-Cache/X-Data-Age, ETag va Cache-Control sarlavhalari
+    app.add_middleware(
+        AnalyticsCacheMiddleware,
+        prefix=analytics_router.prefix,
+        exclude=CACHE_EXCLUDED_ENDPOINTS,
+    )
+
+    # CORS middleware - oxirgi qo'shiladi, ya'ni eng tashqi qatlam: keshdan (HIT, 304)
+    # qaytgan javoblar ham CORS sarlavhalari bilan chiqadi
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            settings.main_url,
+            "https://gastro-analytics.uz",
+            "https://www.gastro-analytics.uz",
+            "http://localhost:3000",
+            "http://localhost:5173",
+            "http://localhost:5174",
+            "http://localhost:5175",
+            "http://127.0.0.1:3000",
+            "http://127.0.0.1:5173",
+            "http://127.0.0.1:5174",
+            "http://127.0.0.1:5175",
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Routerlarni qo'shish
+    app.include_router(auth_router, prefix="/api/v1")
+    app.include_router(analytics_router)  # Analytics router already has /api/v1/analytics prefix
+
+    # Global exception handler
+    @app.exception_handler(GastroSavdoException)
+    async def gastro_savdo_exception_handler(
+        request: Request,
+        exc: GastroSavdoException
+    ) -> JSONResponse:
+        """
+        Gastro-Savdo-Insights custom exceptionlarni handle qilish.
+        """
+        logger.error(f"GastroSavdoException: {exc.message}")
+        return JSONResponse(
+            status_code=400,
+            content=exc.to_dict()
+        )
+
+    @app.exception_handler(Exception)
+    async def general_exception_handler(
+        request: Request,
+        exc: Exception
+    ) -> JSONResponse:
+        """
+        Umumiy exceptionlarni handle qilish.
+        """
+        logger.error(f"Kutilmagan xatolik: {exc}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "error": "INTERNAL_SERVER_ERROR",
+                "message": "Ichki server xatosi" if not settings.debug else str(exc),
+            }
+        )
+
+    # Root endpoint
+    @app.get("/", tags=["Root"])
+    async def root() -> dict:
+        """
+        API root endpoint.
+        Ilova holati va versiyasini qaytaradi.
+        """
+        return {
+            "app": "Gastro-Savdo-Insights",
+            "version": "1.0.0",
+            "status": "running",
+            "docs": "/docs" if settings.debug else "disabled",
+        }
+
+    # Health check endpoint
+    @app.get("/health", tags=["Health"])
+    async def health_check() -> dict:
+        """
+        Health check endpoint (autentifikatsiyasiz).
+        Ilova va database holatini tekshiradi. ready - analitika keshini
+        isitish tugagan (yoki o'chirilgan). Ichki metrikalar /health/details da.
+        """
+        return {
+            "status": "healthy",
+            "ready": cache_warmer.ready,
+            "database": await asyncio.to_thread(_check_database),
+            "environment": settings.environment,
+        }
+
+    # Batafsil holat - faqat admin sessiyasi bilan
+    @app.get("/health/details", tags=["Health"])
+    async def health_details(
+        request: Request,
+        current_admin: Annotated[AdminResponse, Depends(require_auth)],
+    ) -> dict:
+        """
+        Batafsil holat: pool, executor, kesh, data versiyasi, fakt jadvallari va startup metrikalari.
+        """
+        return {
+            **await health_check(),
+            "db_pool": get_db().pool_stats(),
+            "db_executor": db_executor.stats(),
+            "analytics_cache": analytics_cache.stats(),
+            "data_version": get_db().data_version_stats(),
+            "single_flight": (async_query_flights if settings.use_async_db else query_flights).stats(),
+            "cache_refresh": cache_refresher.stats(),
+            "warmup": cache_warmer.stats(),
+            "sales_fact": sales_fact_refresher.stats(),
+            "employee_closure": employee_closure_refresher.stats(),
+            "startup": request.app.state.startup,
+            "environment": settings.environment,
+        }
+
+    return app
+
+
+# src.main modulining import vaqti (FastAPI, routerlar, servislar)
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
+# uvicorn src.main:app uchun
+app = create_app()
 
 
 if __name__ == "__main__":
     import uvicorn
-    
+
     uvicorn.run(
         "src.main:app",
         host="0.0.0.0",
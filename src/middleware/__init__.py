@@ -0,0 +1,8 @@
+"""
+ASGI middleware'lar moduli.
+"""
+
+from .analytics_cache import AnalyticsCacheMiddleware
+from .query_deadline import QueryDeadlineMiddleware
+
+__all__ = ["AnalyticsCacheMiddleware", "QueryDeadlineMiddleware"]
@@ -0,0 +1,261 @@
+"""
+Analitika javoblari uchun HTTP kesh middleware'i.
+
+Har bir so'rov uchun CacheTrace yaratadi; repository keshlangan chaqiruvlarni
+unga yozadi va javob boshlanishida quyidagilar qo'shiladi:
+    X-Cache: HIT | STALE | MISS
+    X-Data-Age: ma'lumotlar yoshi (soniya)
+
+Data versiyasi ma'lum bo'lsa GET javoblari kuchli ETag (data versiyasi,
+yo'l va parametrlardan) va Cache-Control bilan qaytadi. If-None-Match mos
+kelsa endpoint chaqirilmaydi - query ham, JSON serializatsiya ham yo'q,
+darhol 304 Not Modified qaytadi.
+
+Javob keshi: muvaffaqiyatli GET javobining tayyor JSON baytlari (va
+ANALYTICS_RESPONSE_GZIP bo'lsa gzip varianti) analitika keshida yo'l,
+parametrlar, data versiyasi va kodlash bo'yicha saqlanadi. Keyingi
+so'rovda routing, Pydantic validatsiya va JSON encode bo'lmaydi - kesh
+lookup va socket'ga yozish. Javob ishlatilgan natijalarning eng qisqa
+qolgan TTL'idan uzoq keshlanmaydi; eskirgan (STALE) natija keshlanmaydi.
+
+Har bir 200/304 javobning kesh holati endpoint bo'yicha cache_stats'ga yoziladi.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import time
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.cache import analytics_cache, cache_stats
+from src.cache.trace import CacheTrace, current_cache_trace
+from src.config import get_db, settings
+
+
+class AnalyticsCacheMiddleware:
+    """
+    Pure ASGI middleware - endpoint shu context'da ishlaydi, shuning uchun
+    CacheTrace contextvar orqali repository'gacha (executor thread'larigacha ham) yetadi.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str, exclude: Iterable[str] = ()) -> None:
+        """
+        AnalyticsCacheMiddleware ni ishga tushirish.
+
+        Args:
+            app: Keyingi ASGI ilova
+            prefix: Kuzatiladigan yo'l prefiksi (masalan, /api/v1/analytics)
+            exclude: ETag berilmaydigan endpoint'lar (prefiksdan keyingi yo'l, masalan "health")
+        """
+        self.app = app
+        self.prefix = prefix.rstrip("/")
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope["path"][len(self.prefix):].strip("/")
+        tracked = endpoint not in self.exclude
+
+        etag = self.etag_for(scope)
+        if etag is not None and self._matches(scope, etag):
+            cache_stats.record_endpoint(endpoint, "NOT_MODIFIED")
+            await self._send_not_modified(send, etag)
+            return
+
+        response_key = self.response_key(scope)
+        if response_key is not None:
+            encoding = "gzip" if self._accepts_gzip(scope) else "identity"
+            if await self._send_cached(send, response_key, encoding, etag):
+                cache_stats.record_endpoint(endpoint, "RESPONSE")
+                return
+
+        trace = CacheTrace()
+        token = current_cache_trace.set(trace)
+        captured = {"status": None, "headers": None, "body": []}
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = message.get("headers", [])
+                if tracked and message["status"] == 200:
+                    cache_stats.record_endpoint(endpoint, trace.status or "BYPASS")
+                headers = [*message.get("headers", []), *trace.headers()]
+                if etag is not None and message["status"] == 200:
+                    headers.extend(self._validator_headers(etag))
+                if response_key is not None and settings.analytics_response_gzip:
+                    headers.append((b"vary", b"accept-encoding"))
+                message["headers"] = headers
+            elif message["type"] == "http.response.body" and response_key is not None:
+                captured["body"].append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    # Javob avval client'ga yuboriladi, keyin keshga yoziladi
+                    await send(message)
+                    await self._store_response(response_key, trace, captured)
+                    return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_cache_trace.reset(token)
+
+    def etag_for(self, scope: Scope) -> Optional[str]:
+        """
+        So'rov uchun kuchli ETag.
+
+        ETag data versiyasi, dekodlash rejimi, yo'l va tartiblangan query
+        parametrlaridan hisoblanadi. Joyida UPDATE qilingan qatorlar
+        versiyani o'zgartirmaydi, shuning uchun ETag'ga
+        ANALYTICS_CACHE_VERSIONED_TTL_SECONDS davri ham qo'shiladi -
+        kesh yozuvlari kabi ETag ham shu muddatdan uzoq yashamaydi.
+
+        Returns:
+            '"..."' ko'rinishidagi ETag yoki None (ETag o'chirilgan, GET emas,
+            endpoint istisno qilingan yoki data versiyasi hali noma'lum)
+        """
+        if not settings.analytics_etag_enabled or scope["method"] not in ("GET", "HEAD"):
+            return None
+        endpoint = scope["path"][len(self.prefix):].strip("/")
+        if endpoint in self.exclude:
+            return None
+        version = get_db().data_version
+        if version is None:
+            return None
+
+        query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        period = int(time.time() // max(settings.analytics_cache_versioned_ttl_seconds, 1))
+        source = f"{version}|{settings.db_result_decode}|{period}|{endpoint}|{query}"
+        return '"' + hashlib.sha1(source.encode("utf-8")).hexdigest()[:20] + '"'
+
+    def response_key(self, scope: Scope) -> Optional[str]:
+        """
+        Tayyor javob baytlari uchun kesh kaliti (kodlashsiz).
+
+        Returns:
+            Kalit yoki None (javob keshi o'chirilgan, GET emas yoki endpoint istisno qilingan)
+        """
+        if (
+            not settings.analytics_response_cache_enabled
+            or not settings.analytics_cache_enabled
+            or scope["method"] != "GET"
+        ):
+            return None
+        endpoint = scope["path"][len(self.prefix):].strip("/")
+        if endpoint in self.exclude:
+            return None
+        query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        version = get_db().data_version or "unversioned"
+        return f"analytics:response:{version}:{settings.db_result_decode}:{endpoint}?{query}"
+
+    @staticmethod
+    def _accepts_gzip(scope: Scope) -> bool:
+        """Client gzip qabul qiladimi (Accept-Encoding, q=0 yoki noto'g'ri q - rad etilgan)."""
+        if not settings.analytics_response_gzip:
+            return False
+        for name, value in scope.get("headers", []):
+            if name != b"accept-encoding":
+                continue
+            for part in value.decode("latin-1").lower().split(","):
+                coding, _, params = part.partition(";")
+                if coding.strip() != "gzip":
+                    continue
+                quality = params.replace(" ", "")
+                if not quality.startswith("q="):
+                    return True
+                try:
+                    return float(quality[2:]) > 0
+                except ValueError:
+                    return False
+        return False
+
+    async def _send_cached(self, send: Send, key: str, encoding: str, etag: Optional[str]) -> bool:
+        """
+        Keshlangan javob baytlarini yuborish.
+        gzip so'ralganda gzip varianti bo'lmasa (kichik javob) identity varianti yuboriladi.
+
+        Returns:
+            bool: Javob keshdan yuborildimi
+        """
+        entry = analytics_cache.get(f"{key}:{encoding}")
+        if entry is None and encoding == "gzip":
+            encoding = "identity"
+            entry = analytics_cache.get(f"{key}:{encoding}")
+        if entry is None:
+            return False
+
+        content_type, body, data_age = entry.value
+        headers = [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"x-cache", b"HIT"),
+            (b"x-data-age", str(int(data_age + entry.age)).encode("latin-1")),
+        ]
+        if encoding == "gzip":
+            headers.append((b"content-encoding", b"gzip"))
+        if settings.analytics_response_gzip:
+            headers.append((b"vary", b"accept-encoding"))
+        if etag is not None:
+            headers.extend(self._validator_headers(etag))
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+        return True
+
+    @staticmethod
+    async def _store_response(key: str, trace: CacheTrace, captured: dict) -> None:
+        """
+        Muvaffaqiyatli javob baytlarini keshga yozish.
+        Faqat kesh orqali o'tgan (trace yozilgan), siqilmagan 200 javoblar saqlanadi;
+        gzip varianti event loop'dan tashqarida (thread'da) siqiladi.
+        """
+        ttl = trace.response_ttl
+        if captured["status"] != 200 or ttl <= 0:
+            return
+        headers = dict(captured["headers"])
+        if b"content-encoding" in headers:
+            return
+
+        body = b"".join(captured["body"])
+        content_type = headers.get(b"content-type", b"application/json")
+        analytics_cache.set(f"{key}:identity", (content_type, body, trace.age), ttl)
+        if settings.analytics_response_gzip and len(body) >= settings.analytics_response_gzip_min_bytes:
+            compressed = await asyncio.to_thread(gzip.compress, body, compresslevel=6)
+            analytics_cache.set(f"{key}:gzip", (content_type, compressed, trace.age), ttl)
+
+    @staticmethod
+    def _matches(scope: Scope, etag: str) -> bool:
+        """If-None-Match sarlavhasi ETag bilan mos keladimi (weak taqqoslash, RFC 9110)."""
+        header = None
+        for name, value in scope.get("headers", []):
+            if name == b"if-none-match":
+                header = value.decode("latin-1")
+                break
+        if not header:
+            return False
+        if header.strip() == "*":
+            return True
+        candidates = (tag.strip() for tag in header.split(","))
+        return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+    @staticmethod
+    def _validator_headers(etag: str) -> list:
+        """ETag va Cache-Control sarlavhalari (ASGI formatida)."""
+        headers = [(b"etag", etag.encode("latin-1"))]
+        if settings.analytics_cache_control:
+            headers.append((b"cache-control", settings.analytics_cache_control.encode("latin-1")))
+        return headers
+
+    async def _send_not_modified(self, send: Send, etag: str) -> None:
+        """Tanasiz 304 Not Modified javobi."""
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": self._validator_headers(etag),
+        })
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,85 @@
+"""
+Endpoint darajasidagi query deadline va client uzilishini kuzatuvchi middleware.
+Har bir so'rov uchun QueryGuard yaratadi; deadline o'tsa yoki client
+ulanishni uzsa, ishlayotgan query KILL QUERY bilan to'xtatiladi va ulanish
+darhol pool'ga qaytadi.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.config.query_guard import QueryGuard, current_query_guard
+
+logger = logging.getLogger(__name__)
+
+
+class QueryDeadlineMiddleware:
+    """
+    Pure ASGI middleware (BaseHTTPMiddleware emas) - endpoint shu task va
+    context'da ishlaydi, shuning uchun QueryGuard contextvar orqali
+    DatabaseManager'gacha yetib boradi.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefix: str,
+        deadlines: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        QueryDeadlineMiddleware ni ishga tushirish.
+
+        Args:
+            app: Keyingi ASGI ilova
+            prefix: Kuzatiladigan yo'l prefiksi (masalan, /api/v1/analytics)
+            deadlines: Prefiksdan keyingi yo'l -> deadline (soniya);
+                DB_QUERY_DEADLINES qiymatlari ularning ustidan yoziladi
+        """
+        self.app = app
+        self.prefix = prefix.rstrip("/")
+        self.deadlines = {**(deadlines or {}), **settings.db_query_deadlines}
+
+    def deadline_for(self, endpoint: str) -> float:
+        """Endpoint deadline'i (ro'yxatda bo'lmasa DB_QUERY_DEADLINE_SECONDS)."""
+        return self.deadlines.get(endpoint, settings.db_query_deadline_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope["path"][len(self.prefix):].strip("/")
+        guard = QueryGuard(endpoint, self.deadline_for(endpoint))
+        token = current_query_guard.set(guard)
+
+        # Client xabarlarini watcher o'qiydi va ilovaga navbat orqali uzatadi
+        inbox: asyncio.Queue[Message] = asyncio.Queue()
+        watcher = asyncio.create_task(self._watch(guard, receive, inbox))
+        try:
+            await self.app(scope, inbox.get, send)
+        finally:
+            watcher.cancel()
+            current_query_guard.reset(token)
+
+    async def _watch(self, guard: QueryGuard, receive: Receive, inbox: asyncio.Queue) -> None:
+        """Client uzilishi yoki deadline'ni kutish va guard'ni bekor qilish."""
+
+        async def wait_disconnect() -> None:
+            while True:
+                message = await receive()
+                await inbox.put(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        try:
+            await asyncio.wait_for(wait_disconnect(), guard.timeout if guard.timeout > 0 else None)
+            reason = "client disconnected"
+        except asyncio.TimeoutError:
+            reason = "deadline exceeded"
+
+        # KILL QUERY yangi ulanish ochadi - default executor'da, DB executor band bo'lsa ham
+        await asyncio.get_running_loop().run_in_executor(None, guard.cancel, reason)
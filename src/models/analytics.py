@@ -122,6 +122,9 @@ class EmployeeHierarchySchema(BaseModel):
     hierarchy_path: str = Field(..., description="Full hierarchy path")
     total_orders: int = Field(..., description="Number of orders")
     total_revenue: Decimal = Field(..., description="Total revenue generated")
+    team_size: int = Field(..., description="Number of employees in the subtree (excluding the employee)")
+    team_orders: int = Field(..., description="Orders of the employee and the whole subtree")
+    team_revenue: Decimal = Field(..., description="Revenue of the employee and the whole subtree")
 
     class Config:
         from_attributes = True
@@ -12,6 +12,16 @@ from src.repositories.analytics_repository import (
     ShippingAnalyticsRepository,
     SalesAnalyticsRepository
 )
+from src.repositories.async_analytics_repository import (
+    AsyncBaseAnalyticsRepository,
+    AsyncProductAnalyticsRepository,
+    AsyncEmployeeAnalyticsRepository,
+    AsyncCustomerAnalyticsRepository,
+    AsyncCategoryAnalyticsRepository,
+    AsyncSupplierAnalyticsRepository,
+    AsyncShippingAnalyticsRepository,
+    AsyncSalesAnalyticsRepository
+)
 
 __all__ = [
     "BaseAnalyticsRepository",
@@ -21,5 +31,13 @@ __all__ = [
     "CategoryAnalyticsRepository",
     "SupplierAnalyticsRepository",
     "ShippingAnalyticsRepository",
-    "SalesAnalyticsRepository"
+    "SalesAnalyticsRepository",
+    "AsyncBaseAnalyticsRepository",
+    "AsyncProductAnalyticsRepository",
+    "AsyncEmployeeAnalyticsRepository",
+    "AsyncCustomerAnalyticsRepository",
+    "AsyncCategoryAnalyticsRepository",
+    "AsyncSupplierAnalyticsRepository",
+    "AsyncShippingAnalyticsRepository",
+    "AsyncSalesAnalyticsRepository"
 ]
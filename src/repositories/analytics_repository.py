@@ -3,22 +3,344 @@ Analytics Repository - Database access layer
 Following Repository Pattern and Dependency Inversion Principle
 All database queries are encapsulated here
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple
+from src.cache import analytics_cache, cache_refresher, query_flights, record_cache_access
 from src.config.database import DatabaseManager
+from src.config.settings import settings
+from src.utils.analytics_helpers import CacheKeyBuilder
 from src.utils.exceptions import DatabaseException
+import functools
+import inspect
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Stored line amount columns of OrderDetail (SQLScripts/05_orderdetail_line_amounts.sql)
+# and the expressions they are generated from
+LINE_AMOUNT_EXPRESSIONS = {
+    "od.lineRevenue": "(od.unitPrice * od.quantity * (1 - od.discount))",
+    "od.lineGross": "(od.unitPrice * od.quantity)",
+    "od.lineDiscount": "(od.unitPrice * od.quantity * od.discount)",
+}
+
+_LINE_AMOUNT_RE = re.compile(r"\bod\.(lineRevenue|lineGross|lineDiscount)\b")
+
+
+def inline_line_amounts(query: str) -> str:
+    """
+    Replace the stored line amount columns with their expressions
+    
+    Used while ANALYTICS_USE_LINE_AMOUNTS is off, so the queries also run
+    on databases without migration 05
+    
+    Args:
+        query: SQL query reading od.lineRevenue, od.lineGross or od.lineDiscount
+        
+    Returns:
+        The same query computing the amounts from unitPrice, quantity and discount
+    """
+    return _LINE_AMOUNT_RE.sub(lambda match: LINE_AMOUNT_EXPRESSIONS[match.group(0)], query)
+
+
+def cached_query(
+    ttl: Optional[float] = None,
+    stale_ttl: float = 0,
+    max_limit: Optional[int] = None,
+    min_filter: Optional[Tuple[str, str, int]] = None
+):
+    """
+    Cache the result of a repository query method
+    
+    The cache key is built from the method name and its bound arguments
+    (defaults applied, so get_x() and get_x(limit=5) share an entry), the
+    tables the repository reads (source) and the current data version of
+    the database, so new orders, products or customers make every cached
+    result unreachable at once.
+    ANALYTICS_CACHE_TTLS overrides the TTL per method name. The same key
+    coalesces identical concurrent calls (ANALYTICS_SINGLE_FLIGHT), even
+    when the cache is disabled
+    
+    With a stale_ttl the method behind an endpoint serves
+    stale-while-revalidate: for stale_ttl seconds after the TTL the old
+    result is returned immediately and one background recompute is started
+    
+    Top-N methods declare max_limit: the query runs once at that limit and
+    every smaller limit is served by slicing the cached rows. A min_filter
+    does the same for a minimum threshold: the query runs at the base
+    value and any higher threshold is served by filtering the result column.
+    The query must be ordered by that column (descending) so the filtered
+    rows stay a prefix of the cached superset. Calls outside these bounds
+    are cached under their own arguments
+    
+    Args:
+        ttl: Fresh time to live in seconds (default: ANALYTICS_CACHE_TTL_SECONDS)
+        stale_ttl: Seconds after ttl during which a stale result is served
+            (ANALYTICS_CACHE_STALE_TTLS overrides it per method name)
+        max_limit: Limit the shared superset is computed with (the
+            method's "limit" argument)
+        min_filter: (argument name, result column, base value) of a
+            minimum threshold served from the superset
+    """
+    def decorator(method: Callable) -> Callable:
+        name = method.__name__
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.cache is None and not settings.analytics_single_flight:
+                return method(self, *args, **kwargs)
+            
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(list(bound.arguments.items())[1:])
+            superset = superset_params(params, max_limit, min_filter) if self.cache is not None else None
+            if superset is not None:
+                result = cached(self, superset)
+                narrow = functools.partial(narrow_superset, params=params, min_filter=min_filter)
+                if inspect.isawaitable(result):
+                    return _narrow_awaited(result, narrow)
+                return narrow(result)
+            return cached(self, params)
+        
+        def cached(self, params: Dict[str, Any]) -> Any:
+            version = self.db.data_version
+            key = CacheKeyBuilder.build_key(
+                f"analytics:{self.decode}:{version or 'unversioned'}:{name}", source=self.source, **params
+            )
+            fresh, stale = cache_policy(name, ttl, stale_ttl, versioned=version is not None)
+            return self.cached_call(key, fresh, stale, lambda: method(self, **params), name)
+        
+        wrapper.cache_ttl = ttl
+        wrapper.cache_stale_ttl = stale_ttl
+        return wrapper
+    return decorator
+
+
+def superset_params(
+    params: Dict[str, Any],
+    max_limit: Optional[int],
+    min_filter: Optional[Tuple[str, str, int]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Arguments of the cached superset that can answer a call
+    
+    Args:
+        params: Bound arguments of the call
+        max_limit: Superset limit declared on the method
+        min_filter: (argument name, result column, base value) declared on the method
+        
+    Returns:
+        Superset arguments, or None when the call has no superset or falls
+        outside it (a limit above max_limit, a threshold below the base)
+    """
+    if max_limit is None or params["limit"] > max_limit:
+        return None
+    superset = {**params, "limit": max_limit}
+    if min_filter is not None:
+        argument, _, base = min_filter
+        if params[argument] < base:
+            return None
+        superset[argument] = base
+    return superset
+
+
+def narrow_superset(
+    rows: List[Dict[str, Any]],
+    params: Dict[str, Any],
+    min_filter: Optional[Tuple[str, str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Cut the rows a call asked for out of a cached superset
+    
+    Args:
+        rows: Cached superset rows (not modified)
+        params: Bound arguments of the call
+        min_filter: (argument name, result column, base value) declared on the method
+        
+    Returns:
+        New list with the rows passing the threshold, at most params["limit"]
+    """
+    if min_filter is not None:
+        argument, column, _ = min_filter
+        rows = [row for row in rows if row[column] >= params[argument]]
+    return rows[:params["limit"]]
+
+
+async def _narrow_awaited(result: Awaitable, narrow: Callable) -> List[Dict[str, Any]]:
+    """Narrow the superset returned by an async repository"""
+    return narrow(await result)
+
+
+def cache_policy(
+    name: str,
+    ttl: Optional[float] = None,
+    stale_ttl: float = 0,
+    versioned: bool = False
+) -> Tuple[float, float]:
+    """
+    Effective cache policy of a repository method
+    
+    Args:
+        name: Repository method name
+        ttl: TTL declared on the method
+        stale_ttl: Stale window declared on the method
+        versioned: The key carries a known data version, so the entry only
+            needs a long safety TTL (ANALYTICS_CACHE_VERSIONED_TTL_SECONDS)
+        
+    Returns:
+        (fresh TTL, stale TTL) in seconds; settings overrides win over the
+        declared values, ANALYTICS_CACHE_TTL_SECONDS is the default TTL
+    """
+    if name in settings.analytics_cache_ttls:
+        fresh = settings.analytics_cache_ttls[name]
+    else:
+        fresh = ttl if ttl is not None else settings.analytics_cache_ttl_seconds
+        if versioned:
+            fresh = max(fresh, settings.analytics_cache_versioned_ttl_seconds)
+    return fresh, settings.analytics_cache_stale_ttls.get(name, stale_ttl)
+
 
 class BaseAnalyticsRepository:
     """
     Base repository class following Single Responsibility Principle
     Provides common database operations
+    
+    Analytics queries are read-only, so they are routed to the read replicas
+    by default (the database manager falls back to the primary when no
+    healthy replica is available)
+    
+    Rows are decoded at the cursor (DB_RESULT_DECODE, "json" by default):
+    DECIMAL values arrive as float and DATE/DATETIME values as ISO strings,
+    so results go straight into the JSON response without a second pass
+    
+    Query methods marked with @cached_query are served from the analytics
+    cache while their TTL lasts, and identical concurrent misses run the
+    query only once. Cached rows are shared between callers and must not
+    be modified
+    
+    With use_line_amounts line amounts are read from the stored generated
+    columns of OrderDetail (lineRevenue, lineGross, lineDiscount), so
+    aggregates sum precomputed values straight from the covering indexes.
+    Without it execute_query rewrites the columns to the expressions they
+    are generated from, so the queries run before migration 05 is applied
+    
+    With use_sales_fact the aggregate queries read the DailySalesFact table
+    (revenue by product or customer) or the MonthlySalesRollup table
+    (monthly time series by category, employee or month) instead of
+    scanning OrderDetail. Orders without an orderDate are not part of
+    either table. With use_employee_closure the employee hierarchy reads
+    the maintained EmployeeClosure table instead of recursing over
+    Employee. The cache key includes the source, so the variants are
+    cached separately
     """
     
-    def __init__(self, db: DatabaseManager):
+    # Coalesces identical concurrent loads (thread based; the async repositories
+    # use the event loop variant)
+    flights = query_flights
+    
+    def __init__(
+        self,
+        db: DatabaseManager,
+        use_replica: bool = True,
+        decode: Optional[str] = None,
+        use_cache: bool = True,
+        use_sales_fact: Optional[bool] = None,
+        use_employee_closure: Optional[bool] = None,
+        use_line_amounts: Optional[bool] = None
+    ):
         self.db = db
+        self.use_replica = use_replica
+        self.decode = decode or settings.db_result_decode
+        self.cache = analytics_cache if use_cache and settings.analytics_cache_enabled else None
+        self.use_sales_fact = settings.analytics_use_sales_fact if use_sales_fact is None else use_sales_fact
+        self.use_employee_closure = (
+            settings.analytics_use_employee_closure if use_employee_closure is None else use_employee_closure
+        )
+        self.use_line_amounts = (
+            settings.analytics_use_line_amounts if use_line_amounts is None else use_line_amounts
+        )
+    
+    @property
+    def source(self) -> str:
+        """
+        Tables the queries read, part of the cache key
+        
+        Returns:
+            "raw" or "fact", with "+closure" when the hierarchy reads EmployeeClosure
+        """
+        source = "fact" if self.use_sales_fact else "raw"
+        return f"{source}+closure" if self.use_employee_closure else source
+    
+    def cached_call(
+        self,
+        key: str,
+        ttl: float,
+        stale_ttl: float,
+        load: Callable[[], Any],
+        name: Optional[str] = None
+    ) -> Any:
+        """
+        Return the cached result for key, or load and cache it
+        
+        On a miss the first caller runs load() and concurrent callers with
+        the same key wait for its result instead of taking their own
+        connection. A stale entry is returned as is and refreshed in the
+        background
+        
+        Args:
+            key: Cache key
+            ttl: Fresh time to live in seconds
+            stale_ttl: Stale window after ttl in seconds
+            load: Runs the query on a cache miss
+            name: Repository method name for the per-method cache statistics
+            
+        Returns:
+            Query results
+        """
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                if entry.stale:
+                    record_cache_access("STALE", entry.age, method=name)
+                    self._submit_refresh(key, lambda: self._load_coalesced(key, ttl, stale_ttl, load))
+                else:
+                    record_cache_access("HIT", entry.age, entry.expires_at - time.time(), name)
+                return self._resolved(entry.value)
+            record_cache_access("MISS", fresh_for=ttl, method=name)
+        return self._load_coalesced(key, ttl, stale_ttl, load)
+    
+    def _load_coalesced(self, key: str, ttl: float, stale_ttl: float, load: Callable[[], Any]) -> Any:
+        """Run the query once for all concurrent callers of key"""
+        if not settings.analytics_single_flight:
+            return self._load_and_store(key, ttl, stale_ttl, load)
+        return self.flights.do(key, lambda: self._load_and_store(key, ttl, stale_ttl, load))
+    
+    def _load_and_store(self, key: str, ttl: float, stale_ttl: float, load: Callable[[], Any]) -> Any:
+        """Run the query and cache its result"""
+        return self._then(load(), functools.partial(self._store, key, ttl, stale_ttl))
+    
+    def _store(self, key: str, ttl: float, stale_ttl: float, result: Any) -> Any:
+        """Cache a loaded result"""
+        if self.cache is not None:
+            self.cache.set(key, result, ttl, stale_ttl)
+        return result
+    
+    @staticmethod
+    def _then(result: Any, callback: Callable[[Any], Any]) -> Any:
+        """Pass a query result to callback (the async repositories await it first)"""
+        return callback(result)
+    
+    @staticmethod
+    def _resolved(value: Any) -> Any:
+        """Return a cached value the way execute_query returns rows"""
+        return value
+    
+    @staticmethod
+    def _submit_refresh(key: str, refresh: Callable[[], Any]) -> None:
+        """Start the background recompute of a stale entry"""
+        cache_refresher.submit(key, refresh)
     
     def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """
@@ -34,8 +356,10 @@ class BaseAnalyticsRepository:
         Raises:
             DatabaseException: If query execution fails
         """
+        if not self.use_line_amounts:
+            query = inline_line_amounts(query)
         try:
-            result = self.db.execute_query(query, params)
+            result = self.db.execute_query(query, params, readonly=self.use_replica, decode=self.decode)
             return result if result else []
         except Exception as e:
             logger.error(f"Query execution failed: {str(e)}")
@@ -45,6 +369,7 @@ class BaseAnalyticsRepository:
 class ProductAnalyticsRepository(BaseAnalyticsRepository):
     """Repository for product-related analytics queries"""
     
+    @cached_query(max_limit=100)
     def get_top_revenue_products(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Query 1: Get top revenue generating products
@@ -55,13 +380,33 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
         Returns:
             List of top revenue products with category and supplier info
         """
+        if self.use_sales_fact:
+            query = """
+                SELECT 
+                    p.productId as product_id,
+                    p.productName as product_name,
+                    c.categoryName as category_name,
+                    s.companyName as supplier_name,
+                    SUM(f.revenue) AS total_revenue,
+                    SUM(f.quantity) AS total_quantity_sold,
+                    CAST(SUM(f.productOrders) AS SIGNED) AS total_orders
+                FROM Product p
+                INNER JOIN Category c ON p.categoryId = c.categoryId
+                INNER JOIN Supplier s ON p.supplierId = s.supplierId
+                INNER JOIN DailySalesFact f ON p.productId = f.productId
+                GROUP BY p.productId, p.productName, c.categoryName, s.companyName
+                ORDER BY total_revenue DESC, p.productId
+                LIMIT %s
+            """
+            return self.execute_query(query, (limit,))
+        
         query = """
             SELECT 
                 p.productId as product_id,
                 p.productName as product_name,
                 c.categoryName as category_name,
                 s.companyName as supplier_name,
-                SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_revenue,
+                SUM(od.lineRevenue) AS total_revenue,
                 SUM(od.quantity) AS total_quantity_sold,
                 COUNT(DISTINCT od.orderId) AS total_orders
             FROM Product p
@@ -69,11 +414,12 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
             INNER JOIN Supplier s ON p.supplierId = s.supplierId
             INNER JOIN OrderDetail od ON p.productId = od.productId
             GROUP BY p.productId, p.productName, c.categoryName, s.companyName
-            ORDER BY total_revenue DESC
+            ORDER BY total_revenue DESC, p.productId
             LIMIT %s
         """
         return self.execute_query(query, (limit,))
     
+    @cached_query(ttl=3600)
     def get_abc_analysis(self) -> List[Dict[str, Any]]:
         """
         Query 16: ABC Analysis - Product classification by revenue
@@ -81,18 +427,32 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
         Returns:
             List of products with ABC classification
         """
-        query = """
-            WITH ProductRevenue AS (
+        if self.use_sales_fact:
+            product_revenue = """
+                SELECT 
+                    p.productId as product_id,
+                    p.productName as product_name,
+                    cat.categoryName as category_name,
+                    SUM(f.revenue) AS total_revenue
+                FROM Product p
+                INNER JOIN Category cat ON p.categoryId = cat.categoryId
+                INNER JOIN DailySalesFact f ON p.productId = f.productId
+                GROUP BY p.productId, p.productName, cat.categoryName
+            """
+        else:
+            product_revenue = """
                 SELECT 
                     p.productId as product_id,
                     p.productName as product_name,
                     cat.categoryName as category_name,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_revenue
+                    SUM(od.lineRevenue) AS total_revenue
                 FROM Product p
                 INNER JOIN Category cat ON p.categoryId = cat.categoryId
                 INNER JOIN OrderDetail od ON p.productId = od.productId
                 GROUP BY p.productId, p.productName, cat.categoryName
-            ),
+            """
+        query = f"""
+            WITH ProductRevenue AS ({product_revenue}),
             RevenueRanked AS (
                 SELECT 
                     *,
@@ -119,6 +479,7 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query(ttl=3600)
     def get_discontinued_products_analysis(self) -> List[Dict[str, Any]]:
         """
         Query 12: Discontinued products impact analysis
@@ -137,7 +498,7 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
                     s.companyName AS supplierName,
                     COUNT(DISTINCT od.orderId) AS order_count,
                     SUM(od.quantity) AS total_quantity_sold,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_revenue,
+                    SUM(od.lineRevenue) AS total_revenue,
                     AVG(od.discount) AS avg_discount,
                     MAX(so.orderDate) AS last_order_date
                 FROM Product p
@@ -172,6 +533,12 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query(
+        ttl=3600,
+        stale_ttl=86400,
+        max_limit=100,
+        min_filter=("min_occurrences", "times_bought_together", 1)
+    )
     def get_market_basket_analysis(self, min_occurrences: int = 10, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Query 7: Market Basket Analysis - Products bought together
@@ -205,7 +572,7 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
             FROM ProductPairs pp
             INNER JOIN Product p1 ON pp.product1 = p1.productId
             INNER JOIN Product p2 ON pp.product2 = p2.productId
-            ORDER BY times_bought_together DESC
+            ORDER BY times_bought_together DESC, pp.product1, pp.product2
             LIMIT {int(limit)}
         """
         return self.execute_query(query)
@@ -214,6 +581,7 @@ class ProductAnalyticsRepository(BaseAnalyticsRepository):
 class EmployeeAnalyticsRepository(BaseAnalyticsRepository):
     """Repository for employee-related analytics queries"""
     
+    @cached_query()
     def get_employee_monthly_sales(self) -> List[Dict[str, Any]]:
         """
         Query 2: Employee monthly sales performance
@@ -221,6 +589,25 @@ class EmployeeAnalyticsRepository(BaseAnalyticsRepository):
         Returns:
             Monthly sales data for each employee
         """
+        if self.use_sales_fact:
+            query = """
+                SELECT 
+                    e.employeeId as employee_id,
+                    CONCAT(e.firstname, ' ', e.lastname) AS employee_name,
+                    e.title,
+                    r.salesYear AS order_year,
+                    r.monthNum AS order_month,
+                    CAST(SUM(r.orders) AS SIGNED) AS total_orders,
+                    SUM(r.revenue) AS monthly_revenue,
+                    SUM(r.revenue) / SUM(r.lineCount) AS avg_order_value
+                FROM Employee e
+                INNER JOIN MonthlySalesRollup r ON e.employeeId = r.employeeId
+                GROUP BY e.employeeId, e.firstname, e.lastname, e.title, 
+                         r.salesYear, r.monthNum
+                ORDER BY e.employeeId, order_year, order_month
+            """
+            return self.execute_query(query)
+        
         query = """
             SELECT 
                 e.employeeId as employee_id,
@@ -229,8 +616,8 @@ class EmployeeAnalyticsRepository(BaseAnalyticsRepository):
                 YEAR(so.orderDate) AS order_year,
                 MONTH(so.orderDate) AS order_month,
                 COUNT(DISTINCT so.orderId) AS total_orders,
-                SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS monthly_revenue,
-                AVG(od.unitPrice * od.quantity * (1 - od.discount)) AS avg_order_value
+                SUM(od.lineRevenue) AS monthly_revenue,
+                AVG(od.lineRevenue) AS avg_order_value
             FROM Employee e
             INNER JOIN SalesOrder so ON e.employeeId = so.employeeId
             INNER JOIN OrderDetail od ON so.orderId = od.orderId
@@ -240,50 +627,89 @@ class EmployeeAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query(ttl=3600)
     def get_employee_hierarchy(self) -> List[Dict[str, Any]]:
         """
         Query 8: Employee hierarchy with team sales
         
+        Every employee reachable from a top manager is returned with their
+        own sales and the rolled-up sales of their whole subtree (team_*,
+        the employee included). The ancestor/descendant pairs come from the
+        EmployeeClosure table with use_employee_closure, otherwise from a
+        recursive CTE with the same shape
+        
         Returns:
-            Employee hierarchy with sales performance
-        """
-        query = """
-            WITH RECURSIVE EmployeeHierarchy AS (
+            Employee hierarchy with own and team sales performance
+        """
+        if self.use_employee_closure:
+            closure = """
+                Closure AS (
+                    SELECT ancestorId, descendantId, depth, path
+                    FROM EmployeeClosure
+                )
+            """
+        else:
+            closure = """
+                RECURSIVE Closure AS (
+                    SELECT 
+                        employeeId AS ancestorId,
+                        employeeId AS descendantId,
+                        0 AS depth,
+                        CAST(CONCAT(firstname, ' ', lastname) AS CHAR(500)) AS path
+                    FROM Employee
+                    
+                    UNION ALL
+                    
+                    SELECT 
+                        c.ancestorId,
+                        e.employeeId,
+                        c.depth + 1,
+                        CONCAT(c.path, ' -> ', e.firstname, ' ', e.lastname)
+                    FROM Closure c
+                    INNER JOIN Employee e ON e.mgrId = c.descendantId
+                    WHERE c.depth < 100
+                )
+            """
+        if self.use_sales_fact:
+            employee_sales = """
                 SELECT 
-                    employeeId as employee_id,
-                    CONCAT(firstname, ' ', lastname) AS employee_name,
-                    title,
-                    mgrId as mgr_id,
-                    1 AS level,
-                    CAST(CONCAT(firstname, ' ', lastname) AS CHAR(500)) AS hierarchy_path
-                FROM Employee
-                WHERE mgrId IS NULL
-                
-                UNION ALL
-                
+                    r.employeeId AS employee_id,
+                    SUM(r.orders) AS total_orders,
+                    SUM(r.revenue) AS total_revenue
+                FROM MonthlySalesRollup r
+                GROUP BY r.employeeId
+            """
+        else:
+            employee_sales = """
                 SELECT 
-                    e.employeeId,
-                    CONCAT(e.firstname, ' ', e.lastname),
-                    e.title,
-                    e.mgrId,
-                    eh.level + 1,
-                    CONCAT(eh.hierarchy_path, ' -> ', e.firstname, ' ', e.lastname)
-                FROM Employee e
-                INNER JOIN EmployeeHierarchy eh ON e.mgrId = eh.employee_id
-            )
+                    so.employeeId AS employee_id,
+                    COUNT(DISTINCT so.orderId) AS total_orders,
+                    SUM(od.lineRevenue) AS total_revenue
+                FROM SalesOrder so
+                LEFT JOIN OrderDetail od ON so.orderId = od.orderId
+                GROUP BY so.employeeId
+            """
+        query = f"""
+            WITH {closure},
+            EmployeeSales AS ({employee_sales})
             SELECT 
-                eh.employee_id,
-                eh.employee_name,
-                eh.title,
-                eh.level,
-                eh.hierarchy_path,
-                COUNT(DISTINCT so.orderId) AS total_orders,
-                COALESCE(SUM(od.unitPrice * od.quantity * (1 - od.discount)), 0) AS total_revenue
-            FROM EmployeeHierarchy eh
-            LEFT JOIN SalesOrder so ON eh.employee_id = so.employeeId
-            LEFT JOIN OrderDetail od ON so.orderId = od.orderId
-            GROUP BY eh.employee_id, eh.employee_name, eh.title, eh.level, eh.hierarchy_path
-            ORDER BY eh.level, total_revenue DESC
+                e.employeeId as employee_id,
+                CONCAT(e.firstname, ' ', e.lastname) AS employee_name,
+                e.title,
+                lineage.depth + 1 AS level,
+                lineage.path AS hierarchy_path,
+                CAST(COALESCE(SUM(CASE WHEN team.depth = 0 THEN es.total_orders END), 0) AS SIGNED) AS total_orders,
+                COALESCE(SUM(CASE WHEN team.depth = 0 THEN es.total_revenue END), 0) AS total_revenue,
+                COUNT(*) - 1 AS team_size,
+                CAST(COALESCE(SUM(es.total_orders), 0) AS SIGNED) AS team_orders,
+                COALESCE(SUM(es.total_revenue), 0) AS team_revenue
+            FROM Employee e
+            INNER JOIN Closure lineage ON lineage.descendantId = e.employeeId
+            INNER JOIN Employee root ON root.employeeId = lineage.ancestorId AND root.mgrId IS NULL
+            INNER JOIN Closure team ON team.ancestorId = e.employeeId
+            LEFT JOIN EmployeeSales es ON es.employee_id = team.descendantId
+            GROUP BY e.employeeId, e.firstname, e.lastname, e.title, lineage.depth, lineage.path
+            ORDER BY level, total_revenue DESC
         """
         return self.execute_query(query)
 
@@ -291,6 +717,7 @@ class EmployeeAnalyticsRepository(BaseAnalyticsRepository):
 class CustomerAnalyticsRepository(BaseAnalyticsRepository):
     """Repository for customer-related analytics queries"""
     
+    @cached_query()
     def get_top_customer_by_country(self) -> List[Dict[str, Any]]:
         """
         Query 3: Top customer per country with running total
@@ -298,19 +725,33 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
         Returns:
             Best customer in each country with analytics
         """
-        query = """
-            WITH CustomerRevenue AS (
+        if self.use_sales_fact:
+            customer_revenue = """
                 SELECT 
                     c.custId as cust_id,
                     c.companyName as company_name,
                     c.country,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_spent,
+                    SUM(f.revenue) AS total_spent,
+                    CAST(SUM(f.orders) AS SIGNED) AS order_count
+                FROM Customer c
+                INNER JOIN DailySalesFact f ON c.custId = f.custId
+                GROUP BY c.custId, c.companyName, c.country
+            """
+        else:
+            customer_revenue = """
+                SELECT 
+                    c.custId as cust_id,
+                    c.companyName as company_name,
+                    c.country,
+                    SUM(od.lineRevenue) AS total_spent,
                     COUNT(DISTINCT so.orderId) AS order_count
                 FROM Customer c
                 INNER JOIN SalesOrder so ON c.custId = so.custId
                 INNER JOIN OrderDetail od ON so.orderId = od.orderId
                 GROUP BY c.custId, c.companyName, c.country
-            ),
+            """
+        query = f"""
+            WITH CustomerRevenue AS ({customer_revenue}),
             RankedCustomers AS (
                 SELECT 
                     *,
@@ -331,6 +772,7 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query(ttl=3600, stale_ttl=86400)
     def get_rfm_analysis(self, reference_date: str = '2008-05-06') -> List[Dict[str, Any]]:
         """
         Query 5: RFM (Recency, Frequency, Monetary) customer segmentation
@@ -350,7 +792,7 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
                     c.companyName as company_name,
                     DATEDIFF('{safe_date}', MAX(so.orderDate)) AS recency,
                     COUNT(DISTINCT so.orderId) AS frequency,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS monetary
+                    SUM(od.lineRevenue) AS monetary
                 FROM Customer c
                 INNER JOIN SalesOrder so ON c.custId = so.custId
                 INNER JOIN OrderDetail od ON so.orderId = od.orderId
@@ -387,6 +829,7 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query(ttl=3600)
     def get_customer_retention_analysis(self) -> List[Dict[str, Any]]:
         """
         Query 13: Customer retention and reorder analysis
@@ -429,6 +872,7 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query(max_limit=100)
     def get_customer_discount_behavior(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Query 18: Customer discount usage patterns
@@ -446,8 +890,8 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
                     c.companyName as company_name,
                     c.country,
                     COUNT(DISTINCT so.orderId) AS total_orders,
-                    SUM(od.unitPrice * od.quantity) AS gross_purchases,
-                    SUM(od.unitPrice * od.quantity * od.discount) AS total_discount_received,
+                    SUM(od.lineGross) AS gross_purchases,
+                    SUM(od.lineDiscount) AS total_discount_received,
                     AVG(od.discount) AS avg_discount_rate,
                     SUM(CASE WHEN od.discount > 0 THEN 1 ELSE 0 END) AS discounted_line_items,
                     COUNT(od.orderDetailId) AS total_line_items
@@ -474,7 +918,7 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
                     ELSE 'Full Price Buyer'
                 END AS discount_behavior
             FROM CustomerDiscountBehavior
-            ORDER BY total_discount_received DESC
+            ORDER BY total_discount_received DESC, cust_id
             LIMIT %s
         """
         return self.execute_query(query, (limit,))
@@ -483,6 +927,7 @@ class CustomerAnalyticsRepository(BaseAnalyticsRepository):
 class CategoryAnalyticsRepository(BaseAnalyticsRepository):
     """Repository for category-related analytics queries"""
     
+    @cached_query()
     def get_category_monthly_growth(self) -> List[Dict[str, Any]]:
         """
         Query 4: Category month-over-month growth
@@ -490,19 +935,32 @@ class CategoryAnalyticsRepository(BaseAnalyticsRepository):
         Returns:
             MoM growth for each category
         """
-        query = """
-            WITH MonthlyCategorySales AS (
+        if self.use_sales_fact:
+            monthly_category_sales = """
+                SELECT 
+                    c.categoryId,
+                    c.categoryName as category_name,
+                    r.salesMonth AS sales_month,
+                    SUM(r.revenue) AS monthly_revenue
+                FROM Category c
+                INNER JOIN MonthlySalesRollup r ON c.categoryId = r.categoryId
+                GROUP BY c.categoryId, c.categoryName, r.salesMonth
+            """
+        else:
+            monthly_category_sales = """
                 SELECT 
                     c.categoryId,
                     c.categoryName as category_name,
                     DATE_FORMAT(so.orderDate, '%Y-%m') AS sales_month,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS monthly_revenue
+                    SUM(od.lineRevenue) AS monthly_revenue
                 FROM Category c
                 INNER JOIN Product p ON c.categoryId = p.categoryId
                 INNER JOIN OrderDetail od ON p.productId = od.productId
                 INNER JOIN SalesOrder so ON od.orderId = so.orderId
                 GROUP BY c.categoryId, c.categoryName, DATE_FORMAT(so.orderDate, '%Y-%m')
-            )
+            """
+        query = f"""
+            WITH MonthlyCategorySales AS ({monthly_category_sales})
             SELECT 
                 category_name,
                 sales_month,
@@ -517,6 +975,7 @@ class CategoryAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query()
     def get_country_category_pivot(self) -> List[Dict[str, Any]]:
         """
         Query 10: Sales by country and category (pivot table)
@@ -527,15 +986,15 @@ class CategoryAnalyticsRepository(BaseAnalyticsRepository):
         query = """
             SELECT 
                 c.country,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Beverages' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS beverages,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Condiments' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS condiments,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Confections' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS confections,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Dairy Products' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS dairy_products,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Grains/Cereals' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS grains_cereals,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Meat/Poultry' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS meat_poultry,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Produce' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS produce,
-                ROUND(SUM(CASE WHEN cat.categoryName = 'Seafood' THEN od.unitPrice * od.quantity * (1 - od.discount) ELSE 0 END), 2) AS seafood,
-                ROUND(SUM(od.unitPrice * od.quantity * (1 - od.discount)), 2) AS total_revenue
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Beverages' THEN od.lineRevenue ELSE 0 END), 2) AS beverages,
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Condiments' THEN od.lineRevenue ELSE 0 END), 2) AS condiments,
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Confections' THEN od.lineRevenue ELSE 0 END), 2) AS confections,
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Dairy Products' THEN od.lineRevenue ELSE 0 END), 2) AS dairy_products,
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Grains/Cereals' THEN od.lineRevenue ELSE 0 END), 2) AS grains_cereals,
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Meat/Poultry' THEN od.lineRevenue ELSE 0 END), 2) AS meat_poultry,
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Produce' THEN od.lineRevenue ELSE 0 END), 2) AS produce,
+                ROUND(SUM(CASE WHEN cat.categoryName = 'Seafood' THEN od.lineRevenue ELSE 0 END), 2) AS seafood,
+                ROUND(SUM(od.lineRevenue), 2) AS total_revenue
             FROM Customer c
             INNER JOIN SalesOrder so ON c.custId = so.custId
             INNER JOIN OrderDetail od ON so.orderId = od.orderId
@@ -550,6 +1009,7 @@ class CategoryAnalyticsRepository(BaseAnalyticsRepository):
 class SupplierAnalyticsRepository(BaseAnalyticsRepository):
     """Repository for supplier-related analytics queries"""
     
+    @cached_query()
     def get_supplier_performance(self, min_orders: int = 10) -> List[Dict[str, Any]]:
         """
         Query 6: Supplier performance and lead time analysis
@@ -574,7 +1034,7 @@ class SupplierAnalyticsRepository(BaseAnalyticsRepository):
                     SUM(CASE WHEN so.shippedDate > so.requiredDate THEN 1 ELSE 0 END) * 100.0 
                     / COUNT(DISTINCT so.orderId), 2
                 ) AS late_shipment_percent,
-                SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_revenue
+                SUM(od.lineRevenue) AS total_revenue
             FROM Supplier s
             INNER JOIN Product p ON s.supplierId = p.supplierId
             INNER JOIN OrderDetail od ON p.productId = od.productId
@@ -586,6 +1046,7 @@ class SupplierAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query, (min_orders,))
     
+    @cached_query(ttl=3600)
     def get_supplier_risk_analysis(self) -> List[Dict[str, Any]]:
         """
         Query 19: Supplier diversification and risk analysis
@@ -602,7 +1063,7 @@ class SupplierAnalyticsRepository(BaseAnalyticsRepository):
                     s.companyName AS supplier_name,
                     s.country AS supplier_country,
                     COUNT(DISTINCT p.productId) AS product_count,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS supplier_revenue
+                    SUM(od.lineRevenue) AS supplier_revenue
                 FROM Category cat
                 INNER JOIN Product p ON cat.categoryId = p.categoryId
                 INNER JOIN Supplier s ON p.supplierId = s.supplierId
@@ -642,6 +1103,7 @@ class SupplierAnalyticsRepository(BaseAnalyticsRepository):
 class ShippingAnalyticsRepository(BaseAnalyticsRepository):
     """Repository for shipping and logistics analytics"""
     
+    @cached_query()
     def get_shipper_efficiency(self) -> List[Dict[str, Any]]:
         """
         Query 9: Shipper performance and cost analysis
@@ -665,8 +1127,8 @@ class ShippingAnalyticsRepository(BaseAnalyticsRepository):
                     SUM(CASE WHEN so.shippedDate <= so.requiredDate THEN 1 ELSE 0 END) * 100.0 
                     / COUNT(DISTINCT so.orderId), 2
                 ) AS on_time_delivery_rate,
-                SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_order_value,
-                ROUND(SUM(so.freight) * 100.0 / SUM(od.unitPrice * od.quantity * (1 - od.discount)), 2) AS freight_to_value_ratio
+                SUM(od.lineRevenue) AS total_order_value,
+                ROUND(SUM(so.freight) * 100.0 / SUM(od.lineRevenue), 2) AS freight_to_value_ratio
             FROM Shipper sh
             INNER JOIN SalesOrder so ON sh.shipperId = so.shipperid
             INNER JOIN OrderDetail od ON so.orderId = od.orderId
@@ -680,6 +1142,7 @@ class ShippingAnalyticsRepository(BaseAnalyticsRepository):
 class SalesAnalyticsRepository(BaseAnalyticsRepository):
     """Repository for general sales analytics"""
     
+    @cached_query()
     def get_yoy_growth_and_moving_avg(self) -> List[Dict[str, Any]]:
         """
         Query 11: Year-over-year growth and 3-month moving average
@@ -687,17 +1150,29 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
         Returns:
             YoY growth trends with moving averages
         """
-        query = """
-            WITH MonthlyRevenue AS (
+        if self.use_sales_fact:
+            monthly_revenue = """
+                SELECT 
+                    r.salesMonth AS sales_month,
+                    r.salesYear AS sales_year,
+                    r.monthNum AS month_num,
+                    SUM(r.revenue) AS revenue
+                FROM MonthlySalesRollup r
+                GROUP BY r.salesMonth, r.salesYear, r.monthNum
+            """
+        else:
+            monthly_revenue = """
                 SELECT 
                     DATE_FORMAT(so.orderDate, '%Y-%m') AS sales_month,
                     YEAR(so.orderDate) AS sales_year,
                     MONTH(so.orderDate) AS month_num,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS revenue
+                    SUM(od.lineRevenue) AS revenue
                 FROM SalesOrder so
                 INNER JOIN OrderDetail od ON so.orderId = od.orderId
                 GROUP BY DATE_FORMAT(so.orderDate, '%Y-%m'), YEAR(so.orderDate), MONTH(so.orderDate)
-            )
+            """
+        query = f"""
+            WITH MonthlyRevenue AS ({monthly_revenue})
             SELECT 
                 sales_month,
                 revenue,
@@ -713,6 +1188,7 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query()
     def get_day_of_week_sales(self) -> List[Dict[str, Any]]:
         """
         Query 17: Sales patterns by day of week
@@ -726,12 +1202,12 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
                 DAYNAME(so.orderDate) AS day_name,
                 COUNT(DISTINCT so.orderId) AS total_orders,
                 COUNT(DISTINCT so.custId) AS unique_customers,
-                SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_revenue,
-                AVG(od.unitPrice * od.quantity * (1 - od.discount)) AS avg_order_value,
+                SUM(od.lineRevenue) AS total_revenue,
+                AVG(od.lineRevenue) AS avg_order_value,
                 ROUND(
                     COUNT(DISTINCT so.orderId) * 100.0 / (SELECT COUNT(DISTINCT orderId) FROM SalesOrder), 2
                 ) AS order_percentage,
-                RANK() OVER (ORDER BY SUM(od.unitPrice * od.quantity * (1 - od.discount)) DESC) AS revenue_rank
+                RANK() OVER (ORDER BY SUM(od.lineRevenue) DESC) AS revenue_rank
             FROM SalesOrder so
             INNER JOIN OrderDetail od ON so.orderId = od.orderId
             GROUP BY DAYOFWEEK(so.orderDate), DAYNAME(so.orderDate)
@@ -739,6 +1215,7 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
     
+    @cached_query(max_limit=100)
     def get_discount_impact_analysis(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Query 15: Discount impact and profitability analysis
@@ -756,9 +1233,9 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
                     so.orderDate as order_date,
                     c.companyName AS customer_name,
                     e.firstname AS employee_name,
-                    SUM(od.unitPrice * od.quantity) AS gross_amount,
-                    SUM(od.unitPrice * od.quantity * od.discount) AS total_discount,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS net_amount,
+                    SUM(od.lineGross) AS gross_amount,
+                    SUM(od.lineDiscount) AS total_discount,
+                    SUM(od.lineRevenue) AS net_amount,
                     AVG(od.discount) * 100 AS avg_discount_percent,
                     MAX(od.discount) * 100 AS max_discount_percent,
                     COUNT(od.orderDetailId) AS line_items
@@ -787,11 +1264,12 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
                 END AS discount_category
             FROM OrderDiscountAnalysis
             WHERE total_discount > 0
-            ORDER BY total_discount DESC
+            ORDER BY total_discount DESC, order_id
             LIMIT %s
         """
         return self.execute_query(query, (limit,))
     
+    @cached_query()
     def get_territory_sales_analysis(self) -> List[Dict[str, Any]]:
         """
         Query 14: Territory and region sales analysis
@@ -809,9 +1287,9 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
                 CONCAT(e.firstname, ' ', e.lastname) AS employee_name,
                 COUNT(DISTINCT so.orderId) AS total_orders,
                 COUNT(DISTINCT so.custId) AS unique_customers,
-                SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_revenue,
-                AVG(od.unitPrice * od.quantity * (1 - od.discount)) AS avg_order_value,
-                RANK() OVER (PARTITION BY r.regionId ORDER BY SUM(od.unitPrice * od.quantity * (1 - od.discount)) DESC) AS territory_rank_in_region
+                SUM(od.lineRevenue) AS total_revenue,
+                AVG(od.lineRevenue) AS avg_order_value,
+                RANK() OVER (PARTITION BY r.regionId ORDER BY SUM(od.lineRevenue) DESC) AS territory_rank_in_region
             FROM Region r
             INNER JOIN Territory t ON r.regionId = t.regionId
             INNER JOIN EmployeeTerritory et ON t.territoryId = et.territoryId
@@ -823,6 +1301,7 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
         """
         return self.execute_query(query)
 
+    @cached_query(ttl=60, max_limit=50)
     def get_recent_sales_activity(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get recent sales activity for dashboard
@@ -839,7 +1318,7 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
                 so.orderDate as order_date,
                 c.companyName as customer_name,
                 CONCAT(e.firstname, ' ', e.lastname) as employee_name,
-                SUM(od.unitPrice * od.quantity * (1 - od.discount)) as total_amount,
+                SUM(od.lineRevenue) as total_amount,
                 CASE 
                     WHEN so.shippedDate IS NULL THEN 'Pending'
                     WHEN so.shippedDate > so.requiredDate THEN 'Late'
@@ -850,11 +1329,12 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
             INNER JOIN Employee e ON so.employeeId = e.employeeId
             INNER JOIN OrderDetail od ON so.orderId = od.orderId
             GROUP BY so.orderId, so.orderDate, c.companyName, e.firstname, e.lastname, so.shippedDate, so.requiredDate
-            ORDER BY so.orderDate DESC
+            ORDER BY so.orderDate DESC, so.orderId DESC
             LIMIT %s
         """
         return self.execute_query(query, (limit,))
     
+    @cached_query(ttl=300, stale_ttl=3600)
     def get_business_kpi_dashboard(self) -> List[Dict[str, Any]]:
         """
         Query 20: Comprehensive business KPI dashboard
@@ -862,15 +1342,36 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
         Returns:
             Complete business KPIs
         """
-        query = """
+        if self.use_sales_fact:
+            monthly_trend = """
+                SELECT 
+                    r.salesMonth AS month,
+                    SUM(r.revenue) AS revenue
+                FROM MonthlySalesRollup r
+                GROUP BY r.salesMonth
+                ORDER BY month DESC
+                LIMIT 1
+            """
+        else:
+            monthly_trend = """
+                SELECT 
+                    DATE_FORMAT(so.orderDate, '%Y-%m') AS month,
+                    SUM(od.lineRevenue) AS revenue
+                FROM SalesOrder so
+                INNER JOIN OrderDetail od ON so.orderId = od.orderId
+                GROUP BY DATE_FORMAT(so.orderDate, '%Y-%m')
+                ORDER BY month DESC
+                LIMIT 1
+            """
+        query = f"""
             WITH 
             SalesMetrics AS (
                 SELECT 
                     COUNT(DISTINCT so.orderId) AS total_orders,
                     COUNT(DISTINCT so.custId) AS unique_customers,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS total_revenue,
+                    SUM(od.lineRevenue) AS total_revenue,
                     SUM(so.freight) AS total_freight,
-                    AVG(od.unitPrice * od.quantity * (1 - od.discount)) AS avg_order_value
+                    AVG(od.lineRevenue) AS avg_order_value
                 FROM SalesOrder so
                 INNER JOIN OrderDetail od ON so.orderId = od.orderId
             ),
@@ -900,16 +1401,7 @@ class SalesAnalyticsRepository(BaseAnalyticsRepository):
                 FROM SalesOrder
                 WHERE shippedDate IS NOT NULL
             ),
-            MonthlyTrend AS (
-                SELECT 
-                    DATE_FORMAT(so.orderDate, '%Y-%m') AS month,
-                    SUM(od.unitPrice * od.quantity * (1 - od.discount)) AS revenue
-                FROM SalesOrder so
-                INNER JOIN OrderDetail od ON so.orderId = od.orderId
-                GROUP BY DATE_FORMAT(so.orderDate, '%Y-%m')
-                ORDER BY month DESC
-                LIMIT 1
-            )
+            MonthlyTrend AS ({monthly_trend})
             SELECT 
                 '=== SOTUV KORSATKICHLARI ===' AS section,
                 sm.total_orders AS jami_buyurtmalar,
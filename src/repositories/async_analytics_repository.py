@@ -0,0 +1,103 @@
+"""
+Async Analytics Repository - Non-blocking database access layer
+Reuses the SQL of the sync repositories and awaits it on the aiomysql pool
+so a slow query does not stall the event loop
+"""
+from typing import List, Dict, Any, Awaitable, Callable, Optional
+from src.cache import async_query_flights, cache_refresher
+from src.repositories.analytics_repository import (
+    BaseAnalyticsRepository,
+    ProductAnalyticsRepository,
+    EmployeeAnalyticsRepository,
+    CustomerAnalyticsRepository,
+    CategoryAnalyticsRepository,
+    SupplierAnalyticsRepository,
+    ShippingAnalyticsRepository,
+    SalesAnalyticsRepository,
+    inline_line_amounts
+)
+from src.utils.exceptions import DatabaseException
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseAnalyticsRepository(BaseAnalyticsRepository):
+    """
+    Async base repository
+    Overrides execute_query with a coroutine, so every query method inherited
+    from the sync repositories returns an awaitable instead of rows. The
+    caching of BaseAnalyticsRepository.cached_call is shared: the hooks below
+    await the query before it is cached and refresh stale entries in an
+    event loop task
+    """
+
+    flights = async_query_flights
+
+    @staticmethod
+    async def _then(result: Awaitable, callback: Callable[[Any], Any]) -> Any:
+        """Await the query and pass its result to callback"""
+        return callback(await result)
+
+    @staticmethod
+    async def _resolved(value: Any) -> Any:
+        """Return a cached value as an awaitable"""
+        return value
+
+    @staticmethod
+    def _submit_refresh(key: str, refresh: Callable[[], Awaitable]) -> None:
+        """Start the background recompute of a stale entry as a task"""
+        cache_refresher.submit_async(key, refresh)
+
+    async def execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """
+        Execute a SQL query on the async pool
+
+        Args:
+            query: SQL query string
+            params: Optional query parameters as tuple
+
+        Returns:
+            List of dictionaries representing query results
+
+        Raises:
+            DatabaseException: If query execution fails
+        """
+        if not self.use_line_amounts:
+            query = inline_line_amounts(query)
+        try:
+            result = await self.db.execute_query_async(
+                query, params, readonly=self.use_replica, decode=self.decode
+            )
+            return result if result else []
+        except Exception as e:
+            logger.error(f"Async query execution failed: {str(e)}")
+            raise DatabaseException(f"Database query failed: {str(e)}")
+
+
+class AsyncProductAnalyticsRepository(AsyncBaseAnalyticsRepository, ProductAnalyticsRepository):
+    """Async repository for product-related analytics queries"""
+
+
+class AsyncEmployeeAnalyticsRepository(AsyncBaseAnalyticsRepository, EmployeeAnalyticsRepository):
+    """Async repository for employee-related analytics queries"""
+
+
+class AsyncCustomerAnalyticsRepository(AsyncBaseAnalyticsRepository, CustomerAnalyticsRepository):
+    """Async repository for customer-related analytics queries"""
+
+
+class AsyncCategoryAnalyticsRepository(AsyncBaseAnalyticsRepository, CategoryAnalyticsRepository):
+    """Async repository for category-related analytics queries"""
+
+
+class AsyncSupplierAnalyticsRepository(AsyncBaseAnalyticsRepository, SupplierAnalyticsRepository):
+    """Async repository for supplier-related analytics queries"""
+
+
+class AsyncShippingAnalyticsRepository(AsyncBaseAnalyticsRepository, ShippingAnalyticsRepository):
+    """Async repository for shipping and logistics analytics"""
+
+
+class AsyncSalesAnalyticsRepository(AsyncBaseAnalyticsRepository, SalesAnalyticsRepository):
+    """Async repository for general sales analytics"""
@@ -4,9 +4,15 @@ Following RESTful design principles and Clean Architecture
 Provides 20 analytics endpoints with comprehensive documentation
 """
 from fastapi import APIRouter, Depends, Query, HTTPException, status
-from typing import Optional
+from fastapi.responses import PlainTextResponse
+from typing import Annotated, Optional
+from src.cache import analytics_cache, async_query_flights, cache_refresher, cache_stats, query_flights
+from src.config.converters import DECODE_MODES
 from src.config.database import get_db, DatabaseManager
+from src.config.settings import settings
 from src.models.analytics import AnalyticsResponse
+from src.models import AdminResponse
+from src.routers.auth import require_auth
 from src.services.analytics_service import (
     ProductAnalyticsService,
     EmployeeAnalyticsService,
@@ -17,6 +23,8 @@ from src.services.analytics_service import (
     SalesAnalyticsService,
     AnalyticsServiceFactory
 )
+from src.services.async_analytics_service import AsyncAnalyticsServiceFactory
+from src.services.executor_service import run_db_call
 from src.utils.exceptions import DatabaseException
 import logging
 
@@ -33,6 +41,40 @@ router = APIRouter(
 )
 
 
+# Per-endpoint query deadlines in seconds (paths relative to the router prefix).
+# Endpoints not listed here use DB_QUERY_DEADLINE_SECONDS; DB_QUERY_DEADLINES overrides both
+QUERY_DEADLINES = {
+    "products/market-basket": 20.0,
+    "customers/rfm-segmentation": 20.0,
+    "customers/retention-analysis": 20.0,
+    "health": 3.0,
+}
+
+# Endpoints answered without ETag / 304 or the response cache and left out of
+# the per-endpoint cache statistics (their response is not a function of the data version)
+CACHE_EXCLUDED_ENDPOINTS = (
+    "health",
+    "cache/stats",
+    "cache/entries",
+    "cache/metrics",
+    "cache/invalidate",
+    "cache/flush",
+)
+
+
+def _service_factory():
+    """
+    Pick the service factory for the configured DB runtime mode
+    
+    Returns:
+        AsyncAnalyticsServiceFactory when DB_RUNTIME_MODE=async,
+        otherwise AnalyticsServiceFactory
+    """
+    if settings.use_async_db:
+        return AsyncAnalyticsServiceFactory
+    return AnalyticsServiceFactory
+
+
 # ============================================================================
 # PRODUCT ANALYTICS ENDPOINTS
 # ============================================================================
@@ -69,8 +111,8 @@ async def get_top_revenue_products(
 ):
     """Get top revenue generating products"""
     try:
-        service = AnalyticsServiceFactory.create_product_service(db)
-        return service.get_top_revenue_products(limit)
+        service = _service_factory().create_product_service(db)
+        return await run_db_call(service.get_top_revenue_products, limit)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -116,8 +158,8 @@ async def get_market_basket_analysis(
 ):
     """Get products frequently bought together"""
     try:
-        service = AnalyticsServiceFactory.create_product_service(db)
-        return service.get_market_basket_analysis(min_occurrences, limit)
+        service = _service_factory().create_product_service(db)
+        return await run_db_call(service.get_market_basket_analysis, min_occurrences, limit)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -150,8 +192,8 @@ async def get_market_basket_analysis(
 async def get_abc_analysis(db: DatabaseManager = Depends(get_db)):
     """Get ABC analysis for product classification"""
     try:
-        service = AnalyticsServiceFactory.create_product_service(db)
-        return service.get_abc_analysis()
+        service = _service_factory().create_product_service(db)
+        return await run_db_call(service.get_abc_analysis)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -185,8 +227,8 @@ async def get_abc_analysis(db: DatabaseManager = Depends(get_db)):
 async def get_discontinued_products_analysis(db: DatabaseManager = Depends(get_db)):
     """Get analysis of discontinued products impact"""
     try:
-        service = AnalyticsServiceFactory.create_product_service(db)
-        return service.get_discontinued_products_analysis()
+        service = _service_factory().create_product_service(db)
+        return await run_db_call(service.get_discontinued_products_analysis)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -223,8 +265,8 @@ async def get_discontinued_products_analysis(db: DatabaseManager = Depends(get_d
 async def get_employee_monthly_sales(db: DatabaseManager = Depends(get_db)):
     """Get employee monthly sales performance"""
     try:
-        service = AnalyticsServiceFactory.create_employee_service(db)
-        return service.get_monthly_sales_performance()
+        service = _service_factory().create_employee_service(db)
+        return await run_db_call(service.get_monthly_sales_performance)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -243,9 +285,10 @@ async def get_employee_monthly_sales(db: DatabaseManager = Depends(get_db)):
     Shows employee organizational hierarchy with sales performance.
     
     **Features:**
-    - Recursive hierarchy traversal
+    - Hierarchy traversal (EmployeeClosure table or recursive CTE)
     - Hierarchy path visualization
     - Sales performance by level
+    - Rolled-up team size, orders and revenue per manager subtree
     
     **Use cases:**
     - Organizational structure analysis
@@ -257,8 +300,8 @@ async def get_employee_monthly_sales(db: DatabaseManager = Depends(get_db)):
 async def get_employee_hierarchy(db: DatabaseManager = Depends(get_db)):
     """Get employee hierarchy with sales performance"""
     try:
-        service = AnalyticsServiceFactory.create_employee_service(db)
-        return service.get_hierarchy_with_sales()
+        service = _service_factory().create_employee_service(db)
+        return await run_db_call(service.get_hierarchy_with_sales)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -296,8 +339,8 @@ async def get_employee_hierarchy(db: DatabaseManager = Depends(get_db)):
 async def get_top_customers_by_country(db: DatabaseManager = Depends(get_db)):
     """Get top customer in each country"""
     try:
-        service = AnalyticsServiceFactory.create_customer_service(db)
-        return service.get_top_customers_by_country()
+        service = _service_factory().create_customer_service(db)
+        return await run_db_call(service.get_top_customers_by_country)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -343,8 +386,8 @@ async def get_rfm_segmentation(
 ):
     """Get RFM customer segmentation"""
     try:
-        service = AnalyticsServiceFactory.create_customer_service(db)
-        return service.get_rfm_segmentation(reference_date)
+        service = _service_factory().create_customer_service(db)
+        return await run_db_call(service.get_rfm_segmentation, reference_date)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -384,8 +427,8 @@ async def get_rfm_segmentation(
 async def get_customer_retention_analysis(db: DatabaseManager = Depends(get_db)):
     """Get customer retention analysis"""
     try:
-        service = AnalyticsServiceFactory.create_customer_service(db)
-        return service.get_retention_metrics()
+        service = _service_factory().create_customer_service(db)
+        return await run_db_call(service.get_retention_metrics)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -432,8 +475,8 @@ async def get_customer_discount_behavior(
 ):
     """Get customer discount behavior analysis"""
     try:
-        service = AnalyticsServiceFactory.create_customer_service(db)
-        return service.get_discount_behavior(limit)
+        service = _service_factory().create_customer_service(db)
+        return await run_db_call(service.get_discount_behavior, limit)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -470,8 +513,8 @@ async def get_customer_discount_behavior(
 async def get_category_monthly_growth(db: DatabaseManager = Depends(get_db)):
     """Get category month-over-month growth"""
     try:
-        service = AnalyticsServiceFactory.create_category_service(db)
-        return service.get_monthly_growth()
+        service = _service_factory().create_category_service(db)
+        return await run_db_call(service.get_monthly_growth)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -509,8 +552,8 @@ async def get_category_monthly_growth(db: DatabaseManager = Depends(get_db)):
 async def get_country_category_breakdown(db: DatabaseManager = Depends(get_db)):
     """Get sales breakdown by country and category"""
     try:
-        service = AnalyticsServiceFactory.create_category_service(db)
-        return service.get_country_category_breakdown()
+        service = _service_factory().create_category_service(db)
+        return await run_db_call(service.get_country_category_breakdown)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -555,8 +598,8 @@ async def get_supplier_performance(
 ):
     """Get supplier performance and lead time analysis"""
     try:
-        service = AnalyticsServiceFactory.create_supplier_service(db)
-        return service.get_performance_metrics(min_orders)
+        service = _service_factory().create_supplier_service(db)
+        return await run_db_call(service.get_performance_metrics, min_orders)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -594,8 +637,8 @@ async def get_supplier_performance(
 async def get_supplier_risk_analysis(db: DatabaseManager = Depends(get_db)):
     """Get supplier risk and diversification analysis"""
     try:
-        service = AnalyticsServiceFactory.create_supplier_service(db)
-        return service.get_risk_assessment()
+        service = _service_factory().create_supplier_service(db)
+        return await run_db_call(service.get_risk_assessment)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -634,8 +677,8 @@ async def get_supplier_risk_analysis(db: DatabaseManager = Depends(get_db)):
 async def get_shipper_efficiency(db: DatabaseManager = Depends(get_db)):
     """Get shipper performance and cost analysis"""
     try:
-        service = AnalyticsServiceFactory.create_shipping_service(db)
-        return service.get_shipper_efficiency()
+        service = _service_factory().create_shipping_service(db)
+        return await run_db_call(service.get_shipper_efficiency)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -674,8 +717,8 @@ async def get_shipper_efficiency(db: DatabaseManager = Depends(get_db)):
 async def get_yoy_growth(db: DatabaseManager = Depends(get_db)):
     """Get year-over-year growth and moving averages"""
     try:
-        service = AnalyticsServiceFactory.create_sales_service(db)
-        return service.get_yoy_growth_trends()
+        service = _service_factory().create_sales_service(db)
+        return await run_db_call(service.get_yoy_growth_trends)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -709,8 +752,8 @@ async def get_yoy_growth(db: DatabaseManager = Depends(get_db)):
 async def get_day_of_week_patterns(db: DatabaseManager = Depends(get_db)):
     """Get sales patterns by day of week"""
     try:
-        service = AnalyticsServiceFactory.create_sales_service(db)
-        return service.get_day_of_week_patterns()
+        service = _service_factory().create_sales_service(db)
+        return await run_db_call(service.get_day_of_week_patterns)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -757,8 +800,8 @@ async def get_discount_impact(
 ):
     """Get discount impact on profitability"""
     try:
-        service = AnalyticsServiceFactory.create_sales_service(db)
-        return service.get_discount_impact(limit)
+        service = _service_factory().create_sales_service(db)
+        return await run_db_call(service.get_discount_impact, limit)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -792,8 +835,8 @@ async def get_discount_impact(
 async def get_territory_performance(db: DatabaseManager = Depends(get_db)):
     """Get territory and region sales performance"""
     try:
-        service = AnalyticsServiceFactory.create_sales_service(db)
-        return service.get_territory_performance()
+        service = _service_factory().create_sales_service(db)
+        return await run_db_call(service.get_territory_performance)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -824,8 +867,8 @@ async def get_recent_activity(
 ):
     """Get recent sales activity"""
     try:
-        service = AnalyticsServiceFactory.create_sales_service(db)
-        return service.get_recent_activity(limit)
+        service = _service_factory().create_sales_service(db)
+        return await run_db_call(service.get_recent_activity, limit)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -879,8 +922,8 @@ async def get_recent_activity(
 async def get_business_kpis(db: DatabaseManager = Depends(get_db)):
     """Get comprehensive business KPI dashboard"""
     try:
-        service = AnalyticsServiceFactory.create_sales_service(db)
-        return service.get_business_kpis()
+        service = _service_factory().create_sales_service(db)
+        return await run_db_call(service.get_business_kpis)
     except DatabaseException as e:
         logger.error(f"Database error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -889,6 +932,126 @@ async def get_business_kpis(db: DatabaseManager = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+# ============================================================================
+# CACHE ADMINISTRATION ENDPOINTS (admin session required)
+# ============================================================================
+
+@router.get(
+    "/cache/stats",
+    summary="Analytics Cache Statistics",
+    description="""
+    Cache backend usage and hit/miss ratios per repository method and per
+    endpoint, plus single-flight and background refresh counters.
+    Counters are per worker process; with ANALYTICS_CACHE_BACKEND=sqlite the
+    entry counts and sizes cover every worker on the machine.
+    """
+)
+async def get_cache_stats(
+    current_admin: Annotated[AdminResponse, Depends(require_auth)],
+    db: DatabaseManager = Depends(get_db)
+):
+    """Get analytics cache statistics"""
+    return {
+        "backend": analytics_cache.stats(),
+        **cache_stats.snapshot(),
+        "single_flight": (async_query_flights if settings.use_async_db else query_flights).stats(),
+        "refresh": cache_refresher.stats(),
+        "data_version": db.data_version_stats(),
+    }
+
+
+@router.get(
+    "/cache/entries",
+    summary="Analytics Cache Entries",
+    description="Cached entries (largest first) with size, age, remaining TTL and hit count"
+)
+async def get_cache_entries(
+    current_admin: Annotated[AdminResponse, Depends(require_auth)],
+    prefix: str = Query(default="", description="Only keys starting with this prefix"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Number of entries to return")
+):
+    """List analytics cache entries"""
+    return {"entries": analytics_cache.entries(prefix, limit)}
+
+
+@router.get(
+    "/cache/metrics",
+    summary="Analytics Cache Metrics",
+    description="Cache statistics in the Prometheus text exposition format",
+    response_class=PlainTextResponse
+)
+async def get_cache_metrics(current_admin: Annotated[AdminResponse, Depends(require_auth)]):
+    """Export analytics cache metrics"""
+    return PlainTextResponse(
+        cache_stats.prometheus(analytics_cache.stats()),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.post(
+    "/cache/invalidate",
+    summary="Invalidate Analytics Cache Entries",
+    description="""
+    Targeted invalidation, at least one of:
+    - **method**: results of a repository method (e.g. get_rfm_analysis) for
+      the current data version, together with all cached response bodies
+    - **endpoint**: cached response bodies of an endpoint (e.g.
+      products/top-revenue); the results behind them stay cached
+    - **prefix**: every key starting with the prefix
+    """
+)
+async def invalidate_cache(
+    current_admin: Annotated[AdminResponse, Depends(require_auth)],
+    method: Optional[str] = Query(default=None, description="Repository method name"),
+    endpoint: Optional[str] = Query(default=None, description="Endpoint path after /api/v1/analytics/"),
+    prefix: Optional[str] = Query(default=None, min_length=1, description="Raw cache key prefix"),
+    db: DatabaseManager = Depends(get_db)
+):
+    """Invalidate selected analytics cache entries"""
+    if not (method or endpoint or prefix):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One of method, endpoint or prefix is required"
+        )
+    
+    version = db.data_version or "unversioned"
+    invalidated = 0
+    if method:
+        for decode in DECODE_MODES:
+            base = f"analytics:{decode}:{version}:{method}"
+            invalidated += analytics_cache.delete(base) + analytics_cache.invalidate(f"{base}:")
+        invalidated += analytics_cache.invalidate("analytics:response:")
+    if endpoint:
+        invalidated += analytics_cache.invalidate(
+            f"analytics:response:{version}:{settings.db_result_decode}:{endpoint.strip('/')}?"
+        )
+    if prefix:
+        invalidated += analytics_cache.invalidate(prefix)
+    
+    logger.info(
+        f"Cache invalidated by {current_admin.username}: "
+        f"method={method} endpoint={endpoint} prefix={prefix} ({invalidated} entries)"
+    )
+    return {"invalidated": invalidated}
+
+
+@router.post(
+    "/cache/flush",
+    summary="Flush Analytics Cache",
+    description="Remove every analytics cache entry (all workers with the sqlite backend)"
+)
+async def flush_cache(
+    current_admin: Annotated[AdminResponse, Depends(require_auth)],
+    reset_stats: bool = Query(default=False, description="Also reset hit/miss counters of this worker")
+):
+    """Flush the analytics cache"""
+    flushed = analytics_cache.clear()
+    if reset_stats:
+        cache_stats.reset()
+    logger.info(f"Cache flushed by {current_admin.username} ({flushed} entries)")
+    return {"flushed": flushed}
+
+
 # Health check endpoint
 @router.get(
     "/health",
@@ -899,7 +1062,10 @@ async def health_check(db: DatabaseManager = Depends(get_db)):
     """Health check endpoint"""
     try:
         # Try to execute a simple query
-        db.execute_query("SELECT 1")
+        if settings.use_async_db:
+            await db.execute_query_async("SELECT 1")
+        else:
+            await run_db_call(db.execute_query, "SELECT 1")
         return {
             "status": "healthy",
             "service": "analytics-api",
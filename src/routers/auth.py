@@ -22,6 +22,7 @@ from src.models import (
 from src.services import AuthService
 from src.services.auth_service import auth_service
 from src.services.jwt_service import jwt_service
+from src.services.executor_service import run_db_call
 from src.config import settings
 
 logger = logging.getLogger(__name__)
@@ -109,7 +110,7 @@ async def get_current_admin_from_cookie(
     try:
         payload = jwt_service.verify_token(access_token, expected_type="access")
         admin_id = int(payload["sub"])
-        admin = auth.get_admin_by_id(admin_id)
+        admin = await run_db_call(auth.get_admin_by_id, admin_id)
         
         if admin:
             return AdminResponse(
@@ -213,7 +214,7 @@ async def verify_2fa(
     """
     try:
         logger.info("2FA tasdiqlash so'rovi")
-        result = auth.verify_2fa(request.temp_token, request.otp_code)
+        result = await run_db_call(auth.verify_2fa, request.temp_token, request.otp_code)
         
         # Cookie'ga token saqlash
         set_auth_cookies(response, result.access_token, result.refresh_token)
@@ -265,7 +266,7 @@ async def refresh_token(
             raise ValueError("Refresh token topilmadi")
         
         logger.info("Token yangilash so'rovi")
-        result = auth.refresh_access_token(refresh_token)
+        result = await run_db_call(auth.refresh_access_token, refresh_token)
         
         # Yangi access token cookie'ga saqlash
         response.set_cookie(
@@ -378,7 +379,7 @@ async def create_admin(
     """
     try:
         logger.info(f"Yangi admin yaratish: {admin_data.username} (yaratuvchi: {current_admin.username})")
-        new_admin = auth.create_admin(admin_data)
+        new_admin = await run_db_call(auth.create_admin, admin_data)
         return new_admin
     
     except ValueError as e:
@@ -411,7 +412,7 @@ async def get_all_admins(
     """
     try:
         logger.info(f"Barcha adminlarni olish (so'rovchi: {current_admin.username})")
-        admins = auth.get_all_admins()
+        admins = await run_db_call(auth.get_all_admins)
         return admins
     
     except Exception as e:
@@ -442,7 +443,7 @@ async def delete_admin(
             raise ValueError("O'zingizni o'chira olmaysiz")
         
         logger.info(f"Admin o'chirish: {admin_id} (o'chiruvchi: {current_admin.username})")
-        auth.delete_admin(admin_id)
+        await run_db_call(auth.delete_admin, admin_id)
         
         return {
             "message": "Admin muvaffaqiyatli o'chirildi",
@@ -0,0 +1,152 @@
+"""
+Async Analytics Service Layer
+Async counterparts of the analytics services - the same methods, messages
+and response format, but repository calls are awaited on the aiomysql pool
+"""
+from typing import Any, Awaitable, Callable, Dict, List
+from src.config.database import DatabaseManager
+from src.repositories.async_analytics_repository import (
+    AsyncProductAnalyticsRepository,
+    AsyncEmployeeAnalyticsRepository,
+    AsyncCustomerAnalyticsRepository,
+    AsyncCategoryAnalyticsRepository,
+    AsyncSupplierAnalyticsRepository,
+    AsyncShippingAnalyticsRepository,
+    AsyncSalesAnalyticsRepository
+)
+from src.services.analytics_service import (
+    BaseAnalyticsService,
+    ProductAnalyticsService,
+    EmployeeAnalyticsService,
+    CustomerAnalyticsService,
+    CategoryAnalyticsService,
+    SupplierAnalyticsService,
+    ShippingAnalyticsService,
+    SalesAnalyticsService
+)
+from src.models.analytics import AnalyticsResponse
+import functools
+import inspect
+
+
+def _awaited(method: Callable) -> Callable:
+    """Expose a sync service method as a coroutine function"""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await method(self, *args, **kwargs)
+    return wrapper
+
+
+class AsyncAnalyticsService(BaseAnalyticsService):
+    """
+    Base async service
+    The query methods are inherited from the sync services: the async
+    repository returns awaitables and format_response awaits them. Every
+    get_* method is exposed as a coroutine function, so run_db_call awaits
+    it on the event loop instead of sending it to the DB executor
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, method in inspect.getmembers(cls, inspect.isfunction):
+            if name.startswith("get_") and not inspect.iscoroutinefunction(method):
+                setattr(cls, name, _awaited(method))
+
+    async def format_response(
+        self,
+        data: Awaitable[List[Dict[str, Any]]],
+        message: str = "Data retrieved successfully"
+    ) -> AnalyticsResponse:
+        """Await the repository result and format it"""
+        return super().format_response(await data, message)
+
+
+class AsyncProductAnalyticsService(AsyncAnalyticsService, ProductAnalyticsService):
+    """Async service for product-related analytics"""
+
+    def __init__(self, db: DatabaseManager):
+        self.repository = AsyncProductAnalyticsRepository(db)
+
+
+class AsyncEmployeeAnalyticsService(AsyncAnalyticsService, EmployeeAnalyticsService):
+    """Async service for employee-related analytics"""
+
+    def __init__(self, db: DatabaseManager):
+        self.repository = AsyncEmployeeAnalyticsRepository(db)
+
+
+class AsyncCustomerAnalyticsService(AsyncAnalyticsService, CustomerAnalyticsService):
+    """Async service for customer-related analytics"""
+
+    def __init__(self, db: DatabaseManager):
+        self.repository = AsyncCustomerAnalyticsRepository(db)
+
+
+class AsyncCategoryAnalyticsService(AsyncAnalyticsService, CategoryAnalyticsService):
+    """Async service for category-related analytics"""
+
+    def __init__(self, db: DatabaseManager):
+        self.repository = AsyncCategoryAnalyticsRepository(db)
+
+
+class AsyncSupplierAnalyticsService(AsyncAnalyticsService, SupplierAnalyticsService):
+    """Async service for supplier-related analytics"""
+
+    def __init__(self, db: DatabaseManager):
+        self.repository = AsyncSupplierAnalyticsRepository(db)
+
+
+class AsyncShippingAnalyticsService(AsyncAnalyticsService, ShippingAnalyticsService):
+    """Async service for shipping and logistics analytics"""
+
+    def __init__(self, db: DatabaseManager):
+        self.repository = AsyncShippingAnalyticsRepository(db)
+
+
+class AsyncSalesAnalyticsService(AsyncAnalyticsService, SalesAnalyticsService):
+    """Async service for general sales analytics"""
+
+    def __init__(self, db: DatabaseManager):
+        self.repository = AsyncSalesAnalyticsRepository(db)
+
+
+class AsyncAnalyticsServiceFactory:
+    """
+    Factory class for creating async analytics services
+    Mirrors AnalyticsServiceFactory so routers can switch between them
+    """
+
+    @staticmethod
+    def create_product_service(db: DatabaseManager) -> AsyncProductAnalyticsService:
+        """Create async product analytics service"""
+        return AsyncProductAnalyticsService(db)
+
+    @staticmethod
+    def create_employee_service(db: DatabaseManager) -> AsyncEmployeeAnalyticsService:
+        """Create async employee analytics service"""
+        return AsyncEmployeeAnalyticsService(db)
+
+    @staticmethod
+    def create_customer_service(db: DatabaseManager) -> AsyncCustomerAnalyticsService:
+        """Create async customer analytics service"""
+        return AsyncCustomerAnalyticsService(db)
+
+    @staticmethod
+    def create_category_service(db: DatabaseManager) -> AsyncCategoryAnalyticsService:
+        """Create async category analytics service"""
+        return AsyncCategoryAnalyticsService(db)
+
+    @staticmethod
+    def create_supplier_service(db: DatabaseManager) -> AsyncSupplierAnalyticsService:
+        """Create async supplier analytics service"""
+        return AsyncSupplierAnalyticsService(db)
+
+    @staticmethod
+    def create_shipping_service(db: DatabaseManager) -> AsyncShippingAnalyticsService:
+        """Create async shipping analytics service"""
+        return AsyncShippingAnalyticsService(db)
+
+    @staticmethod
+    def create_sales_service(db: DatabaseManager) -> AsyncSalesAnalyticsService:
+        """Create async sales analytics service"""
+        return AsyncSalesAnalyticsService(db)
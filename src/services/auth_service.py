@@ -11,6 +11,7 @@ from src.models import AdminInDB, AdminResponse, TokenResponse, LoginResponse
 from src.services.hashing_service import hashing_service, HashingService
 from src.services.jwt_service import jwt_service, JWTService
 from src.services.tfa_service import tfa_service, TFAService
+from src.services.executor_service import run_db_call
 
 logger = logging.getLogger(__name__)
 
@@ -118,8 +119,8 @@ class AuthService:
         """
         logger.info(f"Login urinishi: username={username}")
         
-        # Adminni topish
-        admin = self.get_admin_by_username(username)
+        # Adminni topish (DB so'rovi event loop'dan tashqarida bajariladi)
+        admin = await run_db_call(self.get_admin_by_username, username)
         
         if not admin:
             logger.warning(f"Admin topilmadi: username={username}")
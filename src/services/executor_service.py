@@ -0,0 +1,154 @@
+"""
+Bloklovchi database chaqiruvlari uchun cheklangan thread pool.
+Sinxron repository/service chaqiruvlarini event loop'dan tashqarida bajaradi
+va navbat chuqurligi hamda kutish vaqtini hisoblab boradi.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseExecutor:
+    """
+    Database ishlari uchun ajratilgan executor.
+    Worker'lar soni DB pool hajmiga teng, shuning uchun navbatdagi so'rovlar
+    event loop'ni emas, bo'sh DB ulanishini kutayotgan bo'ladi.
+    """
+
+    # Shu chegaradan uzoq kutgan chaqiruvlar log qilinadi
+    SLOW_WAIT_SECONDS = 0.5
+
+    def __init__(self, max_workers: int = None) -> None:
+        """
+        DatabaseExecutor ni ishga tushirish.
+
+        Args:
+            max_workers: Worker thread'lar soni (default: DB_POOL_SIZE)
+        """
+        self._max_workers = max_workers or settings.db_pool_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """ThreadPoolExecutor ni birinchi chaqiruvda yaratish."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._max_workers,
+                        thread_name_prefix="db-executor",
+                    )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Bloklovchi funksiyani executor'da bajarish va natijani kutish.
+        Chaqiruvchining contextvars holati worker thread'ga ko'chiriladi.
+
+        Args:
+            func: Bajariladigan sinxron funksiya
+            *args: Funksiya argumentlari
+            **kwargs: Funksiya keyword argumentlari
+
+        Returns:
+            Funksiya natijasi
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        submitted_at = time.perf_counter()
+
+        with self._lock:
+            self._queued += 1
+
+        def task() -> Any:
+            wait = time.perf_counter() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait += wait
+                self._last_wait = wait
+                self._max_wait = max(self._max_wait, wait)
+
+            if wait >= self.SLOW_WAIT_SECONDS:
+                logger.warning(
+                    f"DB executor navbati: {getattr(func, '__name__', func)} "
+                    f"{wait * 1000:.0f} ms kutdi"
+                )
+
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return await loop.run_in_executor(self._get_executor(), task)
+
+    def stats(self) -> dict:
+        """
+        Executor holati.
+
+        Returns:
+            dict: Navbat chuqurligi, band worker'lar va kutish vaqtlari (ms)
+        """
+        with self._lock:
+            avg_wait = self._total_wait / self._completed if self._completed else 0.0
+            return {
+                "max_workers": self._max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "avg_wait_ms": round(avg_wait * 1000, 2),
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+                "last_wait_ms": round(self._last_wait * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        """Executor'ni to'xtatish (ilova to'xtaganda chaqiriladi)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("DB executor to'xtatildi")
+
+
+async def run_db_call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    DB bilan ishlovchi chaqiruvni DB_RUNTIME_MODE bo'yicha bajarish.
+
+    Coroutine funksiyalar to'g'ridan-to'g'ri await qilinadi. Sinxron
+    funksiyalar sync rejimda joyida, qolgan rejimlarda db_executor'da bajariladi.
+
+    Args:
+        func: Service yoki repository metodi
+        *args: Metod argumentlari
+        **kwargs: Metod keyword argumentlari
+
+    Returns:
+        Metod natijasi
+    """
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    if settings.use_db_executor:
+        return await db_executor.run(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+# Global executor instance
+db_executor = DatabaseExecutor()
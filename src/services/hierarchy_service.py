@@ -0,0 +1,181 @@
+"""
+Xodimlar ierarxiyasining closure jadvalini (EmployeeClosure) yangilash.
+Jadval SQLScripts/07_employee_closure.sql da yaratiladi. Trigger'siz
+ishlash uchun servis Employee jadvalining arzon imzosini (employeeId, mgrId
+va ismlar bo'yicha CRC32 yig'indisi) ClosureRefreshState bilan solishtiradi;
+imzo o'zgarsa (rahbar almashsa, xodim qo'shilsa yoki ismi o'zgarsa) closure
+bitta tranzaksiyada to'liq qayta quriladi.
+
+Holat qatori FOR UPDATE bilan qulflanadi - bir nechta worker bir vaqtda
+tekshirsa ham jadval faqat bir marta quriladi, o'quvchilar esa eski yoki
+yangi closure'ni to'liq ko'radi.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from src.config import settings
+from src.config.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+CLOSURE_NAME = "EmployeeClosure"
+
+# Closure'ga ta'sir qiladigan ustunlar imzosi (mgrId NULL - ildiz)
+_SIGNATURE_QUERY = """
+    SELECT COALESCE(SUM(CRC32(CONCAT_WS('|', employeeId, COALESCE(mgrId, 0), firstname, lastname))), 0)
+        + COUNT(*) AS signature
+    FROM Employee
+"""
+
+# Har bir xodimdan boshlab barcha bo'ysunuvchilarga tushish; depth chegarasi
+# mgrId'dagi sikl closure'ni cheksiz o'stirib yubormasligi uchun
+_REBUILD_QUERY = """
+    INSERT INTO EmployeeClosure (ancestorId, descendantId, depth, path)
+    WITH RECURSIVE Closure AS (
+        SELECT 
+            employeeId AS ancestorId,
+            employeeId AS descendantId,
+            0 AS depth,
+            CAST(CONCAT(firstname, ' ', lastname) AS CHAR(500)) AS path
+        FROM Employee
+        
+        UNION ALL
+        
+        SELECT 
+            c.ancestorId,
+            e.employeeId,
+            c.depth + 1,
+            CONCAT(c.path, ' -> ', e.firstname, ' ', e.lastname)
+        FROM Closure c
+        INNER JOIN Employee e ON e.mgrId = c.descendantId
+        WHERE c.depth < 100
+    )
+    SELECT ancestorId, descendantId, MIN(depth), MIN(path)
+    FROM Closure
+    GROUP BY ancestorId, descendantId
+"""
+
+
+class EmployeeClosureRefresher:
+    """
+    EmployeeClosure jadvalini Employee o'zgarganda qayta quruvchi servis.
+    Holatlar: disabled (ANALYTICS_USE_EMPLOYEE_CLOSURE o'chirilgan), idle, ok, error.
+    """
+
+    def __init__(self, closure_name: str = CLOSURE_NAME) -> None:
+        """
+        EmployeeClosureRefresher ni yaratish.
+
+        Args:
+            closure_name: ClosureRefreshState dagi yozuv nomi
+        """
+        self.closure_name = closure_name
+        self.status = "idle" if settings.analytics_use_employee_closure else "disabled"
+        self.signature: Optional[int] = None
+        self.rows: Optional[int] = None
+        self.rebuilds = 0
+        self.last_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.rebuilt_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def refresh(self, db: DatabaseManager, force: bool = False) -> bool:
+        """
+        Employee imzosi o'zgargan bo'lsa closure'ni qayta qurish (primary'da, bitta tranzaksiyada).
+
+        Args:
+            db: DatabaseManager instance
+            force: Imzo o'zgarmagan bo'lsa ham qayta qurish
+
+        Returns:
+            bool: Closure qayta qurildimi
+        """
+        started = time.perf_counter()
+        rebuilt = False
+        with db.cursor() as cursor:
+            cursor.execute(
+                "SELECT signature FROM ClosureRefreshState WHERE closureName = %s FOR UPDATE",
+                (self.closure_name,),
+            )
+            row = cursor.fetchone()
+            stored = row["signature"] if row else None
+
+            cursor.execute(_SIGNATURE_QUERY)
+            signature = int(cursor.fetchone()["signature"])
+
+            if force or signature != stored:
+                cursor.execute(f"DELETE FROM {self.closure_name}")
+                cursor.execute(_REBUILD_QUERY)
+                self.rows = cursor.rowcount
+                cursor.execute(
+                    "INSERT INTO ClosureRefreshState (closureName, signature, refreshedAt) "
+                    "VALUES (%s, %s, NOW()) "
+                    "ON DUPLICATE KEY UPDATE signature = VALUES(signature), refreshedAt = VALUES(refreshedAt)",
+                    (self.closure_name, signature),
+                )
+                rebuilt = True
+
+        self.signature = signature
+        self.checked_at = time.time()
+        self.status = "ok"
+        self.error = None
+        if rebuilt:
+            self.rebuilds += 1
+            self.rebuilt_at = self.checked_at
+            self.last_seconds = round(time.perf_counter() - started, 3)
+            logger.info(
+                f"{self.closure_name} qayta qurildi: {self.rows} ta juftlik, {self.last_seconds:.3f} s"
+            )
+        return rebuilt
+
+    async def watch(self, db: DatabaseManager, interval: float) -> None:
+        """
+        Employee imzosini interval bo'yicha tekshirib turish.
+        Lifespan'da task sifatida ishga tushiriladi; xatolik bo'lsa keyingi
+        intervalda qayta uriniladi (endpoint esa oxirgi qurilgan closure'ni o'qiydi).
+
+        Args:
+            db: DatabaseManager instance
+            interval: Tekshiruvlar orasidagi pauza (soniya, 0 - faqat bir marta)
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh, db)
+            except Exception as e:
+                self.status = "error"
+                self.error = str(e)
+                logger.warning(f"{self.closure_name} ni yangilab bo'lmadi: {e}")
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        """
+        Closure jadvali holati.
+
+        Returns:
+            dict: Holat, Employee imzosi, juftliklar soni, qayta qurishlar va vaqtlar
+        """
+        checked_ago = None
+        if self.checked_at is not None:
+            checked_ago = round(time.time() - self.checked_at, 1)
+        rebuilt_ago = None
+        if self.rebuilt_at is not None:
+            rebuilt_ago = round(time.time() - self.rebuilt_at, 1)
+        return {
+            "status": self.status,
+            "signature": self.signature,
+            "rows": self.rows,
+            "rebuilds": self.rebuilds,
+            "last_seconds": self.last_seconds,
+            "checked_seconds_ago": checked_ago,
+            "rebuilt_seconds_ago": rebuilt_ago,
+            "error": self.error,
+        }
+
+
+# Global employee closure refresher instance
+employee_closure_refresher = EmployeeClosureRefresher()
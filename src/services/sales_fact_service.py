@@ -0,0 +1,304 @@
+"""
+Kunlik sotuv fakt jadvalini (DailySalesFact) va oylik rollup'ni
+(MonthlySalesRollup) inkremental yangilash. Jadvallar SQLScripts/04_daily_sales_fact.sql
+va 06_monthly_sales_rollup.sql da yaratiladi.
+
+Manba jadvallar versiyasi (data_version watermark'i) o'zgarganda oxirgi
+davr qayta agregatsiya qilinadi: cutoff - faktdagi oxirgi kundan
+SALES_FACT_WINDOW_DAYS oldingi va lastOrderId'dan keyingi yangi buyurtmalarning
+eng erta orderDate'i orasidagi kichigi (oy boshiga tushiriladi). Ikkala
+jadvalning cutoff'dan keyingi qatorlari o'chirilib, shu davrdagi barcha
+buyurtmalardan qayta yoziladi - kechikib commit qilingan buyurtmalar va
+keyin qo'shilgan OrderDetail qatorlari ham oyna ichida hisobga olinadi.
+
+Yangilash bitta tranzaksiyada bajariladi: holat qatori FOR UPDATE bilan
+qulflanadi, shuning uchun bir nechta worker bir vaqtda yangilasa ham
+davr bir marta qayta yoziladi. Har bir yangilash FactRefreshState.revision'ni
+oshiradi - u analitika data versiyasiga kiradi.
+
+Eslatma: oynadan eski buyurtmalardagi o'zgarishlar va Product/Customer
+o'lchovlarini joyida UPDATE qilish faktga tushmaydi - bunday
+o'zgarishlardan keyin rebuild() chaqiriladi.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+from src.config import settings
+from src.config.data_version import build_watermark_query, compute_data_version
+from src.config.database import DatabaseManager
+from src.repositories.analytics_repository import inline_line_amounts
+
+logger = logging.getLogger(__name__)
+
+FACT_NAME = "DailySalesFact"
+
+# To'liq qayta qurishdagi cutoff (MySQL DATE oralig'ining boshi)
+FULL_REBUILD_FROM = date(1000, 1, 1)
+
+# Manba jadvallar versiyasi (fakt/closure holatisiz) - o'zgarmagan bo'lsa yangilash o'tkazib yuboriladi
+SOURCE_VERSION_QUERY = build_watermark_query()
+
+# Bir xil cutoff bilan qayta yoziladigan jadvallar: jadval -> (ustun -> ifoda, qo'shimcha join'lar).
+# Query parametrlar bilan bajariladi - ifodalarda '%' belgisi ishlatilmaydi
+SALES_FACT_TABLES: Dict[str, Tuple[Dict[str, str], str]] = {
+    "DailySalesFact": (
+        {
+            "salesDate": "DATE(so.orderDate)",
+            "productId": "od.productId",
+            "custId": "so.custId",
+            "employeeId": "COALESCE(so.employeeId, 0)",
+            "shipperId": "so.shipperId",
+        },
+        "",
+    ),
+    "MonthlySalesRollup": (
+        {
+            "salesMonth": "CONCAT(YEAR(so.orderDate), '-', LPAD(MONTH(so.orderDate), 2, '0'))",
+            "salesYear": "YEAR(so.orderDate)",
+            "monthNum": "MONTH(so.orderDate)",
+            "categoryId": "COALESCE(p.categoryId, 0)",
+            "productId": "od.productId",
+            "employeeId": "COALESCE(so.employeeId, 0)",
+            "country": "COALESCE(c.country, '')",
+        },
+        """
+    INNER JOIN Product p ON p.productId = od.productId
+    LEFT JOIN Customer c ON c.custId = so.custId""",
+    ),
+}
+
+# Jadvallarning davr ustuni va cutoff sanasining shu ustundagi ko'rinishi (strftime)
+PERIOD_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "DailySalesFact": ("salesDate", "%Y-%m-%d"),
+    "MonthlySalesRollup": ("salesMonth", "%Y-%m"),
+}
+
+# Barcha jadvallarda bir xil o'lchovlar; orders - buyurtma eng kichik productId'li
+# qatorida bir marta sanaladi
+_MEASURES = {
+    "revenue": "SUM(od.lineRevenue)",
+    "gross": "SUM(od.lineGross)",
+    "discountAmount": "SUM(od.lineDiscount)",
+    "quantity": "SUM(od.quantity)",
+    "lineCount": "COUNT(*)",
+    "productOrders": "COUNT(DISTINCT od.orderId)",
+    "orders": "COUNT(DISTINCT CASE WHEN od.productId = first_line.productId THEN od.orderId END)",
+}
+
+
+def build_refresh_query(table: str) -> str:
+    """
+    cutoff'dan keyingi buyurtmalarni jadval kataklari bo'yicha qayta agregatsiya qiluvchi query.
+
+    Args:
+        table: SALES_FACT_TABLES dagi jadval nomi
+
+    Returns:
+        str: INSERT ... SELECT (parametrlar: cutoff sanasi, ikki marta); jadvalning
+            cutoff'dan keyingi qatorlari oldin o'chirilgan bo'lishi kerak
+    """
+    dimensions, joins = SALES_FACT_TABLES[table]
+    columns = ",\n        ".join(
+        f"{expression} AS {column}" for column, expression in {**dimensions, **_MEASURES}.items()
+    )
+    return f"""
+    INSERT INTO {table} ({", ".join([*dimensions, *_MEASURES])})
+    SELECT
+        {columns}
+    FROM SalesOrder so
+    INNER JOIN OrderDetail od ON so.orderId = od.orderId
+    INNER JOIN (
+        SELECT d.orderId, MIN(d.productId) AS productId
+        FROM OrderDetail d
+        INNER JOIN SalesOrder o ON o.orderId = d.orderId
+        WHERE o.orderDate >= %s
+        GROUP BY d.orderId
+    ) first_line ON first_line.orderId = so.orderId{joins}
+    WHERE so.orderDate >= %s
+    GROUP BY {", ".join(dimensions.values())}
+"""
+
+
+REFRESH_QUERIES: Dict[str, str] = {table: build_refresh_query(table) for table in SALES_FACT_TABLES}
+
+
+class SalesFactRefresher:
+    """
+    DailySalesFact va MonthlySalesRollup jadvallarini yangilovchi servis.
+    Holatlar: disabled (ANALYTICS_USE_SALES_FACT o'chirilgan), idle, ok, error.
+    """
+
+    def __init__(self, fact_name: str = FACT_NAME, window_days: Optional[int] = None) -> None:
+        """
+        SalesFactRefresher ni yaratish.
+
+        Args:
+            fact_name: FactRefreshState dagi yozuv nomi (barcha SALES_FACT_TABLES uchun umumiy)
+            window_days: Har bir yangilashda qayta yoziladigan oxirgi kunlar
+                (None - SALES_FACT_WINDOW_DAYS)
+        """
+        self.fact_name = fact_name
+        self.window_days = settings.sales_fact_window_days if window_days is None else window_days
+        self.status = "idle" if settings.analytics_use_sales_fact else "disabled"
+        self.last_order_id: Optional[int] = None
+        self.revision: Optional[int] = None
+        self.last_cutoff: Optional[str] = None
+        self.last_affected_rows: Dict[str, int] = {}
+        self.last_seconds: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        self.error: Optional[str] = None
+
+    def _cutoff(self, cursor, last_order_id: int) -> date:
+        """
+        Qayta yoziladigan davr boshi (oy boshi).
+        Fakt bo'sh bo'lsa - to'liq qurish (FULL_REBUILD_FROM).
+        """
+        cursor.execute("SELECT MAX(salesDate) AS max_date FROM DailySalesFact")
+        max_date = cursor.fetchone()["max_date"]
+        if max_date is None:
+            return FULL_REBUILD_FROM
+
+        cutoff = max_date - timedelta(days=max(self.window_days, 0))
+        cursor.execute(
+            "SELECT MIN(orderDate) AS new_from FROM SalesOrder WHERE orderId > %s",
+            (last_order_id,),
+        )
+        new_from = cursor.fetchone()["new_from"]
+        if new_from is not None:
+            cutoff = min(cutoff, new_from.date() if hasattr(new_from, "date") else new_from)
+        return max(cutoff.replace(day=1), FULL_REBUILD_FROM)
+
+    def refresh(self, db: DatabaseManager, full: bool = False) -> int:
+        """
+        Manba jadvallar o'zgargan bo'lsa fakt va rollup'ning oxirgi davrini qayta yozish
+        (primary'da, bitta tranzaksiyada).
+
+        Args:
+            db: DatabaseManager instance
+            full: Versiyadan qat'i nazar jadvallarni boshidan qurish
+
+        Returns:
+            int: Yozilgan qatorlar soni; manba o'zgarmagan bo'lsa 0
+        """
+        started = time.perf_counter()
+        with db.cursor() as cursor:
+            cursor.execute(
+                "SELECT lastOrderId, sourceVersion, revision FROM FactRefreshState "
+                "WHERE factName = %s FOR UPDATE",
+                (self.fact_name,),
+            )
+            state = cursor.fetchone() or {"lastOrderId": 0, "sourceVersion": None, "revision": 0}
+
+            cursor.execute(SOURCE_VERSION_QUERY)
+            source_version = compute_data_version(cursor.fetchone())
+
+            affected: Dict[str, int] = {}
+            cutoff = None
+            if full or source_version != state["sourceVersion"]:
+                cursor.execute("SELECT COALESCE(MAX(orderId), 0) AS max_order_id FROM SalesOrder")
+                max_order_id = cursor.fetchone()["max_order_id"]
+                cutoff = FULL_REBUILD_FROM if full else self._cutoff(cursor, state["lastOrderId"])
+
+                for table, query in REFRESH_QUERIES.items():
+                    column, period_format = PERIOD_COLUMNS[table]
+                    cursor.execute(f"DELETE FROM {table} WHERE {column} >= %s", (cutoff.strftime(period_format),))
+                    if not settings.analytics_use_line_amounts:
+                        query = inline_line_amounts(query)
+                    cursor.execute(query, (cutoff, cutoff))
+                    affected[table] = cursor.rowcount
+                cursor.execute(
+                    "INSERT INTO FactRefreshState (factName, lastOrderId, sourceVersion, revision, refreshedAt) "
+                    "VALUES (%s, %s, %s, 1, NOW()) "
+                    "ON DUPLICATE KEY UPDATE lastOrderId = VALUES(lastOrderId), "
+                    "sourceVersion = VALUES(sourceVersion), revision = revision + 1, "
+                    "refreshedAt = VALUES(refreshedAt)",
+                    (self.fact_name, max_order_id, source_version),
+                )
+                state = {"lastOrderId": max_order_id, "revision": state["revision"] + 1}
+
+        self.last_order_id = state["lastOrderId"]
+        self.revision = state["revision"]
+        self.last_seconds = round(time.perf_counter() - started, 3)
+        self.refreshed_at = time.time()
+        self.refreshes += 1
+        self.status = "ok"
+        self.error = None
+        if cutoff is None:
+            return 0
+
+        # O'zgarishsiz yangilashlar oxirgi haqiqiy yangilash natijasini o'chirmaydi
+        self.last_cutoff = cutoff.isoformat()
+        self.last_affected_rows = affected
+        logger.info(
+            f"{self.fact_name} yangilandi: {self.last_cutoff} dan, {affected}, "
+            f"revision {self.revision}, {self.last_seconds:.3f} s"
+        )
+        return sum(affected.values())
+
+    def rebuild(self, db: DatabaseManager) -> int:
+        """
+        Fakt va rollup jadvallarini boshidan qurish (oynadan eski o'zgarishlardan keyin).
+
+        Args:
+            db: DatabaseManager instance
+
+        Returns:
+            int: refresh() natijasi
+        """
+        logger.info(f"{', '.join(SALES_FACT_TABLES)} qayta qurilmoqda")
+        return self.refresh(db, full=True)
+
+    async def watch(self, db: DatabaseManager, interval: float) -> None:
+        """
+        Faktni interval bo'yicha yangilab turish.
+        Lifespan'da task sifatida ishga tushiriladi; xatolik bo'lsa keyingi
+        intervalda qayta uriniladi (analitika esa oxirgi yangilangan holatni o'qiydi).
+
+        Args:
+            db: DatabaseManager instance
+            interval: Yangilashlar orasidagi pauza (soniya, 0 - faqat bir marta)
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh, db)
+            except Exception as e:
+                self.status = "error"
+                self.error = str(e)
+                logger.warning(f"{self.fact_name} ni yangilab bo'lmadi: {e}")
+            if interval <= 0:
+                return
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        """
+        Fakt jadvali holati.
+
+        Returns:
+            dict: Holat, oxirgi qayta ishlangan orderId, reviziya, jadvallarni o'zgartirgan
+                oxirgi yangilash natijasi (cutoff, jadval bo'yicha yozilgan qatorlar) va
+                oxirgi tekshiruv vaqti
+        """
+        refreshed_ago = None
+        if self.refreshed_at is not None:
+            refreshed_ago = round(time.time() - self.refreshed_at, 1)
+        return {
+            "status": self.status,
+            "last_order_id": self.last_order_id,
+            "revision": self.revision,
+            "window_days": self.window_days,
+            "last_cutoff": self.last_cutoff,
+            "last_affected_rows": self.last_affected_rows,
+            "last_seconds": self.last_seconds,
+            "refreshed_seconds_ago": refreshed_ago,
+            "refreshes": self.refreshes,
+            "error": self.error,
+        }
+
+
+# Global sales fact refresher instance
+sales_fact_refresher = SalesFactRefresher()
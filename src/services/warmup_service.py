@@ -0,0 +1,190 @@
+"""
+Startup'da analitika keshini isitish (warm-up).
+Deploy yoki restart'dan keyin birinchi foydalanuvchilar har bir og'ir
+query'ning sovuq narxini to'lamasligi uchun lifespan barcha keshlangan
+repository metodlarini default parametrlar bilan oldindan bajaradi.
+
+Router default'lari repository default'lari bilan bir xil, shuning uchun
+isitilgan yozuvlar endpoint'lar ishlatadigan kesh kalitlariga tushadi.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from src.config import settings
+from src.config.database import DatabaseManager
+from src.repositories import (
+    AsyncCategoryAnalyticsRepository,
+    AsyncCustomerAnalyticsRepository,
+    AsyncEmployeeAnalyticsRepository,
+    AsyncProductAnalyticsRepository,
+    AsyncSalesAnalyticsRepository,
+    AsyncShippingAnalyticsRepository,
+    AsyncSupplierAnalyticsRepository,
+    CategoryAnalyticsRepository,
+    CustomerAnalyticsRepository,
+    EmployeeAnalyticsRepository,
+    ProductAnalyticsRepository,
+    SalesAnalyticsRepository,
+    ShippingAnalyticsRepository,
+    SupplierAnalyticsRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+REPOSITORY_CLASSES = (
+    ProductAnalyticsRepository,
+    EmployeeAnalyticsRepository,
+    CustomerAnalyticsRepository,
+    CategoryAnalyticsRepository,
+    SupplierAnalyticsRepository,
+    ShippingAnalyticsRepository,
+    SalesAnalyticsRepository,
+)
+
+ASYNC_REPOSITORY_CLASSES = (
+    AsyncProductAnalyticsRepository,
+    AsyncEmployeeAnalyticsRepository,
+    AsyncCustomerAnalyticsRepository,
+    AsyncCategoryAnalyticsRepository,
+    AsyncSupplierAnalyticsRepository,
+    AsyncShippingAnalyticsRepository,
+    AsyncSalesAnalyticsRepository,
+)
+
+
+def cached_methods(repository_class: type) -> List[str]:
+    """
+    Repository'ning @cached_query bilan belgilangan metodlari.
+
+    Args:
+        repository_class: Analitika repository klassi
+
+    Returns:
+        List[str]: Metod nomlari (alifbo tartibida)
+    """
+    return [
+        name
+        for name, member in inspect.getmembers(repository_class, inspect.isfunction)
+        if hasattr(member, "cache_ttl")
+    ]
+
+
+class CacheWarmer:
+    """
+    Analitika keshini isitish holati va natijalari.
+    Holatlar: pending -> running -> ready; ANALYTICS_WARMUP_ENABLED yoki
+    ANALYTICS_CACHE_ENABLED o'chirilgan bo'lsa disabled.
+    """
+
+    def __init__(self) -> None:
+        enabled = settings.analytics_warmup_enabled and settings.analytics_cache_enabled
+        self.status = "pending" if enabled else "disabled"
+        self.concurrency = 0
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self.queries: List[dict] = []
+
+    @property
+    def ready(self) -> bool:
+        """Isitish tugagan (yoki o'chirilgan) - worker to'liq tezlikda javob beradi."""
+        return self.status in ("ready", "disabled")
+
+    def targets(self, db: DatabaseManager) -> List[Tuple[str, Callable[[], Any]]]:
+        """
+        Isitiladigan chaqiruvlar ro'yxati (DB_RUNTIME_MODE bo'yicha sync yoki async repository'lar).
+
+        Args:
+            db: DatabaseManager instance
+
+        Returns:
+            List[Tuple[str, Callable]]: (metod nomi, argumentsiz chaqiruv) juftliklari
+        """
+        classes = ASYNC_REPOSITORY_CLASSES if settings.use_async_db else REPOSITORY_CLASSES
+        targets = []
+        for repository_class in classes:
+            repository = repository_class(db)
+            for name in cached_methods(repository_class):
+                targets.append((name, getattr(repository, name)))
+        return targets
+
+    async def run(self, db: DatabaseManager) -> None:
+        """
+        Barcha analitika metodlarini cheklangan parallellik bilan bajarish.
+        Parallellik ANALYTICS_WARMUP_CONCURRENCY, lekin DB_POOL_SIZE dan oshmaydi -
+        isitish pool'ni to'liq egallab, birinchi so'rovlarni kutdirib qo'ymaydi.
+        Bitta query xatoligi isitishni to'xtatmaydi; u endpoint'ga birinchi
+        murojaatda oddiy tartibda hisoblanadi.
+
+        Args:
+            db: DatabaseManager instance
+        """
+        self.status = "running"
+        self.started_at = time.time()
+        started = time.perf_counter()
+
+        # Kalitlar versiyalangan bo'lishi uchun data versiyasi birinchi query'lardan oldin olinadi
+        if settings.data_version_poll_seconds > 0 and db.data_version is None:
+            try:
+                if settings.use_async_db:
+                    await db.poll_data_version_async()
+                else:
+                    await asyncio.to_thread(db.poll_data_version)
+            except Exception as e:
+                logger.warning(f"Isitishdan oldin data versiyasini olib bo'lmadi: {e}")
+
+        self.concurrency = max(1, min(settings.analytics_warmup_concurrency, settings.db_pool_size))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        targets = self.targets(db)
+        logger.info(f"Analitika keshi isitilmoqda: {len(targets)} ta query, parallellik {self.concurrency}")
+
+        async def warm(name: str, call: Callable[[], Any]) -> dict:
+            async with semaphore:
+                query_started = time.perf_counter()
+                report = {"method": name}
+                try:
+                    if settings.use_async_db:
+                        result = await call()
+                    else:
+                        result = await asyncio.to_thread(call)
+                    report["rows"] = len(result) if result is not None else 0
+                except Exception as e:
+                    report["error"] = str(e)
+                    logger.warning(f"Isitish: {name} bajarilmadi: {e}")
+                report["seconds"] = round(time.perf_counter() - query_started, 3)
+                return report
+
+        self.queries = list(await asyncio.gather(*(warm(name, call) for name, call in targets)))
+        self.seconds = round(time.perf_counter() - started, 3)
+        self.status = "ready"
+
+        failed = sum(1 for query in self.queries if "error" in query)
+        slowest = max(self.queries, key=lambda query: query["seconds"], default=None)
+        logger.info(
+            f"Analitika keshi isitildi: {len(self.queries) - failed}/{len(self.queries)} query, "
+            f"{self.seconds:.3f} s"
+            + (f" (eng sekini {slowest['method']}: {slowest['seconds']:.3f} s)" if slowest else "")
+        )
+
+    def stats(self) -> dict:
+        """
+        Isitish holati.
+
+        Returns:
+            dict: Holat, parallellik, umumiy vaqt va har bir query vaqti (sekinidan boshlab)
+        """
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "concurrency": self.concurrency,
+            "seconds": self.seconds,
+            "failed": sum(1 for query in self.queries if "error" in query),
+            "queries": sorted(self.queries, key=lambda query: query["seconds"], reverse=True),
+        }
+
+
+# Global cache warmer instance
+cache_warmer = CacheWarmer()
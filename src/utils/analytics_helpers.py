@@ -150,7 +150,11 @@ class DataTransformer:
     def convert_decimal_to_float(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Convert Decimal values to float for JSON serialization
-        
+
+        Analytics repositories already get JSON-ready values from the cursor
+        (decode="json"), so this is only needed for rows fetched with the
+        connector's native types
+
         Args:
             data: List of dictionaries with potential Decimal values
             
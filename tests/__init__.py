@@ -0,0 +1,4 @@
+"""
+Gastro-Savdo-Insights testlari.
+Database'ga ulanmaydi - DB chaqiruvlari soxta obyektlar bilan almashtiriladi.
+"""
@@ -0,0 +1,10 @@
+"""
+Umumiy pytest sozlamalari.
+Root papka Python path'ga qo'shiladi (src paketi o'rnatilmagan).
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
@@ -0,0 +1,117 @@
+"""
+AnalyticsCacheMiddleware testlari: ETag/If-None-Match, keshdan qaytgan
+javoblar (HIT, 304, gzip) va CORS sarlavhalari.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.cache import analytics_cache
+from src.config import settings
+from src.config.database import DatabaseManager
+from src.main import create_app
+
+ORIGIN = "http://localhost:5173"
+URL = "/api/v1/analytics/products/top-revenue?limit=1"
+
+ROWS = [{
+    "product_id": 1,
+    "product_name": "Chai",
+    "category_name": "Beverages",
+    "supplier_name": "Exotic Liquids",
+    "total_revenue": 100.0,
+    "total_quantity_sold": 10,
+    "total_orders": 2,
+}]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def execute_query(self, query, params=None, *args, **kwargs):
+        return [dict(row) for row in ROWS]
+
+    monkeypatch.setattr(DatabaseManager, "execute_query", execute_query)
+    monkeypatch.setattr(DatabaseManager, "data_version", property(lambda self: "v1"))
+    analytics_cache.clear()
+    yield TestClient(create_app())
+    analytics_cache.clear()
+
+
+def test_cached_response_keeps_cors_headers(client):
+    miss = client.get(URL, headers={"Origin": ORIGIN})
+    hit = client.get(URL, headers={"Origin": ORIGIN})
+
+    assert miss.status_code == hit.status_code == 200
+    assert hit.headers["x-cache"] == "HIT"
+    assert miss.headers["access-control-allow-origin"] == ORIGIN
+    assert hit.headers["access-control-allow-origin"] == ORIGIN
+    assert hit.json() == miss.json()
+
+
+def test_not_modified_response_keeps_cors_headers(client):
+    first = client.get(URL, headers={"Origin": ORIGIN})
+    etag = first.headers["etag"]
+
+    response = client.get(URL, headers={"Origin": ORIGIN, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.content == b""
+
+
+def test_etag_ignores_parameter_order_and_follows_data_version(client, monkeypatch):
+    path = "/api/v1/analytics/products/top-revenue"
+    etag = client.get(f"{path}?limit=3&lang=uz").headers["etag"]
+
+    assert client.get(f"{path}?lang=uz&limit=3").headers["etag"] == etag
+    assert client.get(f"{path}?lang=uz&limit=4").headers["etag"] != etag
+    monkeypatch.setattr(DatabaseManager, "data_version", property(lambda self: "v2"))
+    assert client.get(f"{path}?limit=3&lang=uz").headers["etag"] != etag
+
+
+@pytest.mark.parametrize("if_none_match", ['"other", W/{etag}', "*", "{etag}"])
+def test_matching_if_none_match_is_not_modified(client, if_none_match):
+    etag = client.get(URL).headers["etag"]
+
+    response = client.get(URL, headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == settings.analytics_cache_control
+
+
+def test_stale_if_none_match_gets_full_response(client):
+    response = client.get(URL, headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != '"stale"'
+    assert response.json()
+
+
+def test_unknown_data_version_has_no_etag(client, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "data_version", property(lambda self: None))
+
+    response = client.get(URL, headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip;q=abc", "gzip;q=", "gzip;q=0"])
+def test_rejected_or_malformed_gzip_quality_gets_identity(client, accept_encoding):
+    client.get(URL)
+    response = client.get(URL, headers={"Accept-Encoding": accept_encoding})
+
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "HIT"
+    assert "content-encoding" not in response.headers
+
+
+def test_large_response_is_cached_gzipped(client, monkeypatch):
+    monkeypatch.setattr(settings, "analytics_response_gzip_min_bytes", 1)
+    miss = client.get(URL, headers={"Accept-Encoding": "gzip"})
+    hit = client.get(URL, headers={"Accept-Encoding": "gzip, br;q=0.5"})
+
+    assert hit.headers["x-cache"] == "HIT"
+    assert hit.headers["content-encoding"] == "gzip"
+    assert hit.json() == miss.json()
@@ -0,0 +1,123 @@
+"""
+Analytics repository testlari: yuboriladigan SQL matni, kesh kaliti va
+top-N superset'dan kichik so'rovlarni kesib berish.
+"""
+
+import re
+
+import pytest
+
+from src.cache import analytics_cache
+from src.repositories.analytics_repository import (
+    LINE_AMOUNT_EXPRESSIONS,
+    ProductAnalyticsRepository,
+    inline_line_amounts,
+    narrow_superset,
+    superset_params,
+)
+
+BASKET_FILTER = ("min_occurrences", "times_bought_together", 1)
+
+
+class _RecordingDatabase:
+    data_version = "v1"
+
+    def __init__(self, rows: list = None) -> None:
+        self.queries: list = []
+        self.params: list = []
+        self.rows = rows or []
+
+    def execute_query(self, query, params=None, **kwargs):
+        self.queries.append(query)
+        self.params.append(params)
+        return self.rows
+
+
+def _top_revenue_query(**options) -> str:
+    db = _RecordingDatabase()
+    ProductAnalyticsRepository(db, use_cache=False, use_sales_fact=False, **options).get_top_revenue_products()
+    return db.queries[-1]
+
+
+def test_inline_line_amounts_replaces_every_column():
+    query = "SELECT SUM(od.lineRevenue), SUM(od.lineGross), SUM(od.lineDiscount) FROM OrderDetail od"
+
+    inlined = inline_line_amounts(query)
+
+    assert not re.search(r"\bline(Revenue|Gross|Discount)\b", inlined)
+    for expression in LINE_AMOUNT_EXPRESSIONS.values():
+        assert f"SUM({expression})" in inlined
+
+
+def test_line_amount_columns_are_inlined_by_default():
+    query = _top_revenue_query(use_line_amounts=False)
+
+    assert "lineRevenue" not in query
+    assert LINE_AMOUNT_EXPRESSIONS["od.lineRevenue"] in query
+
+
+def test_line_amount_columns_are_read_when_enabled():
+    assert "od.lineRevenue" in _top_revenue_query(use_line_amounts=True)
+
+
+@pytest.fixture
+def empty_cache():
+    analytics_cache.clear()
+    yield analytics_cache
+    analytics_cache.clear()
+
+
+def test_cache_key_separates_sources(empty_cache):
+    db = _RecordingDatabase()
+    raw = ProductAnalyticsRepository(db, use_sales_fact=False)
+    fact = ProductAnalyticsRepository(db, use_sales_fact=True)
+
+    raw.get_top_revenue_products()
+    fact.get_top_revenue_products()
+    raw.get_top_revenue_products()
+
+    assert len(db.queries) == 2
+    assert "DailySalesFact" in db.queries[1]
+    assert {entry["key"].split(":source=")[1].split(":")[0] for entry in empty_cache.entries()} == {"raw", "fact"}
+
+
+def test_superset_params_widen_limit_and_threshold():
+    params = {"min_occurrences": 5, "limit": 20}
+
+    assert superset_params(params, 100, BASKET_FILTER) == {"min_occurrences": 1, "limit": 100}
+    assert params == {"min_occurrences": 5, "limit": 20}
+    assert superset_params({"limit": 100}, 100, None) == {"limit": 100}
+
+
+@pytest.mark.parametrize(
+    "params, max_limit, min_filter",
+    [
+        ({"limit": 5}, None, None),
+        ({"limit": 101}, 100, None),
+        ({"min_occurrences": 0, "limit": 20}, 100, BASKET_FILTER),
+    ],
+)
+def test_calls_outside_the_superset_have_none(params, max_limit, min_filter):
+    assert superset_params(params, max_limit, min_filter) is None
+
+
+def test_narrow_superset_filters_then_limits():
+    rows = [{"times_bought_together": count} for count in (9, 7, 5, 3, 1)]
+
+    narrowed = narrow_superset(rows, {"min_occurrences": 5, "limit": 2}, BASKET_FILTER)
+
+    assert narrowed == [{"times_bought_together": 9}, {"times_bought_together": 7}]
+    assert narrow_superset(rows, {"min_occurrences": 4, "limit": 10}, BASKET_FILTER) == rows[:3]
+    assert narrow_superset(rows, {"limit": 10}) is not rows
+    assert len(rows) == 5
+
+
+def test_smaller_limits_are_served_from_one_query(empty_cache):
+    db = _RecordingDatabase(rows=[{"product_id": product_id} for product_id in range(100)])
+    repository = ProductAnalyticsRepository(db, use_sales_fact=False)
+
+    assert len(repository.get_top_revenue_products(limit=5)) == 5
+    assert len(repository.get_top_revenue_products(limit=3)) == 3
+    assert len(repository.get_top_revenue_products(limit=101)) == 100
+
+    assert db.params == [(100,), (101,)]
@@ -0,0 +1,96 @@
+"""
+Async repository va servislar testlari: sinxron variant bilan umumiy kesh mantiqi.
+"""
+
+import asyncio
+import inspect
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.cache import analytics_cache
+from src.config import settings
+from src.config.database import DatabaseManager
+from src.main import create_app
+from src.repositories.async_analytics_repository import AsyncProductAnalyticsRepository
+from src.services.async_analytics_service import AsyncProductAnalyticsService
+
+ROWS = [{
+    "product_id": 1,
+    "product_name": "Chai",
+    "category_name": "Beverages",
+    "supplier_name": "Exotic Liquids",
+    "total_revenue": 100.0,
+    "total_quantity_sold": 10,
+    "total_orders": 2,
+}]
+
+
+class _AsyncDatabase:
+    data_version = "v1"
+
+    def __init__(self) -> None:
+        self.queries = 0
+
+    async def execute_query_async(self, query, params=None, **kwargs):
+        self.queries += 1
+        await asyncio.sleep(0)
+        return [dict(row) for row in ROWS]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    analytics_cache.clear()
+    yield
+    analytics_cache.clear()
+
+
+def test_service_methods_are_coroutine_functions():
+    service = AsyncProductAnalyticsService(_AsyncDatabase())
+
+    assert inspect.iscoroutinefunction(service.get_top_revenue_products)
+    assert inspect.iscoroutinefunction(service.get_market_basket_analysis)
+
+
+def test_async_service_awaits_and_caches():
+    db = _AsyncDatabase()
+    service = AsyncProductAnalyticsService(db)
+
+    async def run():
+        return await service.get_top_revenue_products(1), await service.get_top_revenue_products(1)
+
+    first, second = asyncio.run(run())
+
+    assert db.queries == 1
+    assert first.count == second.count == 1
+    assert first.message == "Top 1 revenue products retrieved successfully"
+
+
+def test_concurrent_misses_run_one_query():
+    db = _AsyncDatabase()
+    repository = AsyncProductAnalyticsRepository(db, use_cache=False)
+
+    async def run():
+        return await asyncio.gather(*(repository.get_abc_analysis() for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert db.queries == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_router_serves_async_services(monkeypatch):
+    db = _AsyncDatabase()
+
+    async def execute_query_async(self, query, params=None, **kwargs):
+        return await db.execute_query_async(query, params, **kwargs)
+
+    monkeypatch.setattr(settings, "db_runtime_mode", "async")
+    monkeypatch.setattr(DatabaseManager, "execute_query_async", execute_query_async)
+    monkeypatch.setattr(DatabaseManager, "data_version", property(lambda self: "v1"))
+
+    response = TestClient(create_app()).get("/api/v1/analytics/products/top-revenue?limit=1")
+
+    assert response.status_code == 200
+    assert response.json()["data"][0]["product_name"] == "Chai"
+    assert db.queries == 1
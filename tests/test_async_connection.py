@@ -0,0 +1,88 @@
+"""
+DatabaseManager.async_connection testlari: xatolikdan keyin ulanish pool'ga qanday qaytadi.
+"""
+
+import asyncio
+
+import pytest
+
+from src.config.database import DatabaseManager
+
+
+class _DriverError(Exception):
+    """aiomysql OperationalError kabi: args[0] - MySQL client xatolik kodi."""
+
+
+class _FakeConnection:
+    def __init__(self, alive: bool = True) -> None:
+        self.alive = alive
+        self.closed = False
+        self.rollbacks = 0
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        if not self.alive:
+            raise OSError("socket is closed")
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakePool:
+    def __init__(self, conn: _FakeConnection) -> None:
+        self.conn = conn
+        self.released = []
+
+    async def acquire(self) -> _FakeConnection:
+        return self.conn
+
+    def release(self, conn: _FakeConnection) -> None:
+        self.released.append(conn)
+
+
+def _fail_inside_connection(monkeypatch, conn: _FakeConnection, error: Exception) -> _FakePool:
+    pool = _FakePool(conn)
+    db = DatabaseManager()
+    monkeypatch.setattr(db, "_async_pool", pool)
+    monkeypatch.setattr(db, "_async_replicas", None)
+
+    async def run():
+        async with db.async_connection():
+            raise error
+
+    with pytest.raises(type(error)) as raised:
+        asyncio.run(run())
+    assert raised.value is error
+    return pool
+
+
+def test_lost_connection_is_closed_without_rollback(monkeypatch):
+    conn = _FakeConnection(alive=False)
+    error = _DriverError(2013, "Lost connection to MySQL server during query")
+
+    pool = _fail_inside_connection(monkeypatch, conn, error)
+
+    assert conn.closed
+    assert pool.released == [conn]
+
+
+def test_failed_rollback_keeps_the_original_error(monkeypatch):
+    conn = _FakeConnection(alive=False)
+    error = ValueError("bad row")
+
+    pool = _fail_inside_connection(monkeypatch, conn, error)
+
+    assert conn.closed
+    assert pool.released == [conn]
+
+
+def test_query_error_rolls_back_and_keeps_the_connection(monkeypatch):
+    conn = _FakeConnection()
+
+    _fail_inside_connection(monkeypatch, conn, _DriverError(1064, "syntax error"))
+
+    assert conn.rollbacks == 1
+    assert not conn.closed
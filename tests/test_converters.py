@@ -0,0 +1,73 @@
+"""
+Natija converter'lari testlari: JSON/scaled dekodlash va ulanish converter'ini tiklash.
+"""
+
+import pytest
+from mysql.connector.constants import FieldType
+from mysql.connector.conversion import MySQLConverter
+
+from src.config import settings
+from src.config.converters import JSONConverter, ScaledDecimalConverter, use_converter
+
+
+def _field(type_code: int) -> tuple:
+    return ("column", type_code, None, None, None, None, True, 0, 0)
+
+
+def _convert(converter_class, type_code: int, value: bytes):
+    return converter_class("utf8mb4", True).to_python(_field(type_code), value)
+
+
+@pytest.mark.parametrize("type_code", [FieldType.DECIMAL, FieldType.NEWDECIMAL])
+def test_json_decimal_is_float(type_code):
+    assert _convert(JSONConverter, type_code, b"12.3450") == 12.345
+
+
+@pytest.mark.parametrize("type_code", [FieldType.DATE, FieldType.NEWDATE])
+def test_json_dates_are_iso_strings(type_code):
+    assert _convert(JSONConverter, type_code, b"2008-05-06") == "2008-05-06"
+    assert _convert(JSONConverter, type_code, b"0000-00-00") is None
+
+
+@pytest.mark.parametrize("type_code", [FieldType.DATETIME, FieldType.TIMESTAMP])
+def test_json_datetimes_match_isoformat(type_code):
+    assert _convert(JSONConverter, type_code, b"2008-05-06 10:30:00") == "2008-05-06T10:30:00"
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [(b"12.345", 1235), (b"-12.345", -1235), (b"7", 700), (b"0.004", 0)],
+)
+def test_scaled_decimal_rounds_half_up(monkeypatch, text, expected):
+    monkeypatch.setattr(settings, "db_decimal_scale", 2)
+    assert _convert(ScaledDecimalConverter, FieldType.NEWDECIMAL, text) == expected
+
+
+class _Connection:
+    """set_converter_class'ni mysql-connector kabi bajaruvchi ulanish."""
+
+    def __init__(self, converter=None) -> None:
+        self.converter = converter
+
+    def set_converter_class(self, convclass) -> None:
+        self.converter = convclass("utf8mb4", True)
+
+
+def test_use_converter_restores_the_converter_class():
+    cnx = _Connection(MySQLConverter("utf8mb4", True))
+    with use_converter(cnx, "json"):
+        assert type(cnx.converter) is JSONConverter
+    assert type(cnx.converter) is MySQLConverter
+
+
+def test_use_converter_falls_back_to_the_default_converter():
+    cnx = _Connection()
+    with use_converter(cnx, "scaled"):
+        assert type(cnx.converter) is ScaledDecimalConverter
+    assert type(cnx.converter) is MySQLConverter
+
+
+def test_native_mode_keeps_the_connection():
+    cnx = _Connection()
+    with use_converter(cnx, "native"):
+        assert cnx.converter is None
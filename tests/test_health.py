@@ -0,0 +1,69 @@
+"""
+/health endpointlari testlari: ochiq va admin uchun batafsil holat.
+"""
+
+from contextlib import contextmanager
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import settings
+from src.config.database import DatabaseManager
+from src.main import create_app
+from src.models import AdminResponse
+from src.routers.auth import require_auth
+
+
+class _Cursor:
+    on_event_loop: list = []
+
+    def execute(self, query, params=None):
+        try:
+            asyncio.get_running_loop()
+            self.on_event_loop.append(True)
+        except RuntimeError:
+            self.on_event_loop.append(False)
+
+    def fetchone(self):
+        return {"1": 1}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    @contextmanager
+    def cursor(self, *args, **kwargs):
+        yield _Cursor()
+
+    monkeypatch.setattr(DatabaseManager, "cursor", cursor)
+    return TestClient(create_app())
+
+
+def test_public_health_has_no_internals(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"status", "ready", "database", "environment"}
+    assert response.json()["database"] == "healthy"
+    assert response.json()["environment"] == settings.environment
+
+
+def test_database_check_runs_off_the_event_loop(client):
+    _Cursor.on_event_loop.clear()
+    client.get("/health")
+
+    assert _Cursor.on_event_loop == [False]
+
+
+def test_health_details_requires_session(client):
+    assert client.get("/health/details").status_code == 401
+
+
+def test_health_details_for_admin(client):
+    client.app.dependency_overrides[require_auth] = lambda: AdminResponse(adminId=1, username="admin")
+    response = client.get("/health/details")
+
+    assert response.status_code == 200
+    assert response.json()["database"] == "healthy"
+    assert {"db_pool", "analytics_cache", "data_version", "sales_fact"} <= set(response.json())
@@ -0,0 +1,87 @@
+"""
+MemoryCache testlari: TTL, stale oynasi va yozuvlar soni/hajmi bo'yicha LRU.
+"""
+
+import pytest
+
+from src.cache import memory
+from src.cache.memory import MemoryCache, estimate_size
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """memory moduli ko'radigan time.time() ni qo'lda suriladigan soat bilan almashtirish."""
+    now = [1000.0]
+    monkeypatch.setattr(memory.time, "time", lambda: now[0])
+    return now
+
+
+def test_entry_is_fresh_then_stale_then_gone(clock):
+    cache = MemoryCache()
+    cache.set("key", "value", ttl=10, stale_ttl=5)
+
+    assert cache.get("key").stale is False
+    clock[0] += 10
+    entry = cache.get("key")
+    assert entry.stale is True and entry.value == "value"
+    clock[0] += 5
+    assert cache.get("key") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0 and stats["bytes"] == 0
+
+
+def test_without_stale_ttl_entry_expires_with_ttl(clock):
+    cache = MemoryCache()
+    cache.set("key", "value", ttl=10)
+
+    clock[0] += 10
+    assert cache.get("key") is None
+
+
+def test_non_positive_ttl_is_not_stored():
+    cache = MemoryCache()
+
+    assert cache.set("key", "value", ttl=0) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a").value == 1
+    assert cache.get("c").value == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_evicts_and_rejects_oversized_entries():
+    value = "x" * 100
+    size = estimate_size(value)
+    cache = MemoryCache(max_bytes=size * 2)
+    cache.set("a", value, ttl=60)
+    cache.set("b", value, ttl=60)
+    cache.set("c", value, ttl=60)
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == size * 2
+
+    assert cache.set("huge", "x" * 1000, ttl=60) is None
+    assert cache.stats()["rejected"] == 1
+    assert len(cache) == 2
+
+
+def test_overwrite_keeps_byte_count():
+    cache = MemoryCache()
+    cache.set("key", [1, 2, 3], ttl=60)
+    cache.set("key", "value", ttl=60)
+
+    assert cache.stats()["bytes"] == estimate_size("value")
+    assert cache.invalidate("k") == 1
+    assert cache.stats()["bytes"] == 0
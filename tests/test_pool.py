@@ -0,0 +1,173 @@
+"""
+ConnectionPool testlari: band ulanishlar navbati, overflow va timeout,
+hamda ulanishdagi prepared statement keshi (LRU).
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.config.pool import ConnectionPool, PoolTimeoutError, StatementCache
+
+
+class _FakeCursor:
+    """Yopilganini eslab qoladigan prepared cursor."""
+
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeConnection:
+    """Ochilgan/yopilganini sanaydigan xom ulanish o'rnini bosuvchi."""
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.resets = 0
+        self.cursors = []
+
+    def cursor(self, prepared: bool = False) -> "_FakeCursor":
+        cursor = _FakeCursor()
+        self.cursors.append(cursor)
+        return cursor
+
+    def reset_session(self) -> None:
+        self.resets += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _pool(pool_size: int = 1, max_overflow: int = 0, timeout: float = 0.05) -> ConnectionPool:
+    return ConnectionPool("test", _FakeConnection, pool_size, max_overflow=max_overflow, timeout=timeout)
+
+
+def test_released_connection_is_reused():
+    pool = _pool()
+    first = pool.get_connection()
+    raw = first.raw_connection
+    first.close()
+
+    with pool.get_connection() as second:
+        assert second.raw_connection is raw
+    assert pool.stats()["open"] == 1
+
+
+def test_exhausted_pool_times_out():
+    pool = _pool()
+    held = pool.get_connection()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.get_connection(timeout=0.01)
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["waiting"] == 0
+    assert stats["in_use"] == 1
+    held.close()
+
+
+def test_overflow_connection_is_closed_on_release():
+    pool = _pool(max_overflow=1)
+    base = pool.get_connection()
+    overflow = pool.get_connection()
+    raw = overflow.raw_connection
+
+    assert pool.stats()["overflow_in_use"] == 1
+    with pytest.raises(PoolTimeoutError):
+        pool.get_connection(timeout=0.01)
+
+    overflow.close()
+    assert raw.closed
+    stats = pool.stats()
+    assert stats["open"] == 1
+    assert stats["overflow_opened"] == 1
+    base.close()
+
+
+def test_waiter_gets_released_connection():
+    pool = _pool(timeout=5)
+    held = pool.get_connection()
+    raw = held.raw_connection
+    received = []
+
+    waiter = threading.Thread(target=lambda: received.append(pool.get_connection()))
+    waiter.start()
+    while pool.stats()["waiting"] == 0:
+        time.sleep(0.001)
+    held.close()
+    waiter.join(timeout=5)
+
+    assert received and received[0].raw_connection is raw
+    assert pool.stats()["open"] == 1
+    received[0].close()
+
+
+def test_failed_connect_frees_the_slot():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("connection refused")
+        return _FakeConnection()
+
+    pool = ConnectionPool("test", connect, 1, timeout=0.05)
+    with pytest.raises(OSError):
+        pool.get_connection()
+
+    with pool.get_connection():
+        assert pool.stats()["in_use"] == 1
+    assert pool.stats()["in_use"] == 0
+
+
+def test_statement_cache_returns_the_same_query_object():
+    cnx = _FakeConnection()
+    cache = StatementCache(2)
+    cursor, query = cache.get(cnx, "SELECT 1")
+
+    # Prepared cursor query'ni `is` bilan solishtiradi - keshdagi str qaytishi shart
+    assert cache.get(cnx, "".join(["SELECT ", "1"])) == (cursor, query)
+    assert cache.get(cnx, "SELECT 1")[1] is query
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cnx.cursors) == 1
+
+
+def test_statement_cache_evicts_least_recently_used():
+    cnx = _FakeConnection()
+    cache = StatementCache(2)
+    first, _ = cache.get(cnx, "SELECT 1")
+    second, _ = cache.get(cnx, "SELECT 2")
+    cache.get(cnx, "SELECT 1")
+    cache.get(cnx, "SELECT 3")
+
+    assert len(cache) == 2
+    assert second.closed and not first.closed
+    assert cache.get(cnx, "SELECT 1")[0] is first
+    cache.get(cnx, "SELECT 2")
+    assert cache.misses == 4
+
+
+def test_disabled_statement_cache_returns_open_uncached_cursors():
+    cnx = _FakeConnection()
+    cache = StatementCache(0)
+    first, query = cache.get(cnx, "SELECT 1")
+    second, _ = cache.get(cnx, "SELECT 1")
+
+    assert query == "SELECT 1"
+    assert not first.closed and not second.closed
+    assert first is not second
+    assert not cache.enabled and len(cache) == 0
+    assert cache.misses == 2
+
+
+def test_statement_cache_is_cleared_on_session_reset():
+    pool = ConnectionPool("test", _FakeConnection, 1, statement_cache_size=4)
+    with pool.get_connection() as cnx:
+        cnx.prepared_cursor("SELECT 1")
+        raw = cnx.raw_connection
+
+    assert raw.resets == 1
+    assert pool.stats()["idle_statement_cache"]["statements"] == 0
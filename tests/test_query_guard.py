@@ -0,0 +1,60 @@
+"""
+add_max_execution_time_hint testlari: hint faqat top-level SELECT'ga qo'yiladi.
+"""
+
+import pytest
+
+from src.config.query_guard import add_max_execution_time_hint
+
+HINT = "/*+ MAX_EXECUTION_TIME(500) */"
+
+
+def test_hint_follows_the_first_select():
+    query = "SELECT id FROM Product WHERE id IN (SELECT productId FROM OrderDetail)"
+
+    assert add_max_execution_time_hint(query, 500) == (
+        f"SELECT {HINT} id FROM Product WHERE id IN (SELECT productId FROM OrderDetail)"
+    )
+
+
+def test_hint_goes_to_the_main_select_after_ctes():
+    query = (
+        "WITH recent AS (SELECT orderId FROM SalesOrder), "
+        "totals AS (SELECT orderId FROM recent)\n"
+        "select orderId FROM totals"
+    )
+
+    hinted = add_max_execution_time_hint(query, 500)
+    assert hinted.endswith(f"select {HINT} orderId FROM totals")
+    assert hinted.count("MAX_EXECUTION_TIME") == 1
+
+
+@pytest.mark.parametrize(
+    "prefix",
+    [
+        "-- SELECT in a comment\n",
+        "/* SELECT */ ",
+        "# SELECT\n",
+    ],
+)
+def test_select_in_comments_is_ignored(prefix):
+    hinted = add_max_execution_time_hint(f"{prefix}SELECT 1", 500)
+
+    assert hinted == f"{prefix}SELECT {HINT} 1"
+
+
+def test_select_in_literals_and_identifiers_is_ignored():
+    query = "WITH x AS (SELECT ')' AS `select`, \"(\" AS y) SELECT * FROM x"
+
+    assert add_max_execution_time_hint(query, 500).endswith(f") SELECT {HINT} * FROM x")
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "UPDATE Product SET unitPrice = 1",
+        "SELECT /*+ MAX_EXECUTION_TIME(100) */ 1",
+    ],
+)
+def test_query_without_select_or_with_hint_is_unchanged(query):
+    assert add_max_execution_time_hint(query, 500) == query
@@ -0,0 +1,136 @@
+"""
+SalesFactRefresher testlari: server'ga yuboriladigan SQL matni va qayta yoziladigan davr.
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Optional
+
+from mysql.connector.cursor import RE_PY_PARAM, _ParamSubstitutor
+
+from src.config import settings
+from src.config.data_version import compute_data_version
+from src.services.sales_fact_service import FULL_REBUILD_FROM, SalesFactRefresher
+
+WATERMARK = {"SalesOrder_max_id": 10, "SalesOrder_count": 10}
+
+
+def _quote(param) -> str:
+    return str(param) if isinstance(param, int) else f"'{param}'"
+
+
+class _FakeDatabase:
+    """mysql-connector kabi %s parametrlarini almashtirib, yuborilgan SQL'ni yozib oluvchi DB."""
+
+    def __init__(
+        self,
+        source_version: Optional[str] = None,
+        last_order_id: int = 0,
+        max_order_id: int = 10,
+        max_date: Optional[date] = None,
+        new_from: Optional[datetime] = None,
+    ) -> None:
+        self.sent: list = []
+        self.params: list = []
+        self.state = {"lastOrderId": last_order_id, "sourceVersion": source_version, "revision": 3}
+        self.results = {
+            "FOR UPDATE": self.state,
+            "SalesOrder_max_id": WATERMARK,
+            "MAX(orderId)": {"max_order_id": max_order_id},
+            "MAX(salesDate)": {"max_date": max_date},
+            "MIN(orderDate)": {"new_from": new_from},
+        }
+
+    @contextmanager
+    def cursor(self, *args, **kwargs):
+        yield self
+
+    rowcount = 0
+
+    def execute(self, query: str, params: tuple = ()) -> None:
+        statement = query.encode("utf-8")
+        if params:
+            substitutor = _ParamSubstitutor([_quote(param).encode("utf-8") for param in params])
+            statement = RE_PY_PARAM.sub(substitutor, statement)
+        self.sent.append(statement.decode("utf-8"))
+        self.params.append(params)
+
+    def fetchone(self) -> dict:
+        return next(row for marker, row in self.results.items() if marker in self.sent[-1])
+
+
+def _statement(sent: list, prefix: str) -> str:
+    return next(sql for sql in sent if sql.lstrip().startswith(prefix))
+
+
+def test_sent_sql_has_no_escaped_percent():
+    db = _FakeDatabase()
+    SalesFactRefresher().refresh(db)
+
+    for sql in db.sent:
+        assert "%%" not in sql
+        assert "%s" not in sql
+
+
+def test_monthly_rollup_month_is_built_from_order_date():
+    db = _FakeDatabase()
+    SalesFactRefresher().refresh(db)
+
+    rollup = _statement(db.sent, "INSERT INTO MonthlySalesRollup")
+    assert "CONCAT(YEAR(so.orderDate), '-', LPAD(MONTH(so.orderDate), 2, '0')) AS salesMonth" in rollup
+    assert "DATE_FORMAT" not in rollup
+
+
+def test_refresh_is_skipped_while_source_is_unchanged():
+    db = _FakeDatabase(source_version=compute_data_version(WATERMARK))
+
+    assert SalesFactRefresher().refresh(db) == 0
+    assert not any(sql.lstrip().startswith(("INSERT", "DELETE")) for sql in db.sent)
+
+
+def test_empty_fact_is_built_in_full():
+    db = _FakeDatabase()
+    SalesFactRefresher().refresh(db)
+
+    assert f"DELETE FROM DailySalesFact WHERE salesDate >= '{FULL_REBUILD_FROM}'" in db.sent
+    assert "DELETE FROM MonthlySalesRollup WHERE salesMonth >= '1000-01'" in db.sent
+
+
+def test_trailing_window_starts_at_month_boundary():
+    db = _FakeDatabase(last_order_id=10, max_date=date(2008, 5, 6))
+    refresher = SalesFactRefresher(window_days=31)
+    refresher.refresh(db)
+
+    assert "DELETE FROM DailySalesFact WHERE salesDate >= '2008-04-01'" in db.sent
+    assert "DELETE FROM MonthlySalesRollup WHERE salesMonth >= '2008-04'" in db.sent
+    assert "WHERE so.orderDate >= '2008-04-01'" in _statement(db.sent, "INSERT INTO DailySalesFact")
+    assert refresher.stats()["last_cutoff"] == "2008-04-01"
+
+
+def test_backdated_new_orders_extend_the_window():
+    db = _FakeDatabase(last_order_id=8, max_date=date(2008, 5, 6), new_from=datetime(2007, 11, 20, 10, 30))
+    SalesFactRefresher(window_days=31).refresh(db)
+
+    assert "DELETE FROM DailySalesFact WHERE salesDate >= '2007-11-01'" in db.sent
+
+
+def test_state_records_source_version_and_revision():
+    db = _FakeDatabase(max_date=date(2008, 5, 6))
+    refresher = SalesFactRefresher()
+    refresher.refresh(db)
+
+    state = _statement(db.sent, "INSERT INTO FactRefreshState")
+    assert f"'{compute_data_version(WATERMARK)}'" in state
+    assert "revision = revision + 1" in state
+    assert refresher.stats()["revision"] == 4
+
+
+def test_line_amounts_are_inlined_without_the_columns(monkeypatch):
+    monkeypatch.setattr(settings, "analytics_use_line_amounts", False)
+    db = _FakeDatabase()
+    SalesFactRefresher().refresh(db)
+
+    for table in ("DailySalesFact", "MonthlySalesRollup"):
+        statement = _statement(db.sent, f"INSERT INTO {table}")
+        assert "lineRevenue" not in statement
+        assert "SUM((od.unitPrice * od.quantity * (1 - od.discount))) AS revenue" in statement
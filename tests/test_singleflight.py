@@ -0,0 +1,142 @@
+"""
+Single-flight testlari: leader xatoligi kutuvchilarga uzatiladi, to'xtatilgan
+query esa kutuvchilardan biri tomonidan qayta bajariladi.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.cache.singleflight import AsyncSingleFlight, SingleFlight
+from src.config.query_guard import QueryCancelledError, QueryGuard, current_query_guard
+
+
+def _run_with_waiter(flights: SingleFlight, leader_error: BaseException, waiter_func):
+    """Leader bloklangan paytda bitta kutuvchini ulab, leader'ni xatolik bilan tugatish (kutuvchi natijasi)."""
+    release = threading.Event()
+    outcome = {}
+
+    def failing():
+        release.wait(5)
+        raise leader_error
+
+    def call(role: str, func) -> None:
+        try:
+            outcome[role] = flights.do("key", func)
+        except BaseException as e:
+            outcome[role] = e
+
+    leader_thread = threading.Thread(target=call, args=("leader", failing))
+    leader_thread.start()
+    while flights.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+    waiter_thread = threading.Thread(target=call, args=("waiter", waiter_func))
+    waiter_thread.start()
+    while flights.stats()["coalesced"] == 0:
+        time.sleep(0.001)
+
+    release.set()
+    leader_thread.join(5)
+    waiter_thread.join(5)
+    assert outcome["leader"] is leader_error
+    return outcome["waiter"]
+
+
+def test_leader_error_is_raised_to_waiters():
+    flights = SingleFlight()
+    error = ValueError("query failed")
+    outcome = _run_with_waiter(flights, error, lambda: "not called")
+
+    assert outcome is error
+    assert flights.stats() == {"in_flight": 0, "executed": 1, "coalesced": 1}
+
+
+def test_cancelled_leader_is_retried_by_a_waiter():
+    flights = SingleFlight()
+    outcome = _run_with_waiter(flights, QueryCancelledError("/test", "client_disconnected"), lambda: "rows")
+
+    assert outcome == "rows"
+    assert flights.stats()["executed"] == 2
+
+
+@pytest.mark.parametrize("timeout, cancel", [(0.05, False), (0, True)])
+def test_waiter_leaves_on_its_own_deadline_or_cancel(timeout, cancel):
+    flights = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flights.do, args=("key", lambda: release.wait(5)))
+    leader.start()
+    while flights.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+
+    guard = QueryGuard("/test", timeout)
+    if cancel:
+        threading.Timer(0.05, guard.cancel, args=("client disconnected",)).start()
+    token = current_query_guard.set(guard)
+    started = time.monotonic()
+    try:
+        with pytest.raises(QueryCancelledError):
+            flights.do("key", lambda: "not called")
+    finally:
+        current_query_guard.reset(token)
+        release.set()
+        leader.join(5)
+
+    assert time.monotonic() - started < 1
+    assert flights.stats()["executed"] == 1
+
+
+def test_async_leader_error_is_raised_to_waiters():
+    flights = AsyncSingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("query failed")
+
+    async def run():
+        return await asyncio.gather(flights.do("key", failing), flights.do("key", failing), return_exceptions=True)
+
+    leader, waiter = asyncio.run(run())
+    assert isinstance(leader, ValueError) and waiter is leader
+    assert flights.stats() == {"in_flight": 0, "executed": 1, "coalesced": 1}
+
+
+def test_async_cancelled_leader_is_retried_by_a_waiter():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def query():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise QueryCancelledError("/test", "deadline")
+        return "rows"
+
+    async def run():
+        return await asyncio.gather(flights.do("key", query), flights.do("key", query), return_exceptions=True)
+
+    leader, waiter = asyncio.run(run())
+    assert isinstance(leader, QueryCancelledError)
+    assert waiter == "rows"
+    assert flights.stats()["executed"] == 2
+
+
+def test_async_cancelled_waiter_does_not_cancel_the_leader():
+    flights = AsyncSingleFlight()
+
+    async def query():
+        await asyncio.sleep(0.02)
+        return "rows"
+
+    async def run():
+        leader = asyncio.create_task(flights.do("key", query))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.do("key", query))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await leader, await asyncio.gather(waiter, return_exceptions=True)
+
+    result, (waiter_result,) = asyncio.run(run())
+    assert result == "rows"
+    assert isinstance(waiter_result, asyncio.CancelledError)
@@ -0,0 +1,72 @@
+"""
+SQLiteCache testlari: kesh papkasi huquqlari va faqat o'qiydigan get().
+"""
+
+import os
+import stat
+
+import pytest
+
+from src.cache.sqlite import SQLiteCache
+
+posix_only = pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX huquqlari kerak")
+
+
+@posix_only
+def test_directory_is_created_private(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache")
+    cache.set("key", {"value": 1}, ttl=60)
+
+    assert stat.S_IMODE((tmp_path / "cache").stat().st_mode) == 0o700
+    assert cache.get("key").value == {"value": 1}
+
+
+@posix_only
+def test_shared_directory_is_refused(tmp_path):
+    directory = tmp_path / "cache"
+    directory.mkdir(mode=0o777)
+    directory.chmod(0o777)
+    cache = SQLiteCache(directory)
+
+    assert cache.set("key", {"value": 1}, ttl=60) is None
+    assert cache.get("key") is None
+    assert not cache.path.exists()
+    assert cache.stats()["errors"] == 2
+    assert cache.delete("key") is False
+    assert cache.invalidate("k") == 0
+    assert cache.entries() == []
+    assert len(cache) == 0
+
+
+def test_get_does_not_write(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache")
+    cache.set("key", "value", ttl=60)
+    cnx = cache._connection()
+    changes = cnx.total_changes
+
+    for expected_hits in (1, 2, 3):
+        assert cache.get("key").hits == expected_hits
+
+    assert cnx.total_changes == changes
+    assert cache.entries()[0]["hits"] == 3
+
+
+def test_touches_are_flushed_before_eviction(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache", max_entries=2)
+    cache.set("old", 1, ttl=60)
+    cache.set("new", 2, ttl=60)
+    cache.get("old")
+
+    cache.set("third", 3, ttl=60)
+
+    assert cache.get("old") is not None
+    assert cache.get("new") is None
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache")
+    cache.set("key", "value", ttl=60)
+    cache._connection().execute("UPDATE cache_entries SET expires_at = 0, stale_until = 0")
+
+    assert cache.get("key") is None
+    assert cache.stats()["expired"] == 1